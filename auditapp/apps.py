@@ -0,0 +1,15 @@
+from django.apps import AppConfig
+
+
+class AuditappConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "auditapp"
+
+    def ready(self):
+        from django.core.signals import request_finished
+
+        from .buffer import flush_audit_buffer
+        from .recorder import connect_audited_models
+
+        connect_audited_models()
+        request_finished.connect(flush_audit_buffer, dispatch_uid="audit-flush")
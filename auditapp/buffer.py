@@ -0,0 +1,62 @@
+import atexit
+import logging
+import threading
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+
+logger = logging.getLogger(__name__)
+
+
+class AuditBuffer:
+    """
+    In-process buffer of AuditLog rows written with bulk_create.
+    Entries are only buffered once their transaction commits, so rolled-back
+    changes are never logged. The buffer is flushed when it holds
+    AUDIT_BUFFER_SIZE entries, when a request or background job finishes and
+    when the process exits.
+    """
+
+    def __init__(self):
+        self._entries = []
+        self._lock = threading.Lock()
+
+    def add(self, entry, using=None):
+        """
+        Buffer an unsaved AuditLog instance after the current transaction on
+        database `using` (the one the audited change was written to) commits.
+        """
+        transaction.on_commit(lambda: self._append(entry), using=using)
+
+    def _append(self, entry):
+        with self._lock:
+            self._entries.append(entry)
+            full = len(self._entries) >= settings.AUDIT_BUFFER_SIZE
+        if full:
+            self.flush()
+
+    def flush(self):
+        """
+        Write every buffered entry in one bulk_create.
+        """
+        from .models import AuditLog
+
+        with self._lock:
+            entries, self._entries = self._entries, []
+        if not entries:
+            return 0
+        try:
+            AuditLog.objects.bulk_create(entries, batch_size=500)
+        except DatabaseError:
+            logger.exception("Failed to write %d audit log entries", len(entries))
+            return 0
+        return len(entries)
+
+
+audit_buffer = AuditBuffer()
+atexit.register(audit_buffer.flush)
+
+
+def flush_audit_buffer(**kwargs):
+    # request_finished receiver
+    audit_buffer.flush()
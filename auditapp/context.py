@@ -0,0 +1,17 @@
+from contextvars import ContextVar
+
+# The request being handled by the current thread or task
+current_request = ContextVar("audit_current_request", default=None)
+
+
+def current_actor():
+    """
+    Return the authenticated user of the current request, or None.
+    DRF copies the user it authenticates onto the underlying HttpRequest, so
+    the user is available here even though JWT auth runs inside the view.
+    """
+    request = current_request.get()
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        return user
+    return None
@@ -0,0 +1,18 @@
+from .context import current_request
+
+
+class AuditContextMiddleware:
+    """
+    Expose the current request to audit signal handlers so they can record
+    who made each change.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = current_request.set(request)
+        try:
+            return self.get_response(request)
+        finally:
+            current_request.reset(token)
@@ -0,0 +1,25 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auditapp", "0002_initial"),
+        ("schoolsapp", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="auditlog",
+            name="school",
+            field=models.ForeignKey(
+                blank=True,
+                db_constraint=False,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="+",
+                to="schoolsapp.school",
+            ),
+        ),
+    ]
@@ -0,0 +1,55 @@
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+
+from schoolsapp.models import SchoolScopedModel
+
+
+class AuditLog(SchoolScopedModel):
+    """
+    Append-only record of a create, update or delete of an audited model.
+    Rows are written in batches by auditapp.buffer, never updated, and are
+    only listed to the school they were recorded for.
+    """
+
+    CREATE = "create"
+    UPDATE = "update"
+    DELETE = "delete"
+    BULK = "bulk"
+    ACTIONS = (
+        (CREATE, "Create"),
+        (UPDATE, "Update"),
+        (DELETE, "Delete"),
+        (BULK, "Bulk operation"),
+    )
+
+    # Model label such as "feeapp.feeshistory"
+    entity_type = models.CharField(max_length=100)
+    entity_id = models.BigIntegerField(null=True, blank=True)
+    action = models.CharField(max_length=10, choices=ACTIONS)
+    actor = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+        db_constraint=False,
+    )
+    # Kept so the entry still names the actor after the account is deleted
+    actor_repr = models.CharField(max_length=200, blank=True, default="")
+    # {"field": [before, after]} for every field that changed
+    changes = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["entity_type", "entity_id", "created_at"],
+                name="audit_entity_idx",
+            ),
+            models.Index(fields=["created_at"], name="audit_created_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.action} {self.entity_type}#{self.entity_id} by {self.actor_repr}"
@@ -0,0 +1,142 @@
+from django.apps import apps
+from django.conf import settings
+from django.db import router
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from schoolsapp.context import current_school_id
+from .buffer import audit_buffer
+from .context import current_actor
+from .models import AuditLog
+
+# Fields whose values must never be written to the log
+MASKED_FIELDS = {"password"}
+# Bookkeeping fields that would only add noise to every diff
+IGNORED_FIELDS = {"version", "last_login"}
+MASK = "********"
+
+
+def snapshot(instance):
+    """
+    Return the audited field values of an instance keyed by attname.
+    Deferred fields are left out; reading them would query the row again.
+    """
+    deferred = instance.get_deferred_fields()
+    return {
+        field.attname: getattr(instance, field.attname)
+        for field in instance._meta.concrete_fields
+        if field.attname not in IGNORED_FIELDS and field.attname not in deferred
+    }
+
+
+def diff(before, after):
+    """
+    Return {field: [before, after]} for every value that differs.
+    """
+    changes = {}
+    for name in before.keys() | after.keys():
+        old, new = before.get(name), after.get(name)
+        if old != new:
+            if name in MASKED_FIELDS:
+                old, new = MASK, MASK
+            changes[name] = [old, new]
+    return changes
+
+
+def record(entity_type, entity_id, action, changes, using=None):
+    """
+    Queue an audit entry attributed to the user and school of the current
+    request, written once the change's transaction on database `using` commits.
+    """
+    actor = current_actor()
+    audit_buffer.add(
+        AuditLog(
+            # Set now: the buffer is flushed outside the request's school scope
+            school_id=current_school_id(),
+            entity_type=entity_type,
+            entity_id=entity_id,
+            action=action,
+            actor_id=actor.pk if actor else None,
+            actor_repr=actor.username if actor else "",
+            changes=changes,
+        ),
+        using=using,
+    )
+
+
+def record_bulk_action(model, description, count, **details):
+    """
+    Log a set-based operation, such as a queryset update or delete, that
+    bypasses per-instance signals.
+    """
+    record(
+        model._meta.label_lower,
+        None,
+        AuditLog.BULK,
+        {"description": description, "count": count, **details},
+        using=router.db_for_write(model),
+    )
+
+
+def remember_state(
+    sender, instance, raw=False, using=None, update_fields=None, **kwargs
+):
+    # Read the stored values of the fields about to be written, so the save
+    # can be diffed; reads of audited models cost nothing extra
+    instance._audit_snapshot = {}
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    names = snapshot(instance).keys()
+    if update_fields:
+        names &= {instance._meta.get_field(name).attname for name in update_fields}
+    if names:
+        instance._audit_snapshot = (
+            sender._base_manager.using(using)
+            .filter(pk=instance.pk)
+            .values(*names)
+            .first()
+            or {}
+        )
+
+
+def log_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    before = instance.__dict__.pop("_audit_snapshot", {})
+    after = snapshot(instance)
+    if not created:
+        # Only the fields read before the save are compared, so columns that
+        # were deferred or left out of update_fields do not show up as changes
+        after = {k: v for k, v in after.items() if k in before}
+
+    changes = diff(before, after)
+    if changes:
+        action = AuditLog.CREATE if created else AuditLog.UPDATE
+        record(
+            sender._meta.label_lower,
+            instance.pk,
+            action,
+            changes,
+            using=instance._state.db,
+        )
+
+
+def log_delete(sender, instance, **kwargs):
+    before = snapshot(instance)
+    record(
+        sender._meta.label_lower,
+        instance.pk,
+        AuditLog.DELETE,
+        diff(before, {}),
+        using=instance._state.db,
+    )
+
+
+def connect_audited_models():
+    """
+    Connect the audit handlers to every model listed in AUDITED_MODELS.
+    """
+    for label in settings.AUDITED_MODELS:
+        model = apps.get_model(label)
+        pre_save.connect(remember_state, sender=model, dispatch_uid=f"audit-{label}")
+        post_save.connect(log_save, sender=model, dispatch_uid=f"audit-{label}")
+        post_delete.connect(log_delete, sender=model, dispatch_uid=f"audit-{label}")
@@ -0,0 +1,35 @@
+from rest_framework import serializers
+
+from .models import AuditLog
+
+
+class AuditLogSerializer(serializers.ModelSerializer):
+    """
+    Read-only representation of an audit log entry.
+    """
+
+    class Meta:
+        model = AuditLog
+        fields = [
+            "id",
+            "entity_type",
+            "entity_id",
+            "action",
+            "actor",
+            "actor_repr",
+            "changes",
+            "created_at",
+        ]
+        read_only_fields = fields
+
+
+class AuditLogQuerySerializer(serializers.Serializer):
+    """
+    Validates the filters of the audit log endpoint.
+    """
+
+    entity = serializers.CharField(required=False)
+    entity_id = serializers.IntegerField(required=False)
+    action = serializers.ChoiceField(choices=AuditLog.ACTIONS, required=False)
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
@@ -0,0 +1,75 @@
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from schoolsapp.models import School
+from schoolsapp.resolution import clear_school_cache
+from students.models import Student
+from usersapp.models import User
+from usersapp.serializers import AdminTokenObtainPairSerializers
+from .buffer import audit_buffer
+from .models import AuditLog
+
+
+class RecorderTests(TestCase):
+    def setUp(self):
+        self.student = Student.objects.create(name="Asha Rao", age=10)
+
+    def save(self, student, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            student.save(**kwargs)
+        audit_buffer.flush()
+        return AuditLog.objects.filter(action=AuditLog.UPDATE).last()
+
+    def test_reads_are_not_snapshotted(self):
+        student = Student.objects.get(pk=self.student.pk)
+        self.assertFalse(hasattr(student, "_audit_snapshot"))
+
+    def test_update_logs_only_changed_fields(self):
+        student = Student.objects.get(pk=self.student.pk)
+        student.age = 11
+        entry = self.save(student)
+        self.assertEqual(entry.changes, {"age": [10, 11]})
+
+    def test_update_fields_limit_the_diff(self):
+        student = Student.objects.get(pk=self.student.pk)
+        student.name = "Asha R."
+        student.age = 11
+        entry = self.save(student, update_fields=["age"])
+        self.assertEqual(entry.changes, {"age": [10, 11]})
+
+    def test_deferred_fields_are_not_compared(self):
+        student = Student.objects.only("age").get(pk=self.student.pk)
+        student.age = 11
+        entry = self.save(student)
+        self.assertEqual(entry.changes, {"age": [10, 11]})
+
+
+class AuditLogTenancyTests(TestCase):
+    def setUp(self):
+        clear_school_cache()
+        self.addCleanup(clear_school_cache)
+        self.school = School.objects.create(name="North", slug="north")
+        self.other = School.objects.create(name="South", slug="south")
+        admin = User.objects.create_user(
+            "admin", "admin@example.com", "pw", role="admin", school=self.school
+        )
+        token = AdminTokenObtainPairSerializers.get_token(admin).access_token
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def test_admin_only_sees_their_school(self):
+        for school in (self.school, self.other):
+            AuditLog.objects.create(
+                school=school,
+                entity_type="students.student",
+                entity_id=1,
+                action=AuditLog.UPDATE,
+                changes={"age": [10, 11]},
+            )
+
+        response = self.client.get("/audit/logs/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["count"], 1)
+        entry = AuditLog.objects.unscoped().get(pk=response.json()["results"][0]["id"])
+        self.assertEqual(entry.school, self.school)
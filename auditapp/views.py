@@ -0,0 +1,40 @@
+from rest_framework import generics
+from rest_framework.pagination import LimitOffsetPagination
+
+from usersapp.permissions import ADMIN_ROLES, role_permission
+from .models import AuditLog
+from .serializers import AuditLogQuerySerializer, AuditLogSerializer
+
+
+class AuditLogPagination(LimitOffsetPagination):
+    default_limit = 100
+    max_limit = 1000
+
+
+class AuditLogListView(generics.ListAPIView):
+    """
+    View to query the audit log by entity, entity id, action and date range.
+    Accessible only to Admin.
+    """
+
+    serializer_class = AuditLogSerializer
+    permission_classes = [role_permission(ADMIN_ROLES)]
+    pagination_class = AuditLogPagination
+
+    def get_queryset(self):
+        query = AuditLogQuerySerializer(data=self.request.query_params)
+        query.is_valid(raise_exception=True)
+        filters = query.validated_data
+
+        queryset = AuditLog.objects.order_by("-created_at", "-id")
+        if "entity" in filters:
+            queryset = queryset.filter(entity_type=filters["entity"].lower())
+        if "entity_id" in filters:
+            queryset = queryset.filter(entity_id=filters["entity_id"])
+        if "action" in filters:
+            queryset = queryset.filter(action=filters["action"])
+        if "date_from" in filters:
+            queryset = queryset.filter(created_at__date__gte=filters["date_from"])
+        if "date_to" in filters:
+            queryset = queryset.filter(created_at__date__lte=filters["date_to"])
+        return queryset
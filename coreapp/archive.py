@@ -0,0 +1,106 @@
+from datetime import date
+from functools import partial
+
+from django.conf import settings
+from django.db import router, transaction
+
+from auditapp.recorder import record_bulk_action
+from feedapp.signals import publish_bulk_on_commit
+
+
+def academic_year_start(year):
+    """
+    Return the first day of the academic year that starts in `year`.
+    """
+    return date(year, settings.ACADEMIC_YEAR_START_MONTH, 1)
+
+
+def archive_rows(
+    model,
+    archive_model,
+    date_field,
+    cutoff,
+    batch_size,
+    dry_run=False,
+    filters=None,
+    annotations=None,
+    dependants=(),
+    after_batch=None,
+):
+    """
+    Move rows of `model` dated before `cutoff` (and matching `filters`) into
+    `archive_model`. Each batch is copied and deleted in its own transaction,
+    so the hot table shrinks steadily and a failure loses no rows. A row is
+    only deleted once an identical copy is in the archive; rows whose insert
+    was skipped for a conflicting archive row stay in place. Returns the number
+    of rows moved, or the number that would be moved when `dry_run` is set.
+
+    Archive columns that are not on `model` are filled from `annotations`.
+    `dependants` lists (model, foreign key name) pairs whose rows pointing at
+    a moved row are deleted with it; their data belongs in `annotations`.
+    Moved rows are deleted with a single statement that fires no per-row
+    signals, so each batch is audited as one bulk action and announced as one
+    feed event, and `after_batch` is called with the affected student ids on
+    commit.
+    """
+    pending = model.objects.filter(**{f"{date_field}__lt": cutoff}, **(filters or {}))
+    if dry_run:
+        return pending.count()
+    if annotations:
+        pending = pending.annotate(**annotations)
+
+    fields = [
+        field.attname
+        for field in archive_model._meta.concrete_fields
+        if field.attname != "archived_at"
+    ]
+    using = router.db_for_write(model)
+    moved = 0
+    last_pk = 0
+    while True:
+        with transaction.atomic(using=using):
+            rows = list(
+                pending.filter(pk__gt=last_pk)
+                .order_by("pk")
+                .values(*fields)[:batch_size]
+            )
+            if not rows:
+                break
+            last_pk = rows[-1]["id"]
+            archive_model.objects.bulk_create(
+                [archive_model(**row) for row in rows], ignore_conflicts=True
+            )
+            archived = {
+                row["id"]: row
+                for row in archive_model.objects.filter(
+                    pk__in=[row["id"] for row in rows]
+                ).values(*fields)
+            }
+            landed = [row for row in rows if archived.get(row["id"]) == row]
+            if landed:
+                _delete_moved(model, [row["id"] for row in landed], dependants, using)
+                _announce_batch(model, landed, after_batch, using)
+        moved += len(landed)
+    return moved
+
+
+def _delete_moved(model, pks, dependants, using):
+    # Archiving is not deletion: skip the collector and its post_delete
+    # handlers, which would audit, publish and refresh every row on its own
+    for dependant, field_name in dependants:
+        dependant._base_manager.filter(**{f"{field_name}__in": pks})._raw_delete(using)
+    model._base_manager.filter(pk__in=pks)._raw_delete(using)
+
+
+def _announce_batch(model, rows, after_batch, using):
+    student_ids = sorted({row["student_id"] for row in rows})
+    record_bulk_action(
+        model,
+        "archive",
+        len(rows),
+        first_id=rows[0]["id"],
+        last_id=rows[-1]["id"],
+    )
+    publish_bulk_on_commit(model, "bulk_archived", len(rows), student_ids, using=using)
+    if after_batch is not None:
+        transaction.on_commit(partial(after_batch, student_ids), using=using)
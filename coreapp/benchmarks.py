@@ -0,0 +1,15 @@
+import time
+
+
+def best_of(repeat, func):
+    """
+    Run `func` `repeat` times and return (best elapsed seconds, last result).
+    """
+    best = None
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
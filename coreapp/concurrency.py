@@ -0,0 +1,152 @@
+from django.core.exceptions import NON_FIELD_ERRORS
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import models
+from django.db.models import F
+from django.db.models.signals import post_save
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.response import Response
+from rest_framework.serializers import as_serializer_error
+from rest_framework.settings import api_settings
+
+
+class PreconditionFailed(APIException):
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = (
+        "The record was changed by another request. Reload it and try again."
+    )
+    default_code = "precondition_failed"
+
+
+def etag_for(instance):
+    """
+    Return the ETag header value for a versioned model instance.
+    """
+    return f'"{instance.version}"'
+
+
+def parse_if_match(header):
+    """
+    Return the version named by an If-Match header, or None for "*".
+    Anything that is not a version ETag can never match.
+    """
+    value = header.strip()
+    if value == "*":
+        return None
+    if value.startswith("W/"):
+        value = value[2:]
+    try:
+        return int(value.strip('"'))
+    except ValueError:
+        raise PreconditionFailed()
+
+
+def changed_fields(instance, values):
+    """
+    Return the subset of `values` that differs from the instance's current state.
+    Relations are compared by primary key so no related object is fetched.
+    """
+    changed = {}
+    for attr, value in values.items():
+        field = instance._meta.get_field(attr)
+        if field.is_relation:
+            current = getattr(instance, field.attname)
+            new = value.pk if isinstance(value, models.Model) else value
+        else:
+            current = getattr(instance, attr)
+            new = value
+        if current != new:
+            changed[attr] = value
+    return changed
+
+
+class VersionedUpdateSerializerMixin:
+    """
+    ModelSerializer mixin that saves updates with a single conditional
+    UPDATE ... WHERE id = ? AND version = ?, bumping the version.
+    Only columns whose value changed are written, and nothing is written when
+    no value changed. The new values are checked with the model's full_clean()
+    first, as save() would have. The expected version comes from the If-Match
+    header when the view passes one, and otherwise from the instance as it
+    was read. A mismatch raises 412.
+    """
+
+    def update(self, instance, validated_data):
+        expected = self.context.get("expected_version")
+        if expected is None:
+            expected = instance.version
+
+        changed = changed_fields(instance, validated_data)
+        if not changed:
+            if expected != instance.version:
+                raise PreconditionFailed()
+            return instance
+
+        for attr, value in changed.items():
+            setattr(instance, attr, value)
+        try:
+            instance.full_clean()
+        except DjangoValidationError as exc:
+            detail = as_serializer_error(exc)
+            # Report clean() errors under the key the serializer uses
+            if NON_FIELD_ERRORS in detail:
+                detail[api_settings.NON_FIELD_ERRORS_KEY] = detail.pop(
+                    NON_FIELD_ERRORS
+                )
+            raise ValidationError(detail)
+
+        model = type(instance)
+        db = instance._state.db
+        updated = (
+            model._base_manager.using(db)
+            .filter(pk=instance.pk, version=expected)
+            .update(version=F("version") + 1, **changed)
+        )
+        if not updated:
+            raise PreconditionFailed()
+
+        instance.version = expected + 1
+
+        # QuerySet.update() sends no signals; keep receivers such as cache
+        # invalidation working as they do for save()
+        post_save.send(
+            sender=model,
+            instance=instance,
+            created=False,
+            update_fields=frozenset(changed) | {"version"},
+            raw=False,
+            using=db,
+        )
+        return instance
+
+
+class ConditionalUpdateMixin:
+    """
+    View mixin that sends an ETag with retrieve and update responses and
+    passes the If-Match version of PUT and PATCH requests to the serializer.
+    """
+
+    # The ETag is read from the instance even when ?fields= omits it
+    sparse_extra_columns = ("version",)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if_match = self.request.headers.get("If-Match")
+        if if_match and self.request.method in ("PUT", "PATCH"):
+            context["expected_version"] = parse_if_match(if_match)
+        return context
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        serializer = self.get_serializer(instance)
+        return Response(serializer.data, headers={"ETag": etag_for(instance)})
+
+    def update(self, request, *args, **kwargs):
+        partial = kwargs.pop("partial", False)
+        instance = self.get_object()
+        serializer = self.get_serializer(instance, data=request.data, partial=partial)
+        serializer.is_valid(raise_exception=True)
+        self.perform_update(serializer)
+        return Response(
+            serializer.data, headers={"ETag": etag_for(serializer.instance)}
+        )
@@ -0,0 +1,162 @@
+from decimal import Decimal, getcontext
+from functools import lru_cache
+
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import ISO_8601, serializers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+# Serializer fields whose to_representation is an identity on values() output
+PASSTHROUGH_FIELDS = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.ChoiceField,
+    serializers.IntegerField,
+    serializers.PrimaryKeyRelatedField,
+    serializers.SlugRelatedField,
+)
+
+
+def _decimal_formatter(field):
+    """
+    Match DecimalField.to_representation for values read from the database.
+    """
+    if field.localize or field.decimal_places is None:
+        # Locale-aware or unquantized output is left to the field itself
+        return field.to_representation
+    # DecimalField only sets coerce_to_string when it is passed explicitly
+    coerce_to_string = getattr(
+        field, "coerce_to_string", api_settings.COERCE_DECIMAL_TO_STRING
+    )
+    exponent = Decimal(1).scaleb(-field.decimal_places)
+    context = getcontext().copy()
+    if field.max_digits is not None:
+        context.prec = field.max_digits
+
+    def format_decimal(value):
+        if value is None:
+            return "" if coerce_to_string else None
+        value = value.quantize(exponent, rounding=field.rounding, context=context)
+        if field.normalize_output:
+            value = value.normalize()
+        return "{:f}".format(value) if coerce_to_string else value
+
+    return format_decimal
+
+
+def _date_formatter(field):
+    """
+    Match DateField.to_representation for the configured output format.
+    """
+    output_format = getattr(field, "format", api_settings.DATE_FORMAT)
+
+    def format_date(value):
+        if not value:
+            return None
+        if output_format is None or isinstance(value, str):
+            return value
+        if output_format.lower() == ISO_8601:
+            return value.isoformat()
+        return value.strftime(output_format)
+
+    return format_date
+
+
+class ValuesRowSerializer:
+    """
+    Read-only serializer that builds response dicts from queryset.values() rows.
+    Produces the same output as `serializer_class` for the field types it
+    supports, without instantiating models or running per-field serializers.
+    """
+
+    def __init__(self, serializer_class, fields=None):
+        self.serializer_class = serializer_class
+        self.lookups = {}
+        self.formatters = {}
+
+        for name, field in serializer_class().fields.items():
+            if field.write_only or (fields is not None and name not in fields):
+                continue
+            self.lookups[name] = self._lookup_for(name, field)
+            formatter = self._formatter_for(field)
+            if formatter is not None:
+                self.formatters[name] = formatter
+
+    def _lookup_for(self, name, field):
+        if isinstance(field, serializers.SlugRelatedField):
+            return f"{field.source}__{field.slug_field}"
+        if "." not in field.source:
+            return field.source
+        raise ImproperlyConfigured(
+            f"{self.serializer_class.__name__}.{name} has a dotted source and "
+            "cannot be served from values()."
+        )
+
+    def _formatter_for(self, field):
+        if isinstance(field, serializers.DecimalField):
+            return _decimal_formatter(field)
+        if isinstance(field, serializers.DateField):
+            return _date_formatter(field)
+        if isinstance(field, serializers.DateTimeField):
+            return field.to_representation
+        if isinstance(field, PASSTHROUGH_FIELDS):
+            return None
+        raise ImproperlyConfigured(
+            f"{self.serializer_class.__name__}.{field.field_name} "
+            f"({type(field).__name__}) is not supported by the fast list path."
+        )
+
+    def values(self, queryset):
+        """
+        Narrow the queryset to the columns this serializer emits.
+        """
+        return queryset.values(*dict.fromkeys(self.lookups.values()))
+
+    def to_representation(self, rows):
+        lookups = self.lookups.items()
+        formatters = self.formatters
+        data = []
+        for row in rows:
+            item = {}
+            for name, lookup in lookups:
+                value = row[lookup]
+                formatter = formatters.get(name)
+                item[name] = value if formatter is None else formatter(value)
+            data.append(item)
+        return data
+
+
+@lru_cache(maxsize=256)
+def get_row_serializer(serializer_class, fields=None):
+    """
+    Return the cached ValuesRowSerializer for a ModelSerializer class,
+    optionally limited to the tuple of field names in `fields`.
+    """
+    return ValuesRowSerializer(serializer_class, fields)
+
+
+class FastListMixin:
+    """
+    Serve list responses through ValuesRowSerializer when `fast_list` is True.
+    Filtering and pagination behave exactly as in ListModelMixin.list.
+    """
+
+    fast_list = False
+
+    def get_sparse_fields(self):
+        # Overridden by SparseFieldsViewMixin
+        return None
+
+    def list(self, request, *args, **kwargs):
+        if not self.fast_list:
+            return super().list(request, *args, **kwargs)
+
+        row_serializer = get_row_serializer(
+            self.get_serializer_class(), self.get_sparse_fields()
+        )
+        queryset = row_serializer.values(self.filter_queryset(self.get_queryset()))
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(row_serializer.to_representation(page))
+        return Response(row_serializer.to_representation(queryset))
@@ -0,0 +1,181 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from functools import partial
+
+from django.conf import settings
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.response import Response
+
+from schoolsapp.context import current_school_id
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+
+
+class IdempotencyKeyReused(APIException):
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    default_detail = (
+        "This Idempotency-Key was already used with a different request body."
+    )
+    default_code = "idempotency_key_reused"
+
+
+class IdempotencyInProgress(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = (
+        "A request with this Idempotency-Key is still being processed. Retry later."
+    )
+    default_code = "idempotency_in_progress"
+
+
+def request_fingerprint(request):
+    """
+    Hash the parsed request body, so a key reused for another payload is caught.
+    """
+    data = request.data
+    if hasattr(data, "lists"):
+        data = dict(data.lists())
+    payload = json.dumps(data, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class _Entry:
+    def __init__(self, fingerprint):
+        self.fingerprint = fingerprint
+        self.done = threading.Event()
+        # (status, data, headers) once the first request has been answered
+        self.response = None
+        self.expires_at = None
+
+    def replay(self):
+        status_code, data, headers = self.response
+        return Response(
+            data, status=status_code, headers={**headers, REPLAYED_HEADER: "true"}
+        )
+
+
+class IdempotencyStore:
+    """
+    Process-local record of answered requests by idempotency key.
+    The first request with a key runs; retries arriving while it runs wait for
+    it, and later retries get its response back without running again.
+    Responses are kept for IDEMPOTENCY_TTL seconds and at most
+    IDEMPOTENCY_CACHE_MAX answered keys are held; requests still running are
+    never evicted. Server errors are not kept, so a request that failed with
+    one can be retried. Retries reaching another worker process are not
+    deduplicated, see the IDEMPOTENCY_* settings.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def run(self, key, fingerprint, produce):
+        """
+        Return the stored response for `key`, or call `produce()` and store
+        its response.
+        """
+        while True:
+            with self._lock:
+                self._purge()
+                entry = self._entries.get(key)
+                owner = entry is None
+                if owner:
+                    entry = self._entries[key] = _Entry(fingerprint)
+                    self._enforce_bound()
+            if entry.fingerprint != fingerprint:
+                raise IdempotencyKeyReused()
+            if owner:
+                break
+            if not entry.done.wait(settings.IDEMPOTENCY_WAIT_SECONDS):
+                raise IdempotencyInProgress()
+            if entry.response is not None:
+                return entry.replay()
+            # The first request failed without a response; try to run again
+
+        try:
+            response = produce()
+        except BaseException:
+            self._discard(key, entry)
+            entry.done.set()
+            raise
+        if response.status_code < 500:
+            headers = {
+                name: value
+                for name, value in response.items()
+                if name.lower() != "content-type"
+            }
+            data = response.data
+            if isinstance(data, dict):
+                # A plain copy, so the stored data does not hold on to the serializer
+                data = dict(data)
+            entry.response = (response.status_code, data, headers)
+            entry.expires_at = time.monotonic() + settings.IDEMPOTENCY_TTL
+        else:
+            self._discard(key, entry)
+        entry.done.set()
+        return response
+
+    def _discard(self, key, entry):
+        with self._lock:
+            if self._entries.get(key) is entry:
+                del self._entries[key]
+
+    def _enforce_bound(self):
+        # Drop the oldest answered entries; a running request keeps its entry
+        # so its retries still wait for it instead of running again
+        overflow = len(self._entries) - settings.IDEMPOTENCY_CACHE_MAX
+        if overflow <= 0:
+            return
+        stale = []
+        for key, entry in self._entries.items():
+            if len(stale) == overflow:
+                break
+            if entry.response is not None:
+                stale.append(key)
+        for key in stale:
+            del self._entries[key]
+
+    def _purge(self):
+        # Entries are answered in roughly insertion order, so expired ones
+        # collect at the front
+        now = time.monotonic()
+        while self._entries:
+            entry = next(iter(self._entries.values()))
+            if entry.expires_at is None or entry.expires_at > now:
+                break
+            self._entries.popitem(last=False)
+
+
+idempotency_store = IdempotencyStore()
+
+
+class IdempotentCreateMixin:
+    """
+    CreateModelMixin companion that honours the Idempotency-Key header.
+    Authentication and permissions still run for every retry, but a retry of
+    an answered request skips validation and the insert and receives the
+    original response, marked with Idempotent-Replayed: true.
+    """
+
+    def create(self, request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return super().create(request, *args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            raise ValidationError(
+                {
+                    IDEMPOTENCY_HEADER: f"Ensure this header has no more than {MAX_KEY_LENGTH} characters."
+                }
+            )
+        store_key = (current_school_id(), request.user.pk, request.path, key)
+        return idempotency_store.run(
+            store_key,
+            request_fingerprint(request),
+            partial(super().create, request, *args, **kwargs),
+        )
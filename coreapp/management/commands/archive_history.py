@@ -0,0 +1,63 @@
+from django.db.models import F
+
+from coreapp.archive import academic_year_start, archive_rows
+from feeapp.models import FeesHistory, FeesHistoryArchive
+from libraryapp.fines import refresh_fine_totals
+from libraryapp.models import LibraryFine, LibraryHistory, LibraryHistoryArchive
+from schoolsapp.commands import PerSchoolCommand
+
+# Keyword arguments of archive_rows() for each target
+TARGETS = {
+    "fees": {
+        "model": FeesHistory,
+        "archive_model": FeesHistoryArchive,
+        "date_field": "payment_date",
+    },
+    "library": {
+        "model": LibraryHistory,
+        "archive_model": LibraryHistoryArchive,
+        "date_field": "borrow_date",
+        # Books still out stay in the hot table for profiles and fines
+        "filters": {"status": "returned"},
+        # A late record's fine moves onto its archive row and leaves the
+        # student's running total
+        "annotations": {
+            "fine_days_late": F("fine__days_late"),
+            "fine_amount": F("fine__amount"),
+        },
+        "dependants": [(LibraryFine, "record")],
+        "after_batch": refresh_fine_totals,
+    },
+}
+
+
+class Command(PerSchoolCommand):
+    help = (
+        "Move fee and library records from academic years before --before-year "
+        "into their archive tables in batches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--before-year",
+            type=int,
+            required=True,
+            help="Archive records dated before the academic year starting in this year.",
+        )
+        parser.add_argument(
+            "--target", choices=sorted(TARGETS), action="append", dest="targets"
+        )
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle_school(self, *args, **options):
+        cutoff = academic_year_start(options["before_year"])
+        for target in options["targets"] or sorted(TARGETS):
+            count = archive_rows(
+                cutoff=cutoff,
+                batch_size=options["batch_size"],
+                dry_run=options["dry_run"],
+                **TARGETS[target],
+            )
+            verb = "would be archived" if options["dry_run"] else "archived"
+            self.stdout.write(f"{target}: {count} records before {cutoff} {verb}")
@@ -0,0 +1,54 @@
+import gzip
+
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from coreapp.benchmarks import best_of
+from coreapp.middleware import brotli
+from coreapp.renderers import ORJSONRenderer, orjson
+from feeapp.models import FeesHistory
+from feeapp.serializers import FeeHistorySerializers
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure render time and bytes on the wire for a fee history payload "
+        "with the stdlib and orjson renderers, uncompressed, gzip and brotli."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10000)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        queryset = FeesHistory.objects.order_by("pk")[: options["rows"]]
+        data = FeeHistorySerializers(queryset, many=True).data
+        self.stdout.write(f"Payload: {len(data)} fee history records")
+
+        renderers = [JSONRenderer()]
+        if orjson is None:
+            self.stdout.write("orjson is not installed; ORJSONRenderer falls back to stdlib")
+        else:
+            renderers.append(ORJSONRenderer())
+
+        for renderer in renderers:
+            elapsed, body = best_of(options["repeat"], lambda: renderer.render(data))
+            self.stdout.write(
+                f"{type(renderer).__name__}: {elapsed * 1000:.1f} ms, {len(body):,} bytes"
+            )
+
+        elapsed, compressed = best_of(
+            options["repeat"], lambda: gzip.compress(body, compresslevel=6)
+        )
+        self.stdout.write(
+            f"gzip: {elapsed * 1000:.1f} ms, {len(compressed):,} bytes "
+            f"({len(compressed) / len(body):.1%})"
+        )
+        if brotli is not None:
+            elapsed, compressed = best_of(
+                options["repeat"], lambda: brotli.compress(body, quality=5)
+            )
+            self.stdout.write(
+                f"brotli: {elapsed * 1000:.1f} ms, {len(compressed):,} bytes "
+                f"({len(compressed) / len(body):.1%})"
+            )
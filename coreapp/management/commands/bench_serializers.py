@@ -0,0 +1,61 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from coreapp.benchmarks import best_of
+from coreapp.fastpath import get_row_serializer
+from feeapp.models import FeesHistory
+from feeapp.serializers import FeeHistorySerializers
+from libraryapp.models import LibraryHistory
+from libraryapp.serializers import LibraryHistorySerializer
+from students.models import Student
+from students.serializers import StudentSerializers
+
+TARGETS = {
+    "fees": (FeesHistory, FeeHistorySerializers),
+    "library": (LibraryHistory, LibraryHistorySerializer),
+    "students": (Student, StudentSerializers),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare ModelSerializer list serialization with the values() fast path "
+        "and report rows/sec. Run seed_school first for meaningful volumes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--target", choices=sorted(TARGETS), action="append", dest="targets"
+        )
+        parser.add_argument("--rows", type=int, default=10000)
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def handle(self, *args, **options):
+        for target in options["targets"] or sorted(TARGETS):
+            model, serializer_class = TARGETS[target]
+            queryset = model.objects.order_by("pk")[: options["rows"]]
+            row_serializer = get_row_serializer(serializer_class)
+
+            slow_time, slow_data = best_of(
+                options["repeat"],
+                lambda: serializer_class(queryset.all(), many=True).data,
+            )
+            fast_time, fast_data = best_of(
+                options["repeat"],
+                lambda: row_serializer.to_representation(
+                    row_serializer.values(queryset.all())
+                ),
+            )
+
+            if [dict(item) for item in slow_data] != fast_data:
+                raise CommandError(f"{target}: fast path output differs.")
+
+            count = len(fast_data)
+            if not count:
+                self.stdout.write(f"{target}: no rows to benchmark")
+                continue
+            self.stdout.write(
+                f"{target}: {count} rows | "
+                f"{serializer_class.__name__} {count / slow_time:,.0f} rows/s | "
+                f"fast path {count / fast_time:,.0f} rows/s | "
+                f"{slow_time / fast_time:.1f}x"
+            )
@@ -0,0 +1,64 @@
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+IMPORTTIME_RE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+# What a worker process imports before serving its first request
+BOOT_SCRIPT = """
+import django
+django.setup()
+from django.urls import get_resolver
+get_resolver().reverse_dict
+import schoolmgmnt.wsgi
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Boot the project in a fresh interpreter with -X importtime and report "
+        "the self import time per top-level package, with project apps marked."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--top", type=int, default=20)
+
+    def handle(self, *args, **options):
+        env = dict(os.environ, WARMUP_ON_STARTUP="False")
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", BOOT_SCRIPT],
+            cwd=settings.BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if completed.returncode:
+            raise CommandError(completed.stderr[-2000:])
+
+        self_time = defaultdict(int)
+        for line in completed.stderr.splitlines():
+            match = IMPORTTIME_RE.match(line)
+            if match:
+                self_us, _cumulative_us, _indent, module = match.groups()
+                self_time[module.split(".")[0]] += int(self_us)
+
+        total = sum(self_time.values())
+        project_apps = {app.split(".")[0] for app in settings.INSTALLED_APPS}
+        project_apps.add("schoolmgmnt")
+
+        self.stdout.write(f"Total import time: {total / 1000:.1f} ms")
+        ranked = sorted(self_time.items(), key=lambda item: item[1], reverse=True)
+        for package, micros in ranked[: options["top"]]:
+            marker = " *" if package in project_apps else ""
+            self.stdout.write(
+                f"{micros / 1000:9.1f} ms {micros / total:6.1%}  {package}{marker}"
+            )
+
+        self.stdout.write("\nProject apps:")
+        for package in sorted(project_apps - {"django", "rest_framework"}):
+            self.stdout.write(f"{self_time.get(package, 0) / 1000:9.1f} ms  {package}")
@@ -0,0 +1,211 @@
+import random
+import secrets
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Max
+
+from feeapp.models import FeesHistory
+from libraryapp.models import LibraryHistory
+from students.models import Grade, Student
+from usersapp.models import User
+
+FIRST_NAMES = [
+    "Aarav", "Aditi", "Anjali", "Arjun", "Diya", "Ishaan", "Kavya", "Meera",
+    "Nikhil", "Priya", "Rahul", "Riya", "Rohan", "Sneha", "Tara", "Vivek",
+]
+LAST_NAMES = [
+    "Iyer", "Kumar", "Menon", "Nair", "Patel", "Pillai", "Rao", "Reddy",
+    "Shah", "Sharma", "Singh", "Varma",
+]
+GRADES = [f"{level}-{section}" for level in range(1, 13) for section in "ABCD"]
+FEE_TYPES = ["Tuition", "Transport", "Library", "Exam", "Sports", "Laboratory"]
+BOOKS = [
+    f"{title} Vol. {volume}"
+    for title in (
+        "Wings of Fire", "Malgudi Days", "The Jungle Book", "Panchatantra",
+        "Gitanjali", "Discovery of India", "Train to Pakistan", "The Guide",
+    )
+    for volume in range(1, 6)
+]
+
+# How far back generated payments and borrows may go.
+HISTORY_DAYS = 3 * 365
+
+
+def batched(iterable, size):
+    """
+    Yield lists of at most `size` items from `iterable` without materialising it.
+    """
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate synthetic users, students, fee payments and library history "
+        "in streamed bulk_create batches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--students", type=int, default=1000)
+        parser.add_argument("--fees-per-student", type=int, default=4)
+        parser.add_argument("--borrows-per-student", type=int, default=3)
+        parser.add_argument("--users-per-role", type=int, default=5)
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--seed", type=int, default=None, help="Seed for reproducible data."
+        )
+        parser.add_argument(
+            "--prefix",
+            default="seed",
+            help="Username prefix for generated users, so runs do not collide.",
+        )
+        parser.add_argument(
+            "--password",
+            help="Password of the generated users. A random one is generated "
+            "and printed once when omitted.",
+        )
+
+    def handle(self, *args, **options):
+        if options["fees_per_student"] > len(FEE_TYPES) * HISTORY_DAYS:
+            raise CommandError("Too many fee payments per student to keep them unique.")
+
+        self.rng = random.Random(options["seed"])
+        self.today = date.today()
+        self.batch_size = options["batch_size"]
+
+        password = options["password"]
+        if not password and options["users_per_role"]:
+            password = secrets.token_urlsafe(12)
+            self.stdout.write(f"Generated password for seeded users: {password}")
+        self.seed_users(options["users_per_role"], options["prefix"], password)
+
+        self.grade_ids = [
+            grade.pk for grade in Grade.objects.resolve_many(GRADES).values()
+        ]
+        first_new_pk = (Student.objects.aggregate(Max("pk"))["pk__max"] or 0) + 1
+        self.insert(Student, self.generate_students(options["students"]))
+
+        # Re-read the new primary keys so this works on backends that do not
+        # return ids from bulk_create.
+        student_pks = (
+            Student.objects.filter(pk__gte=first_new_pk)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+        self.insert(
+            FeesHistory,
+            self.generate_fees(
+                student_pks.iterator(chunk_size=self.batch_size),
+                options["fees_per_student"],
+            ),
+        )
+        self.insert(
+            LibraryHistory,
+            self.generate_library_history(
+                student_pks.iterator(chunk_size=self.batch_size),
+                options["borrows_per_student"],
+            ),
+        )
+
+    def insert(self, model, objects):
+        """
+        Stream `objects` into the database in batches and report throughput.
+        """
+        started = time.perf_counter()
+        total = 0
+        for batch in batched(objects, self.batch_size):
+            model.objects.bulk_create(batch, batch_size=self.batch_size)
+            total += len(batch)
+        elapsed = time.perf_counter() - started
+        rate = total / elapsed if elapsed else 0
+        self.stdout.write(
+            f"{model.__name__}: {total} rows in {elapsed:.1f}s ({rate:,.0f} rows/s)"
+        )
+
+    def seed_users(self, per_role, prefix, password):
+        """
+        Create `per_role` users for every role in User.ROLES.
+        The password is hashed once and shared, since hashing dominates otherwise.
+        Seeded admins get the admin role only, never superuser rights.
+        """
+        password_hash = make_password(password)
+        users = [
+            User(
+                username=f"{prefix}{role}{index}",
+                email=f"{prefix}.{role}.{index}@example.com",
+                password=password_hash,
+                role=role,
+                is_staff=role != "librarian",
+            )
+            for role, _label in User.ROLES
+            for index in range(per_role)
+        ]
+        User.objects.bulk_create(users, ignore_conflicts=True)
+        self.stdout.write(f"User: {len(users)} rows requested")
+
+    def random_past_date(self):
+        return self.today - timedelta(days=self.rng.randrange(HISTORY_DAYS))
+
+    def generate_students(self, count):
+        rng = self.rng
+        for _ in range(count):
+            yield Student(
+                name=f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                age=rng.randint(5, 18),
+                grade_id=rng.choice(self.grade_ids),
+            )
+
+    def generate_fees(self, student_pks, per_student):
+        """
+        Yield fee payments that never repeat (student, fee_type, payment_date).
+        """
+        rng = self.rng
+        for student_pk in student_pks:
+            seen = set()
+            while len(seen) < per_student:
+                key = (rng.choice(FEE_TYPES), self.random_past_date())
+                if key in seen:
+                    continue
+                seen.add(key)
+                fee_type, payment_date = key
+                yield FeesHistory(
+                    student_id=student_pk,
+                    fee_type=fee_type,
+                    amount=Decimal(rng.randint(50000, 5000000)).scaleb(-2),
+                    payment_date=payment_date,
+                    remarks=f"{fee_type} fee",
+                )
+
+    def generate_library_history(self, student_pks, per_student):
+        """
+        Yield borrow records; returned ones always carry a return_date so the
+        return_date_required_for_returned_status constraint holds.
+        """
+        rng = self.rng
+        for student_pk in student_pks:
+            for _ in range(per_student):
+                borrow_date = self.random_past_date()
+                return_date = None
+                status = "borrowed"
+                if rng.random() < 0.7:
+                    return_date = min(
+                        borrow_date + timedelta(days=rng.randint(1, 30)), self.today
+                    )
+                    status = "returned"
+                yield LibraryHistory(
+                    student_id=student_pk,
+                    book_name=rng.choice(BOOKS),
+                    borrow_date=borrow_date,
+                    return_date=return_date,
+                    status=status,
+                )
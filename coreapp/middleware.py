@@ -0,0 +1,98 @@
+import re
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.text import compress_string
+
+from .profiling import authorized, profile_request, profiling_requested
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+ACCEPT_ENCODING_RE = re.compile(r"([\w*-]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?")
+
+
+def accepted_encodings(header):
+    """
+    Return the encodings from an Accept-Encoding header that have a non-zero q.
+    """
+    encodings = set()
+    for part in header.lower().split(","):
+        match = ACCEPT_ENCODING_RE.match(part.strip())
+        if not match:
+            continue
+        encoding, quality = match.groups()
+        try:
+            if quality is not None and float(quality) <= 0:
+                continue
+        except ValueError:
+            continue
+        encodings.add(encoding)
+    return encodings
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Compress responses larger than RESPONSE_COMPRESSION_MIN_SIZE bytes.
+    Brotli is preferred when the client accepts it and the brotli package is
+    installed; otherwise gzip is used. Streaming responses are left untouched.
+    """
+
+    def process_response(self, request, response):
+        min_size = getattr(settings, "RESPONSE_COMPRESSION_MIN_SIZE", 1024)
+        if (
+            response.streaming
+            or response.has_header("Content-Encoding")
+            or len(response.content) < min_size
+        ):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encodings = accepted_encodings(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+
+        if brotli is not None and ("br" in encodings or "*" in encodings):
+            encoding = "br"
+            compressed = brotli.compress(
+                response.content,
+                quality=getattr(settings, "RESPONSE_COMPRESSION_BROTLI_QUALITY", 5),
+            )
+        elif "gzip" in encodings or "*" in encodings:
+            encoding = "gzip"
+            compressed = compress_string(response.content)
+        else:
+            return response
+
+        # Only send the compressed body when it is actually smaller
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response["Content-Length"] = str(len(compressed))
+        response["Content-Encoding"] = encoding
+
+        # The representation changed, so a strong ETag no longer applies
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+        return response
+
+
+class RequestProfilingMiddleware:
+    """
+    Profile a single request when an admin asks for it with the X-Profile: 1
+    header or ?_profile=1. Other requests only pay for the flag check.
+    The artifacts are downloadable through the id in the X-Profile-Id header.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not profiling_requested(request) or not authorized(request):
+            return self.get_response(request)
+        response, profile_id = profile_request(request, self.get_response)
+        response["X-Profile-Id"] = profile_id
+        return response
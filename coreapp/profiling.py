@@ -0,0 +1,194 @@
+import cProfile
+import io
+import json
+import pstats
+import re
+import shutil
+import threading
+import time
+import tracemalloc
+import uuid
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.db import connections
+from rest_framework.exceptions import AuthenticationFailed
+
+from usersapp.authentication import RevocationAwareJWTAuthentication
+from usersapp.permissions import IsAdmin
+
+PROFILE_ID_RE = re.compile(r"^[0-9a-f]{32}$")
+# Files written for every profiled request
+ARTIFACTS = {
+    "summary.json": "application/json",
+    "profile.txt": "text/plain; charset=utf-8",
+    "profile.pstats": "application/octet-stream",
+}
+# Functions listed in profile.txt
+TOP_FUNCTIONS = 60
+
+# Profiled requests currently tracing allocations, and whether tracemalloc
+# was started by them (rather than by -X tracemalloc) and must be stopped
+_tracing_lock = threading.Lock()
+_tracing_requests = 0
+_tracing_started = False
+
+
+def profiling_requested(request):
+    """
+    Return True when the request asks to be profiled through the X-Profile
+    header or ?_profile=1.
+    """
+    return (
+        request.META.get("HTTP_X_PROFILE") == "1" or request.GET.get("_profile") == "1"
+    )
+
+
+def authorized(request):
+    """
+    Return True when the request carries a valid JWT of an admin user.
+    The DRF view authenticates again later, so nothing is stored on the request.
+    """
+    try:
+        result = RevocationAwareJWTAuthentication().authenticate(request)
+    except AuthenticationFailed:
+        return False
+    if result is None:
+        return False
+    return IsAdmin().has_permission(SimpleNamespace(user=result[0]), None)
+
+
+def artifact_dir(profile_id):
+    return Path(settings.PROFILE_ARTIFACT_DIR) / profile_id
+
+
+@contextmanager
+def traced_memory():
+    """
+    Keep tracemalloc running for the block. Overlapping profiled requests
+    share one tracing session, stopped when the last of them finishes.
+    """
+    global _tracing_requests, _tracing_started
+    with _tracing_lock:
+        if _tracing_requests == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracing_started = True
+        _tracing_requests += 1
+    try:
+        yield
+    finally:
+        with _tracing_lock:
+            _tracing_requests -= 1
+            if _tracing_requests == 0 and _tracing_started:
+                tracemalloc.stop()
+                _tracing_started = False
+
+
+@contextmanager
+def captured_queries(connection):
+    """
+    Collect the queries run on `connection` in the block into the yielded list.
+    Unlike CaptureQueriesContext, this does not open the connection, so
+    databases the request never touches are left alone.
+    """
+    queries = []
+
+    def record(execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            queries.append({"sql": sql, "time": time.perf_counter() - started})
+
+    with connection.execute_wrapper(record):
+        yield queries
+
+
+def profile_request(request, get_response):
+    """
+    Run get_response under cProfile, SQL capture on every database connection
+    and tracemalloc, store the artifacts and return (response, profile_id).
+    tracemalloc is process-wide, so concurrent requests in other threads are
+    included in the allocation peak.
+    """
+    profiler = cProfile.Profile()
+    with ExitStack() as stack:
+        stack.enter_context(traced_memory())
+        tracemalloc.reset_peak()
+        baseline, _peak = tracemalloc.get_traced_memory()
+        captured = {
+            connection.alias: stack.enter_context(captured_queries(connection))
+            for connection in connections.all()
+        }
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            response = get_response(request)
+        finally:
+            profiler.disable()
+            elapsed = time.perf_counter() - started
+            current, peak = tracemalloc.get_traced_memory()
+
+    queries = [
+        {"database": alias, "sql": query["sql"], "time": float(query["time"])}
+        for alias, recorded in captured.items()
+        for query in recorded
+    ]
+    summary = {
+        "method": request.method,
+        "path": request.get_full_path(),
+        "status": response.status_code,
+        "wall_time_ms": round(elapsed * 1000, 3),
+        "query_count": len(queries),
+        "query_time_ms": round(sum(query["time"] for query in queries) * 1000, 3),
+        "memory_peak_bytes": peak - baseline,
+        "memory_retained_bytes": current - baseline,
+        "queries": queries,
+    }
+    profile_id = uuid.uuid4().hex
+    store_artifacts(profile_id, profiler, summary)
+    return response, profile_id
+
+
+def store_artifacts(profile_id, profiler, summary):
+    """
+    Write the summary, a text report and the raw pstats dump, then drop the
+    oldest profiles beyond PROFILE_ARTIFACT_KEEP.
+    """
+    directory = artifact_dir(profile_id)
+    directory.mkdir(parents=True, exist_ok=True)
+    summary["profile_id"] = profile_id
+    (directory / "summary.json").write_text(json.dumps(summary, indent=2))
+
+    report = io.StringIO()
+    stats = pstats.Stats(profiler, stream=report)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(TOP_FUNCTIONS)
+    (directory / "profile.txt").write_text(report.getvalue())
+    stats.dump_stats(directory / "profile.pstats")
+
+    profiles = sorted(
+        (path for path in directory.parent.iterdir() if path.is_dir()),
+        key=lambda path: path.stat().st_mtime,
+        reverse=True,
+    )
+    for stale in profiles[settings.PROFILE_ARTIFACT_KEEP :]:
+        shutil.rmtree(stale, ignore_errors=True)
+
+
+def list_profiles():
+    """
+    Return the stored profile summaries, newest first.
+    """
+    root = Path(settings.PROFILE_ARTIFACT_DIR)
+    if not root.is_dir():
+        return []
+    summaries = []
+    for path in root.glob("*/summary.json"):
+        summary = json.loads(path.read_text())
+        summary.pop("queries", None)
+        summary["created"] = path.stat().st_mtime
+        summaries.append(summary)
+    summaries.sort(key=lambda summary: summary["created"], reverse=True)
+    return summaries
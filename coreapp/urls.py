@@ -0,0 +1,11 @@
+from django.urls import path
+from .views import ProfileArtifactView, ProfileListView
+
+urlpatterns = [
+    path("", ProfileListView.as_view(), name="profiles"),
+    path(
+        "<str:profile_id>/<str:artifact>",
+        ProfileArtifactView.as_view(),
+        name="profile-artifact",
+    ),
+]
@@ -0,0 +1,48 @@
+from django.http import FileResponse
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from usersapp.permissions import IsAdmin
+from .profiling import ARTIFACTS, PROFILE_ID_RE, artifact_dir, list_profiles
+
+
+class ProfileListView(APIView):
+    """
+    View to list the stored request profiles, newest first.
+    Accessible only by authenticated Admin users.
+    """
+
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    def get(self, request):
+        return Response(list_profiles(), status=status.HTTP_200_OK)
+
+
+class ProfileArtifactView(APIView):
+    """
+    View to download one artifact (summary.json, profile.txt or profile.pstats)
+    of a stored request profile.
+    Accessible only by authenticated Admin users.
+    """
+
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    def get(self, request, profile_id, artifact):
+        path = artifact_dir(profile_id) / artifact
+        if (
+            not PROFILE_ID_RE.match(profile_id)
+            or artifact not in ARTIFACTS
+            or not path.is_file()
+        ):
+            return Response(
+                {"details": "Profile artifact not found."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        return FileResponse(
+            path.open("rb"),
+            as_attachment=artifact == "profile.pstats",
+            filename=f"{profile_id}-{artifact}",
+            content_type=ARTIFACTS[artifact],
+        )
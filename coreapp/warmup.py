@@ -0,0 +1,59 @@
+import logging
+import time
+
+from django.conf import settings
+from django.db import connections
+from django.urls import URLResolver, get_resolver
+
+from .fastpath import get_row_serializer
+
+logger = logging.getLogger(__name__)
+
+
+def iter_view_classes(patterns):
+    """
+    Yield the class of every class-based view reachable from `patterns`.
+    """
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from iter_view_classes(pattern.url_patterns)
+            continue
+        view_class = getattr(pattern.callback, "view_class", None)
+        if view_class is not None:
+            yield view_class
+
+
+def warm_up(connect_databases=True):
+    """
+    Do the one-off work of the first request before the worker accepts traffic:
+    import every URLconf and view, build each view's serializer fields and
+    fast-path row serializer, and open the database connections.
+    Disable WARMUP_DB_CONNECTIONS when the app is preloaded in a master process
+    that forks workers, so the workers do not inherit open connections.
+    The ASGI entry point passes connect_databases=False: it is imported inside
+    the server's event loop, where connecting raises SynchronousOnlyOperation,
+    and requests run on other threads with their own connections anyway.
+    """
+    started = time.perf_counter()
+    resolver = get_resolver()
+    # Populating the reverse dictionary imports every included URLconf
+    resolver.reverse_dict
+
+    for view_class in iter_view_classes(resolver.url_patterns):
+        serializer_class = getattr(view_class, "serializer_class", None)
+        if serializer_class is None:
+            continue
+        try:
+            serializer_class().fields
+            if getattr(view_class, "fast_list", False):
+                get_row_serializer(serializer_class)
+        except Exception:
+            logger.debug("Could not warm %s", serializer_class, exc_info=True)
+
+    if connect_databases and settings.WARMUP_DB_CONNECTIONS:
+        for connection in connections.all():
+            # With CONN_MAX_AGE = 0 the first request closes it again
+            if connection.settings_dict["CONN_MAX_AGE"]:
+                connection.ensure_connection()
+
+    logger.info("Warm-up finished in %.0f ms", (time.perf_counter() - started) * 1000)
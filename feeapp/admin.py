@@ -1,6 +1,23 @@
 from django.contrib import admin
-from .models import FeesHistory
 
-# Register your models here.
+from students.admin import StudentRecordAdmin
+from .models import FeeSchedule, FeesHistory
+from .receipts import invalidate_receipts
 
-admin.site.register(FeesHistory)
+
+@admin.register(FeesHistory)
+class FeesHistoryAdmin(StudentRecordAdmin):
+    list_display = ("id", "student", "fee_type", "amount", "payment_date")
+    list_filter = ("fee_type", "payment_date")
+
+    def records_changed(self, rows):
+        super().records_changed(rows)
+        for pk, _student_id in rows:
+            invalidate_receipts(pk)
+
+
+@admin.register(FeeSchedule)
+class FeeScheduleAdmin(admin.ModelAdmin):
+    list_display = ("term", "grade", "fee_type", "amount", "term_start", "term_end")
+    list_filter = ("term", "grade")
+    list_select_related = ("grade",)
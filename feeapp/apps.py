@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class FeeappConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "feeapp"
+
+    def ready(self):
+        # Connect the receipt cache invalidation handlers
+        from . import signals  # noqa: F401
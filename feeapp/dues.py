@@ -0,0 +1,218 @@
+from collections import defaultdict
+from decimal import Decimal
+from itertools import islice
+
+from django.db import router, transaction
+from django.utils import timezone
+
+from students.models import Student
+from .models import DuesSnapshot, FeeSchedule, FeesHistory
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+# Payments are converted to arrays this many rows at a time
+CHUNK_SIZE = 20000
+
+
+class NoFeeSchedule(Exception):
+    """
+    Raised when dues are requested for a term without any fee schedule.
+    """
+
+
+def to_cents(amount):
+    return int(amount.scaleb(2))
+
+
+def from_cents(cents):
+    return Decimal(int(cents)).scaleb(-2)
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def load_term(term):
+    """
+    Load the term's schedules, the students of every scheduled grade and a
+    streaming iterator over the payments that may count towards them.
+    """
+    schedules = list(
+        FeeSchedule.objects.filter(term=term).values_list(
+            "grade_id", "fee_type", "amount", "term_start", "term_end"
+        )
+    )
+    if not schedules:
+        raise NoFeeSchedule(f"No fee schedule found for term '{term}'.")
+
+    grade_ids = {grade_id for grade_id, *_rest in schedules}
+    students = list(
+        Student.objects.filter(grade_id__in=grade_ids)
+        .order_by("pk")
+        .values_list("pk", "grade_id")
+    )
+    payments = (
+        FeesHistory.objects.filter(
+            student__grade_id__in=grade_ids,
+            fee_type__in={fee_type for _grade, fee_type, *_rest in schedules},
+            payment_date__gte=min(row[3] for row in schedules),
+            payment_date__lte=max(row[4] for row in schedules),
+        )
+        .values_list("student_id", "fee_type", "payment_date", "amount")
+        .iterator(chunk_size=CHUNK_SIZE)
+    )
+    return schedules, students, payments
+
+
+def dues_numpy(schedules, students, payments):
+    """
+    Vectorized evaluation. Schedules become (grade x fee type) matrices of
+    amounts and term windows; payments are accumulated chunk by chunk into a
+    (student x fee type) matrix; outstanding is one clipped subtraction.
+    Yields (student_id, grade_id, due, paid, outstanding) in cents.
+    """
+    grade_index = {
+        grade_id: i for i, grade_id in enumerate(sorted({row[0] for row in schedules}))
+    }
+    type_index = {
+        fee_type: i for i, fee_type in enumerate(sorted({row[1] for row in schedules}))
+    }
+    types = len(type_index)
+
+    due = np.zeros((len(grade_index), types), dtype=np.int64)
+    # Unscheduled cells get an empty window so no payment counts towards them
+    window_start = np.ones((len(grade_index), types), dtype=np.int64)
+    window_end = np.zeros((len(grade_index), types), dtype=np.int64)
+    for grade_id, fee_type, amount, term_start, term_end in schedules:
+        cell = grade_index[grade_id], type_index[fee_type]
+        due[cell] = to_cents(amount)
+        window_start[cell] = term_start.toordinal()
+        window_end[cell] = term_end.toordinal()
+
+    row_index = {student_id: i for i, (student_id, _grade) in enumerate(students)}
+    student_grades = np.fromiter(
+        (grade_index[grade_id] for _pk, grade_id in students),
+        dtype=np.int64,
+        count=len(students),
+    )
+    paid = np.zeros(len(students) * types, dtype=np.int64)
+
+    for chunk in chunked(payments, CHUNK_SIZE):
+        # Students created after load_term read the student list are skipped
+        chunk = [payment for payment in chunk if payment[0] in row_index]
+        count = len(chunk)
+        rows = np.fromiter((row_index[p[0]] for p in chunk), np.int64, count)
+        cols = np.fromiter((type_index[p[1]] for p in chunk), np.int64, count)
+        dates = np.fromiter((p[2].toordinal() for p in chunk), np.int64, count)
+        cents = np.fromiter((to_cents(p[3]) for p in chunk), np.int64, count)
+
+        grades = student_grades[rows]
+        inside = (dates >= window_start[grades, cols]) & (
+            dates <= window_end[grades, cols]
+        )
+        np.add.at(paid, rows[inside] * types + cols[inside], cents[inside])
+
+    paid = paid.reshape(len(students), types)
+    owed = due[student_grades]
+    # Overpaying one fee type does not settle another
+    outstanding = np.maximum(owed - paid, 0).sum(axis=1)
+
+    return zip(
+        (student_id for student_id, _grade in students),
+        (grade_id for _pk, grade_id in students),
+        owed.sum(axis=1).tolist(),
+        paid.sum(axis=1).tolist(),
+        outstanding.tolist(),
+    )
+
+
+def dues_python(schedules, students, payments):
+    """
+    Pure Python evaluation with the same semantics as dues_numpy: one pass over
+    the payment stream into per (student, fee type) totals, then one pass over
+    the students.
+    """
+    windows = {}
+    fees_by_grade = defaultdict(list)
+    for grade_id, fee_type, amount, term_start, term_end in schedules:
+        windows[grade_id, fee_type] = (term_start, term_end)
+        fees_by_grade[grade_id].append((fee_type, to_cents(amount)))
+
+    student_grades = dict(students)
+    paid = defaultdict(int)
+    for student_id, fee_type, payment_date, amount in payments:
+        window = windows.get((student_grades.get(student_id), fee_type))
+        if window and window[0] <= payment_date <= window[1]:
+            paid[student_id, fee_type] += to_cents(amount)
+
+    for student_id, grade_id in students:
+        due = total_paid = outstanding = 0
+        for fee_type, amount in fees_by_grade[grade_id]:
+            paid_for_type = paid.get((student_id, fee_type), 0)
+            due += amount
+            total_paid += paid_for_type
+            outstanding += max(amount - paid_for_type, 0)
+        yield student_id, grade_id, due, total_paid, outstanding
+
+
+ENGINES = {"numpy": dues_numpy, "python": dues_python}
+
+
+def default_engine():
+    return "python" if np is None else "numpy"
+
+
+def write_snapshot(term, rows, batch_size=5000):
+    """
+    Replace the term's snapshot with `rows` in one transaction.
+    Returns (students, students_in_arrears, total_outstanding_cents).
+    """
+    computed_at = timezone.now()
+    students = in_arrears = total_outstanding = 0
+    snapshots = (
+        DuesSnapshot(
+            term=term,
+            student_id=student_id,
+            grade_id=grade_id,
+            amount_due=from_cents(due),
+            amount_paid=from_cents(paid),
+            outstanding=from_cents(outstanding),
+            computed_at=computed_at,
+        )
+        for student_id, grade_id, due, paid, outstanding in rows
+    )
+    with transaction.atomic(using=router.db_for_write(DuesSnapshot)):
+        DuesSnapshot.objects.filter(term=term).delete()
+        for batch in chunked(snapshots, batch_size):
+            DuesSnapshot.objects.bulk_create(batch, batch_size=batch_size)
+            students += len(batch)
+            for snapshot in batch:
+                if snapshot.outstanding:
+                    in_arrears += 1
+                    total_outstanding += to_cents(snapshot.outstanding)
+    return students, in_arrears, total_outstanding
+
+
+def compute_dues(term, engine=None):
+    """
+    Compute what every student of the term's scheduled grades still owes and
+    store it as the term's DuesSnapshot. Returns a JSON-serializable summary.
+    """
+    engine = engine or default_engine()
+    if engine == "numpy" and np is None:
+        raise ValueError("The numpy dues engine needs the numpy package.")
+    schedules, students, payments = load_term(term)
+    rows = ENGINES[engine](schedules, students, payments)
+    count, in_arrears, total_outstanding = write_snapshot(term, rows)
+    return {
+        "term": term,
+        "engine": engine,
+        "students": count,
+        "students_in_arrears": in_arrears,
+        "total_outstanding": str(from_cents(total_outstanding)),
+    }
@@ -0,0 +1,26 @@
+from jobsapp.exports import export_csv
+from jobsapp.registry import job_handler
+
+from .dues import compute_dues
+from .models import FeesHistory
+
+EXPORT_FIELDS = ["id", "student_id", "fee_type", "amount", "payment_date", "remarks"]
+
+
+@job_handler("feeapp.export_fees")
+def export_fees_job(payload, progress):
+    """
+    Export fee history to CSV, optionally for a single student.
+    """
+    queryset = FeesHistory.objects.order_by("pk")
+    if payload.get("student"):
+        queryset = queryset.filter(student_id=payload["student"])
+    return export_csv(queryset, EXPORT_FIELDS, "fees", progress)
+
+
+@job_handler("feeapp.compute_dues")
+def compute_dues_job(payload, progress):
+    """
+    Recompute the dues snapshot of one term.
+    """
+    return compute_dues(payload["term"])
@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import CommandError
+
+from feeapp.dues import ENGINES, NoFeeSchedule, compute_dues, default_engine
+from schoolsapp.commands import PerSchoolCommand
+
+
+class Command(PerSchoolCommand):
+    help = (
+        "Compute what every student still owes for a term from the fee schedule "
+        "and payments, and store it as the term's dues snapshot."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--term", required=True)
+        parser.add_argument(
+            "--engine",
+            choices=sorted(ENGINES),
+            default=None,
+            help=f"Evaluation engine (default: {default_engine()}).",
+        )
+
+    def handle_school(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            summary = compute_dues(options["term"], engine=options["engine"])
+        except NoFeeSchedule as exc:
+            # Other schools may still have a schedule for this term
+            self.stderr.write(str(exc))
+            return
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"{summary['term']}: {summary['students']} students, "
+            f"{summary['students_in_arrears']} in arrears, "
+            f"{summary['total_outstanding']} outstanding "
+            f"({summary['engine']} engine, {elapsed:.2f}s)"
+        )
@@ -1,10 +1,11 @@
 from datetime import date
 from django.db import models
 from django.core.exceptions import ValidationError
-from students.models import Student
+from schoolsapp.models import SchoolScopedModel
+from students.models import Grade, Student
 
 
-class FeesHistory(models.Model):
+class FeesHistory(SchoolScopedModel):
     student = models.ForeignKey(
         Student, on_delete=models.CASCADE, related_name="fees_history"
     )
@@ -12,6 +13,8 @@ class FeesHistory(models.Model):
     amount = models.DecimalField(max_digits=10, decimal_places=2)
     payment_date = models.DateField()
     remarks = models.TextField(null=True, blank=True)
+    # Bumped on every update; backs ETag / If-Match optimistic concurrency
+    version = models.PositiveIntegerField(default=1)
 
     def clean(self):
         """
@@ -51,3 +54,92 @@ class FeesHistory(models.Model):
         String representation of the model.
         """
         return f"{self.student.name} - {self.fee_type}: {self.amount}"
+
+    class Meta:
+        # Back the admin changelist filters
+        indexes = [
+            models.Index(fields=["fee_type"]),
+            models.Index(fields=["payment_date"]),
+        ]
+
+
+class FeesHistoryArchive(SchoolScopedModel):
+    """
+    Fee records from closed academic years, moved out of FeesHistory by the
+    archive_history command. Rows keep their original id.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    student = models.ForeignKey(
+        Student, on_delete=models.CASCADE, related_name="archived_fees_history"
+    )
+    fee_type = models.CharField(max_length=255)
+    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    payment_date = models.DateField(db_index=True)
+    remarks = models.TextField(null=True, blank=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.student_id} - {self.fee_type}: {self.amount} (archived)"
+
+
+class FeeSchedule(SchoolScopedModel):
+    """
+    The amount a student of `grade` owes for `fee_type` in a term. Payments of
+    that fee type dated within the term window count towards it.
+    """
+
+    grade = models.ForeignKey(
+        Grade, on_delete=models.CASCADE, related_name="fee_schedules"
+    )
+    term = models.CharField(max_length=20)
+    term_start = models.DateField()
+    term_end = models.DateField()
+    fee_type = models.CharField(max_length=255)
+    amount = models.DecimalField(max_digits=10, decimal_places=2)
+
+    def clean(self):
+        if self.amount <= 0:
+            raise ValidationError("Amount must be greater than 0.")
+        if self.term_end < self.term_start:
+            raise ValidationError("Term end cannot be earlier than term start.")
+
+    def __str__(self):
+        return f"{self.term} {self.grade_id} - {self.fee_type}: {self.amount}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["school", "term", "grade", "fee_type"],
+                name="unique_fee_schedule",
+            )
+        ]
+
+
+class DuesSnapshot(SchoolScopedModel):
+    """
+    What one student owed, paid and still owes for a term, as of `computed_at`.
+    Written in bulk by feeapp.dues.compute_dues; never edited by hand.
+    """
+
+    term = models.CharField(max_length=20)
+    student = models.ForeignKey(
+        Student, on_delete=models.CASCADE, related_name="dues_snapshots"
+    )
+    grade = models.ForeignKey(Grade, on_delete=models.CASCADE, related_name="+")
+    amount_due = models.DecimalField(max_digits=12, decimal_places=2)
+    amount_paid = models.DecimalField(max_digits=12, decimal_places=2)
+    outstanding = models.DecimalField(max_digits=12, decimal_places=2)
+    computed_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.term} {self.student_id}: {self.outstanding} outstanding"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["term", "student"], name="unique_dues_snapshot"
+            )
+        ]
+        # Arrears lists read the largest balances of a term first
+        indexes = [models.Index(fields=["term", "-outstanding"])]
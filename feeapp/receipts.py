@@ -0,0 +1,291 @@
+import atexit
+import hashlib
+import json
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+from pathlib import Path
+from zipfile import ZIP_DEFLATED, ZipFile
+
+from django.conf import settings
+from django.template.loader import render_to_string
+
+from schoolsapp.context import current_school, current_school_id, use_school
+from students.models import normalize_grade_key
+from .models import FeesHistory
+
+try:
+    from fpdf import FPDF
+except ImportError:  # pragma: no cover - fpdf2 is optional
+    FPDF = None
+
+# Bump when the receipt layout changes so cached receipts are re-rendered
+RECEIPT_LAYOUT_VERSION = 1
+
+RECEIPT_FIELDS = {
+    "id": "id",
+    "student_name": "student__name",
+    "grade": "student__grade__name",
+    "fee_type": "fee_type",
+    "amount": "amount",
+    "payment_date": "payment_date",
+    "remarks": "remarks",
+}
+CONTENT_TYPES = {"html": "text/html; charset=utf-8", "pdf": "application/pdf"}
+
+
+class ReceiptFormatUnavailable(Exception):
+    """
+    Raised when PDF receipts are requested but fpdf2 is not installed.
+    """
+
+
+def pdf_available():
+    return FPDF is not None
+
+
+def receipt_rows(queryset):
+    """
+    Return plain receipt data dicts for the fee records in `queryset`.
+    Values are strings so the dicts hash stably and pickle cheaply.
+    """
+    rows = queryset.values(*RECEIPT_FIELDS.values())
+    return [
+        {
+            name: "" if row[lookup] is None else str(row[lookup])
+            for name, lookup in RECEIPT_FIELDS.items()
+        }
+        for row in rows
+    ]
+
+
+def content_hash(data):
+    payload = json.dumps(data, sort_keys=True) + f"|{RECEIPT_LAYOUT_VERSION}"
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def render_html(data):
+    return render_to_string("feeapp/receipt.html", data).encode()
+
+
+def render_pdf(data):
+    if FPDF is None:
+        raise ReceiptFormatUnavailable("PDF receipts need the fpdf2 package.")
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Helvetica", "B", 16)
+    pdf.cell(0, 12, "Fee Receipt", new_x="LMARGIN", new_y="NEXT")
+    pdf.set_font("Helvetica", size=11)
+    for label, name in (
+        ("Receipt No.", "id"),
+        ("Student", "student_name"),
+        ("Grade", "grade"),
+        ("Fee Type", "fee_type"),
+        ("Amount", "amount"),
+        ("Payment Date", "payment_date"),
+        ("Remarks", "remarks"),
+    ):
+        pdf.cell(45, 8, label)
+        pdf.multi_cell(0, 8, data[name], new_x="LMARGIN", new_y="NEXT")
+    return bytes(pdf.output())
+
+
+RENDERERS = {"html": render_html, "pdf": render_pdf}
+
+
+def render_receipt(data, fmt):
+    return RENDERERS[fmt](data)
+
+
+def _cache_dir(record_id):
+    # Record ids are only unique per school database, so each school has its own tree
+    root = Path(settings.RECEIPT_CACHE_DIR) / f"school-{current_school_id() or 0}"
+    # Spread files over 256 directories to keep each one small
+    return root / f"{int(record_id) % 256:02x}"
+
+
+def cached_path(data, fmt):
+    """
+    Content-addressed cache path: changing any receipt field changes the name.
+    """
+    return _cache_dir(data["id"]) / f"{data['id']}-{content_hash(data)}.{fmt}"
+
+
+def store(path, content):
+    """
+    Write a rendered receipt and drop older renderings of the same record.
+    """
+    record_id = path.name.split("-", 1)[0]
+    for stale in path.parent.glob(f"{record_id}-*{path.suffix}"):
+        if stale != path:
+            stale.unlink(missing_ok=True)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_suffix(path.suffix + ".tmp")
+    temporary.write_bytes(content)
+    temporary.replace(path)
+
+
+def invalidate_receipts(record_id):
+    """
+    Remove every cached rendering of a fee record.
+    """
+    for path in _cache_dir(record_id).glob(f"{record_id}-*"):
+        path.unlink(missing_ok=True)
+
+
+def get_receipt(data, fmt):
+    """
+    Return the receipt for one record, rendering it only on a cache miss.
+    """
+    path = cached_path(data, fmt)
+    if path.is_file():
+        return path.read_bytes()
+    content = render_receipt(data, fmt)
+    store(path, content)
+    return content
+
+
+def _render_for_pool(args):
+    data, fmt = args
+    return render_receipt(data, fmt)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def render_pool():
+    """
+    Return the process pool shared by every receipt batch of this process,
+    starting it on first use. Spawning workers and importing Django in them
+    costs far more than rendering a small batch, so the pool is kept.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            from jobsapp.runner import setup_worker
+
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.RECEIPT_BATCH_PROCESSES,
+                mp_context=get_context("spawn"),
+                initializer=setup_worker,
+            )
+        return _pool
+
+
+def _discard_pool(pool):
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_render_pool():
+    with _pool_lock:
+        pool = _pool
+    if pool is not None:
+        _discard_pool(pool)
+
+
+atexit.register(shutdown_render_pool)
+
+
+def _render_misses(misses, fmt):
+    """
+    Yield the rendered receipts of `misses` in order. Batches below
+    RECEIPT_POOL_MIN_BATCH are rendered in this process.
+    """
+    if len(misses) < settings.RECEIPT_POOL_MIN_BATCH:
+        for data in misses:
+            yield render_receipt(data, fmt)
+        return
+    pool = render_pool()
+    try:
+        # map() yields results in order, so receipts stream as they finish
+        yield from pool.map(
+            _render_for_pool, [(data, fmt) for data in misses], chunksize=32
+        )
+    except BrokenProcessPool:
+        # A worker died; the next batch starts a fresh pool
+        _discard_pool(pool)
+        raise
+
+
+def iter_receipts(rows, fmt):
+    """
+    Yield (data, content) for every row, rendering cache misses in the shared
+    process pool, or in this process for small batches.
+    """
+    if fmt == "pdf" and FPDF is None:
+        raise ReceiptFormatUnavailable("PDF receipts need the fpdf2 package.")
+
+    misses = [data for data in rows if not cached_path(data, fmt).is_file()]
+    miss_ids = {data["id"] for data in misses}
+    contents = _render_misses(misses, fmt)
+    for data in rows:
+        if data["id"] in miss_ids:
+            content = next(contents)
+            store(cached_path(data, fmt), content)
+        else:
+            content = cached_path(data, fmt).read_bytes()
+        yield data, content
+
+
+class _ZipBuffer:
+    """
+    Write-only file object that hands written bytes back through drain().
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def stream_receipts_zip(rows, fmt):
+    """
+    Return an iterator over a zip archive of receipts, produced chunk by chunk
+    without buffering the whole file.
+    """
+    # The response is consumed after the request's school scope has ended
+    school = current_school.get()
+    receipts = iter_receipts(rows, fmt)
+
+    def generate():
+        buffer = _ZipBuffer()
+        with ZipFile(buffer, "w", compression=ZIP_DEFLATED) as archive:
+            while True:
+                with use_school(school):
+                    receipt = next(receipts, None)
+                if receipt is None:
+                    break
+                data, content = receipt
+                archive.writestr(f"receipt-{data['id']}.{fmt}", content)
+                yield buffer.drain()
+        yield buffer.drain()
+
+    return generate()
+
+
+def term_receipts(grade, date_from, date_to):
+    """
+    Return receipt data for every payment of a grade within a term.
+    """
+    queryset = FeesHistory.objects.filter(
+        student__grade__key=normalize_grade_key(grade),
+        payment_date__gte=date_from,
+        payment_date__lte=date_to,
+    ).order_by("student__name", "payment_date", "id")
+    return receipt_rows(queryset)
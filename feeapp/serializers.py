@@ -1,10 +1,18 @@
 from rest_framework import serializers
 from datetime import date
 
-from .models import FeesHistory
+from coreapp.concurrency import VersionedUpdateSerializerMixin
+from coreapp.sparse import SparseFieldsSerializerMixin
 
+from students.serializers import GradeField, SaveNewGradesMixin
+from .models import DuesSnapshot, FeeSchedule, FeesHistory, FeesHistoryArchive
 
-class FeeHistorySerializers(serializers.ModelSerializer):
+
+class FeeHistorySerializers(
+    SparseFieldsSerializerMixin,
+    VersionedUpdateSerializerMixin,
+    serializers.ModelSerializer,
+):
     remarks = serializers.CharField(
         required=True, allow_blank=False
     )  # Remarks is required
@@ -62,3 +70,113 @@ class FeeHistorySerializers(serializers.ModelSerializer):
             )
 
         return data
+
+
+class FeeHistoryArchiveSerializers(
+    SparseFieldsSerializerMixin, serializers.ModelSerializer
+):
+    """
+    Read-only representation of an archived fee record.
+    """
+
+    class Meta:
+        model = FeesHistoryArchive
+        fields = [
+            "id",
+            "student",
+            "fee_type",
+            "amount",
+            "payment_date",
+            "remarks",
+            "archived_at",
+        ]
+        read_only_fields = fields
+
+
+class ReceiptQuerySerializer(serializers.Serializer):
+    """
+    Validates the receipt format requested through ?type=.
+    """
+
+    type = serializers.ChoiceField(choices=["html", "pdf"], default="html")
+
+
+class ReceiptBatchQuerySerializer(ReceiptQuerySerializer):
+    """
+    Validates a request for every receipt of a grade within a term.
+    """
+
+    grade = serializers.CharField(max_length=20)
+    date_from = serializers.DateField()
+    date_to = serializers.DateField()
+
+    def validate(self, data):
+        if data["date_from"] > data["date_to"]:
+            raise serializers.ValidationError(
+                {"date_to": "date_to cannot be earlier than date_from."}
+            )
+        return data
+
+
+class FeeScheduleSerializer(SaveNewGradesMixin, serializers.ModelSerializer):
+    grade = GradeField()
+
+    class Meta:
+        model = FeeSchedule
+        fields = ["id", "grade", "term", "term_start", "term_end", "fee_type", "amount"]
+        read_only_fields = ["id"]
+
+    def validate_amount(self, value):
+        if value <= 0:
+            raise serializers.ValidationError("Amount must be greater than 0.")
+        return value
+
+    def validate(self, data):
+        term_start = data.get("term_start", getattr(self.instance, "term_start", None))
+        term_end = data.get("term_end", getattr(self.instance, "term_end", None))
+        if term_start and term_end and term_end < term_start:
+            raise serializers.ValidationError(
+                {"term_end": "term_end cannot be earlier than term_start."}
+            )
+        return data
+
+
+class ArrearsSerializer(serializers.ModelSerializer):
+    """
+    Read-only row of a term's dues snapshot.
+    """
+
+    student_name = serializers.SlugRelatedField(
+        source="student", slug_field="name", read_only=True
+    )
+    grade = serializers.SlugRelatedField(slug_field="name", read_only=True)
+
+    class Meta:
+        model = DuesSnapshot
+        fields = [
+            "student",
+            "student_name",
+            "grade",
+            "amount_due",
+            "amount_paid",
+            "outstanding",
+            "computed_at",
+        ]
+        read_only_fields = fields
+
+
+class DuesRequestSerializer(serializers.Serializer):
+    """
+    Validates a request to recompute the dues snapshot of a term.
+    """
+
+    term = serializers.CharField(max_length=20)
+
+
+class ArrearsQuerySerializer(DuesRequestSerializer):
+    """
+    Validates the query parameters of the arrears list.
+    """
+
+    grade = serializers.CharField(max_length=20, required=False)
+    limit = serializers.IntegerField(default=100, min_value=1, max_value=5000)
@@ -0,0 +1,14 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import FeesHistory
+from .receipts import invalidate_receipts
+
+
+@receiver([post_save, post_delete], sender=FeesHistory)
+def invalidate_receipts_for_record(sender, instance, created=False, **kwargs):
+    """
+    Drop cached receipts when a fee record is updated or deleted.
+    """
+    if not created:
+        invalidate_receipts(instance.pk)
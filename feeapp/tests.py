@@ -1,3 +1,277 @@
-from django.test import TestCase
+import json
+import tempfile
+import threading
+import unittest
+from datetime import date
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+
+from coreapp.idempotency import REPLAYED_HEADER, IdempotencyStore
+from students.models import Grade, Student
+from usersapp.models import User
+from . import dues, receipts
+from .models import DuesSnapshot, FeeSchedule, FeesHistory, FeesHistoryArchive
+from .serializers import (
+    ArrearsSerializer,
+    FeeHistoryArchiveSerializers,
+    FeeHistorySerializers,
+)
+
+
+class FastListTests(TestCase):
+    """
+    The values() fast path of list views with Decimal columns renders the
+    same JSON as their serializers.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            User.objects.create_user("staff", "staff@example.com", "pw", role="staff")
+        )
+        grade = Grade.objects.resolve("5-A")
+        student = Student.objects.create(name="Asha Rao", age=10, grade=grade)
+        FeesHistory.objects.create(
+            student=student,
+            fee_type="Tuition",
+            amount=Decimal("1500.5"),
+            payment_date=date(2024, 1, 5),
+            remarks="Term 1",
+        )
+        FeesHistoryArchive.objects.create(
+            id=9001,
+            student=student,
+            fee_type="Exam",
+            amount=Decimal("250"),
+            payment_date=date(2020, 3, 1),
+        )
+        DuesSnapshot.objects.create(
+            term="2024-T1",
+            student=student,
+            grade=grade,
+            amount_due=Decimal("1300"),
+            amount_paid=Decimal("900.25"),
+            outstanding=Decimal("399.75"),
+            computed_at=timezone.now(),
+        )
+
+    def assertMatchesSerializer(self, url, serializer_class, queryset):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        expected = json.loads(
+            JSONRenderer().render(serializer_class(queryset, many=True).data)
+        )
+        self.assertEqual(response.json(), expected)
+
+    def test_fee_history(self):
+        self.assertMatchesSerializer(
+            "/fees/create_fees/", FeeHistorySerializers, FeesHistory.objects.all()
+        )
+
+    def test_archived_fees(self):
+        self.assertMatchesSerializer(
+            "/fees/archived_fees/",
+            FeeHistoryArchiveSerializers,
+            FeesHistoryArchive.objects.all(),
+        )
+
+    def test_arrears(self):
+        self.assertMatchesSerializer(
+            "/fees/arrears/?term=2024-T1", ArrearsSerializer, DuesSnapshot.objects.all()
+        )
+
+
+class IdempotentCreateTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            User.objects.create_user("staff", "staff@example.com", "pw", role="staff")
+        )
+        self.student = Student.objects.create(
+            name="Asha Rao", age=10, grade=Grade.objects.resolve("5-A")
+        )
+        self.payload = {
+            "student": self.student.pk,
+            "fee_type": "Tuition",
+            "amount": "1500.00",
+            "payment_date": date(2024, 1, 5).isoformat(),
+            "remarks": "Term 1",
+        }
+
+    def test_retry_replays_the_first_response(self):
+        headers = {"HTTP_IDEMPOTENCY_KEY": "fee-1"}
+        first = self.client.post(
+            "/fees/create_fees/", self.payload, format="json", **headers
+        )
+        self.assertEqual(first.status_code, 201)
+
+        retry = self.client.post(
+            "/fees/create_fees/", self.payload, format="json", **headers
+        )
+        self.assertEqual(retry.status_code, 201)
+        self.assertEqual(retry.json(), first.json())
+        self.assertEqual(retry[REPLAYED_HEADER], "true")
+        self.assertEqual(FeesHistory.objects.count(), 1)
+
+    def test_key_reused_with_another_body_is_rejected(self):
+        headers = {"HTTP_IDEMPOTENCY_KEY": "fee-2"}
+        self.client.post("/fees/create_fees/", self.payload, format="json", **headers)
+        response = self.client.post(
+            "/fees/create_fees/",
+            {**self.payload, "amount": "900.00"},
+            format="json",
+            **headers,
+        )
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(FeesHistory.objects.count(), 1)
+
+
+class IdempotencyStoreTests(TestCase):
+    def test_concurrent_retries_wait_for_the_first_request(self):
+        store = IdempotencyStore()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def produce():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return Response({"id": 1}, status=201)
+
+        results = []
+        first = threading.Thread(
+            target=lambda: results.append(store.run("key", "body", produce))
+        )
+        first.start()
+        started.wait(5)
+        retry = threading.Thread(
+            target=lambda: results.append(store.run("key", "body", produce))
+        )
+        retry.start()
+        release.set()
+        first.join(5)
+        retry.join(5)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual([r.status_code for r in results], [201, 201])
+        self.assertEqual(results[0].data, results[1].data)
+
+    @override_settings(IDEMPOTENCY_CACHE_MAX=1)
+    def test_only_answered_requests_are_evicted(self):
+        store = IdempotencyStore()
+        store.run("answered", "body", lambda: Response({"id": 1}, status=201))
+        kept = []
+
+        def produce():
+            # Another key arrives while this one is still running
+            store.run("other", "body", lambda: Response({"id": 3}, status=201))
+            kept.append("running" in store._entries)
+            return Response({"id": 2}, status=201)
+
+        store.run("running", "body", produce)
+
+        self.assertEqual(kept, [True])
+        self.assertNotIn("answered", store._entries)
+
+
+class DuesEngineTests(TestCase):
+    def setUp(self):
+        grade = Grade.objects.resolve("5-A")
+        for fee_type, amount in (("Tuition", "1000.00"), ("Transport", "300.00")):
+            FeeSchedule.objects.create(
+                grade=grade,
+                term="2024-T1",
+                term_start=date(2024, 1, 1),
+                term_end=date(2024, 3, 31),
+                fee_type=fee_type,
+                amount=Decimal(amount),
+            )
+        self.payer = Student.objects.create(name="Asha Rao", age=10, grade=grade)
+        self.debtor = Student.objects.create(name="Ravi Nair", age=10, grade=grade)
+        for fee_type, amount, paid_on in (
+            ("Tuition", "600.00", date(2024, 2, 1)),
+            # Outside the term window
+            ("Tuition", "400.00", date(2023, 12, 20)),
+            # Overpaying transport does not settle tuition
+            ("Transport", "450.00", date(2024, 1, 10)),
+            # Not scheduled for the term
+            ("Exam", "100.00", date(2024, 2, 2)),
+        ):
+            FeesHistory.objects.create(
+                student=self.payer,
+                fee_type=fee_type,
+                amount=Decimal(amount),
+                payment_date=paid_on,
+                remarks="Paid",
+            )
+
+    def test_python_engine_writes_the_snapshot(self):
+        summary = dues.compute_dues("2024-T1", engine="python")
+
+        self.assertEqual(summary["students"], 2)
+        self.assertEqual(summary["students_in_arrears"], 2)
+        self.assertEqual(summary["total_outstanding"], "1700.00")
+        payer = DuesSnapshot.objects.get(student=self.payer)
+        self.assertEqual(
+            (payer.amount_due, payer.amount_paid, payer.outstanding),
+            (Decimal("1300.00"), Decimal("1050.00"), Decimal("400.00")),
+        )
+        debtor = DuesSnapshot.objects.get(student=self.debtor)
+        self.assertEqual(debtor.outstanding, Decimal("1300.00"))
+
+    @unittest.skipIf(dues.np is None, "numpy is not installed")
+    def test_numpy_engine_matches_python_engine(self):
+        expected = list(dues.dues_python(*dues.load_term("2024-T1")))
+        actual = list(dues.dues_numpy(*dues.load_term("2024-T1")))
+        self.assertEqual(actual, expected)
+
+
+class ReceiptBatchTests(TestCase):
+    def setUp(self):
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        self.enterContext(override_settings(RECEIPT_CACHE_DIR=cache_dir.name))
+        self.addCleanup(receipts.shutdown_render_pool)
+
+    def rows(self, first_id, count):
+        return [
+            {
+                "id": str(record_id),
+                "student_name": "Asha Rao",
+                "grade": "5-A",
+                "fee_type": "Tuition",
+                "amount": "1500.00",
+                "payment_date": "2024-01-05",
+                "remarks": "",
+            }
+            for record_id in range(first_id, first_id + count)
+        ]
+
+    @override_settings(RECEIPT_POOL_MIN_BATCH=10)
+    def test_small_batch_renders_in_process(self):
+        with mock.patch.object(receipts, "render_pool") as render_pool:
+            rendered = list(receipts.iter_receipts(self.rows(1, 3), "html"))
+        render_pool.assert_not_called()
+        self.assertEqual(len(rendered), 3)
+        self.assertIn(b"Asha Rao", rendered[0][1])
+
+    @override_settings(RECEIPT_POOL_MIN_BATCH=2, RECEIPT_BATCH_PROCESSES=1)
+    def test_batches_share_one_pool(self):
+        first = list(receipts.iter_receipts(self.rows(1, 2), "html"))
+        pool = receipts.render_pool()
+        second = list(receipts.iter_receipts(self.rows(3, 2), "html"))
+
+        self.assertIs(receipts.render_pool(), pool)
+        self.assertEqual(
+            [data["id"] for data, _content in first + second], ["1", "2", "3", "4"]
+        )
+        self.assertEqual(
+            second[0][1], receipts.render_receipt(self.rows(3, 1)[0], "html")
+        )
@@ -1,9 +1,26 @@
 from django.urls import path
-from .views import FeeHistoryView, FeesHistorydetailView
+from .views import (
+    ArchivedFeeHistoryView,
+    ArrearsView,
+    ComputeDuesView,
+    ExportFeesView,
+    FeeReceiptBatchView,
+    FeeReceiptView,
+    FeeHistoryView,
+    FeeScheduleView,
+    FeesHistorydetailView,
+)
 
 urlpatterns = [
     path("create_fees/", FeeHistoryView.as_view(), name="create-fees"),
     path(
         "fees_details/<int:pk>/", FeesHistorydetailView.as_view(), name="fees-details"
     ),
+    path("archived_fees/", ArchivedFeeHistoryView.as_view(), name="archived-fees"),
+    path("export_fees/", ExportFeesView.as_view(), name="export-fees"),
+    path("receipt/<int:pk>/", FeeReceiptView.as_view(), name="fee-receipt"),
+    path("receipts_batch/", FeeReceiptBatchView.as_view(), name="fee-receipts-batch"),
+    path("fee_schedules/", FeeScheduleView.as_view(), name="fee-schedules"),
+    path("compute_dues/", ComputeDuesView.as_view(), name="compute-dues"),
+    path("arrears/", ArrearsView.as_view(), name="arrears"),
 ]
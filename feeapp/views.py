@@ -1,13 +1,45 @@
+from django.http import HttpResponse, StreamingHttpResponse
 from rest_framework import generics, status
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
 
-from .models import FeesHistory
-from .serializers import FeeHistorySerializers
-from usersapp.permissions import IsAdmin, IsOfficeStaff
+from coreapp.concurrency import ConditionalUpdateMixin
+from coreapp.fastpath import FastListMixin
+from coreapp.idempotency import IdempotentCreateMixin
+from coreapp.sparse import SparseFieldsViewMixin
+from jobsapp.registry import submit_job
+from jobsapp.serializers import ExportRequestSerializer
+from jobsapp.views import job_queued_response
+from students.models import normalize_grade_key
+from .models import DuesSnapshot, FeeSchedule, FeesHistory, FeesHistoryArchive
+from .receipts import (
+    CONTENT_TYPES,
+    ReceiptFormatUnavailable,
+    get_receipt,
+    pdf_available,
+    receipt_rows,
+    stream_receipts_zip,
+    term_receipts,
+)
+from .serializers import (
+    ArrearsQuerySerializer,
+    ArrearsSerializer,
+    DuesRequestSerializer,
+    FeeHistoryArchiveSerializers,
+    FeeScheduleSerializer,
+    FeeHistorySerializers,
+    ReceiptBatchQuerySerializer,
+    ReceiptQuerySerializer,
+)
+from usersapp.permissions import ADMIN_OR_STAFF_ROLES, role_permission
 
 
-class FeeHistoryView(generics.ListCreateAPIView):
+class FeeHistoryView(
+    IdempotentCreateMixin,
+    SparseFieldsViewMixin,
+    FastListMixin,
+    generics.ListCreateAPIView,
+):
     """
     View to list and create fee history records.
     Accessible only to Admin and Office Staff.
@@ -15,17 +47,22 @@ class FeeHistoryView(generics.ListCreateAPIView):
 
     queryset = FeesHistory.objects.all()
     serializer_class = FeeHistorySerializers
-    permission_classes = [IsAuthenticated, IsAdmin | IsOfficeStaff]
+    fast_list = True
+    permission_classes = [role_permission(ADMIN_OR_STAFF_ROLES)]
 
 
-class FeesHistorydetailView(generics.RetrieveUpdateDestroyAPIView):
+class FeesHistorydetailView(
+    ConditionalUpdateMixin,
+    SparseFieldsViewMixin,
+    generics.RetrieveUpdateDestroyAPIView,
+):
     """
     View to retrieve, update, or delete a fee history record.
     """
 
     queryset = FeesHistory.objects.all()
     serializer_class = FeeHistorySerializers
-    permission_classes = [IsAuthenticated, IsAdmin | IsOfficeStaff]
+    permission_classes = [role_permission(ADMIN_OR_STAFF_ROLES)]
 
     def destroy(self, request, *args, **kwargs):
         # Retrieve the fee record instance
@@ -45,3 +82,165 @@ class FeesHistorydetailView(generics.RetrieveUpdateDestroyAPIView):
             },
             status=status.HTTP_200_OK,
         )
+
+
+class ArchivedFeeHistoryView(
+    SparseFieldsViewMixin, FastListMixin, generics.ListAPIView
+):
+    """
+    View to list archived fee records, optionally for one student (?student=<id>).
+    Accessible only to Admin and Office Staff.
+    """
+
+    serializer_class = FeeHistoryArchiveSerializers
+    permission_classes = [role_permission(ADMIN_OR_STAFF_ROLES)]
+    fast_list = True
+
+    def get_queryset(self):
+        queryset = FeesHistoryArchive.objects.order_by("-payment_date", "-id")
+        student_id = self.request.query_params.get("student")
+        if student_id and student_id.isdigit():
+            queryset = queryset.filter(student_id=student_id)
+        return queryset
+
+
+class ExportFeesView(APIView):
+    """
+    View to queue a CSV export of fee history, optionally for one student.
+    Accessible only to Admin and Office Staff.
+    """
+
+    permission_classes = [role_permission(ADMIN_OR_STAFF_ROLES)]
+
+    def post(self, request):
+        serializer = ExportRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        job = submit_job(
+            "feeapp.export_fees", serializer.validated_data, user=request.user
+        )
+        return job_queued_response(job)
+
+
+class FeeReceiptView(APIView):
+    """
+    View to download the receipt of one fee payment as HTML or PDF (?type=pdf).
+    Accessible only to Admin and Office Staff.
+    """
+
+    permission_classes = [role_permission(ADMIN_OR_STAFF_ROLES)]
+
+    def get(self, request, pk):
+        query = ReceiptQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        fmt = query.validated_data["type"]
+
+        rows = receipt_rows(FeesHistory.objects.filter(pk=pk))
+        if not rows:
+            return Response(
+                {"details": "Fee record not found."}, status=status.HTTP_404_NOT_FOUND
+            )
+        try:
+            content = get_receipt(rows[0], fmt)
+        except ReceiptFormatUnavailable as exc:
+            return Response(
+                {"details": str(exc)}, status=status.HTTP_501_NOT_IMPLEMENTED
+            )
+        response = HttpResponse(content, content_type=CONTENT_TYPES[fmt])
+        response["Content-Disposition"] = f'inline; filename="receipt-{pk}.{fmt}"'
+        return response
+
+
+class FeeReceiptBatchView(APIView):
+    """
+    View to download every receipt of a grade within a term as a streamed zip.
+    Accessible only to Admin and Office Staff.
+    """
+
+    permission_classes = [role_permission(ADMIN_OR_STAFF_ROLES)]
+
+    def get(self, request):
+        query = ReceiptBatchQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        data = query.validated_data
+        if data["type"] == "pdf" and not pdf_available():
+            return Response(
+                {"details": "PDF receipts need the fpdf2 package."},
+                status=status.HTTP_501_NOT_IMPLEMENTED,
+            )
+
+        rows = term_receipts(data["grade"], data["date_from"], data["date_to"])
+        if not rows:
+            return Response(
+                {"details": "No fee records found for this grade and term."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        response = StreamingHttpResponse(
+            stream_receipts_zip(rows, data["type"]), content_type="application/zip"
+        )
+        filename = f"receipts-{data['grade']}-{data['date_from']}-{data['date_to']}.zip"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+
+class FeeScheduleView(generics.ListCreateAPIView):
+    """
+    View to list (optionally for one ?term=) and create fee schedule entries.
+    Accessible only to Admin and Office Staff.
+    """
+
+    serializer_class = FeeScheduleSerializer
+    permission_classes = [role_permission(ADMIN_OR_STAFF_ROLES)]
+
+    def get_queryset(self):
+        queryset = FeeSchedule.objects.select_related("grade").order_by(
+            "term", "grade__sort_key", "fee_type"
+        )
+        term = self.request.query_params.get("term")
+        if term:
+            queryset = queryset.filter(term=term)
+        return queryset
+
+
+class ComputeDuesView(APIView):
+    """
+    View to queue a recomputation of a term's dues snapshot.
+    Accessible only to Admin and Office Staff.
+    """
+
+    permission_classes = [role_permission(ADMIN_OR_STAFF_ROLES)]
+
+    def post(self, request):
+        serializer = DuesRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        term = serializer.validated_data["term"]
+        if not FeeSchedule.objects.filter(term=term).exists():
+            return Response(
+                {"details": f"No fee schedule found for term '{term}'."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        job = submit_job("feeapp.compute_dues", {"term": term}, user=request.user)
+        return job_queued_response(job)
+
+
+class ArrearsView(FastListMixin, generics.ListAPIView):
+    """
+    View to list the students of a term with an outstanding balance, largest
+    first, read from the last computed dues snapshot.
+    Accessible only to Admin and Office Staff.
+    """
+
+    serializer_class = ArrearsSerializer
+    permission_classes = [role_permission(ADMIN_OR_STAFF_ROLES)]
+    fast_list = True
+
+    def get_queryset(self):
+        query = ArrearsQuerySerializer(data=self.request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+
+        queryset = DuesSnapshot.objects.filter(
+            term=params["term"], outstanding__gt=0
+        ).order_by("-outstanding", "student_id")
+        if params.get("grade"):
+            queryset = queryset.filter(grade__key=normalize_grade_key(params["grade"]))
+        return queryset[: params["limit"]]
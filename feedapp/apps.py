@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class FeedappConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "feedapp"
+
+    def ready(self):
+        # Connect the change event publishers
+        from . import signals  # noqa: F401
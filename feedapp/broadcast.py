@@ -0,0 +1,111 @@
+import asyncio
+import itertools
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+
+# Distinguishes event ids of this process from those of an earlier one, so a
+# client reconnecting after a restart is told to reload instead of replaying
+EPOCH = format(int(time.time() * 1000), "x")
+
+# Put on a subscriber's queue when it fell too far behind; the stream then ends
+OVERFLOW = object()
+
+
+class Subscription:
+    """
+    One connected event stream: what it wants and the queue it reads from.
+    """
+
+    def __init__(self, loop, school_id, entities, student_id):
+        self.loop = loop
+        self.school_id = school_id
+        self.entities = entities
+        self.student_id = student_id
+        self.queue = asyncio.Queue(maxsize=settings.FEED_QUEUE_SIZE)
+        self.overflowed = False
+
+    def accepts(self, event):
+        return (
+            event["school"] == self.school_id
+            and event["entity"] in self.entities
+            and (
+                self.student_id is None
+                or event["student"] == self.student_id
+                # Bulk events name every affected student
+                or self.student_id in event.get("students", ())
+            )
+        )
+
+    def deliver(self, event):
+        # Runs on the subscriber's event loop
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            self.queue.get_nowait()
+            self.queue.put_nowait(OVERFLOW)
+
+
+class Broadcaster:
+    """
+    In-process fan-out of change events to connected streams, with a bounded
+    history for Last-Event-ID replay. publish() may be called from any thread;
+    each subscriber receives events on its own event loop.
+    """
+
+    def __init__(self, history_size):
+        self._lock = threading.Lock()
+        self._sequence = itertools.count(1)
+        self._history = deque(maxlen=history_size)
+        self._subscribers = set()
+
+    def publish(self, event):
+        with self._lock:
+            event["id"] = f"{EPOCH}-{next(self._sequence)}"
+            self._history.append(event)
+            subscribers = [sub for sub in self._subscribers if sub.accepts(event)]
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, event)
+            except RuntimeError:
+                # The subscriber's loop is closed; its stream is gone
+                self.unsubscribe(subscription)
+
+    def subscribe(self, subscription, last_event_id=None):
+        """
+        Register `subscription` and return (missed events, complete).
+        `complete` is False when events after last_event_id are no longer in
+        the history, in which case the client should reload its data.
+        """
+        with self._lock:
+            self._subscribers.add(subscription)
+            if not last_event_id:
+                return [], True
+            epoch, _sep, sequence = last_event_id.partition("-")
+            if epoch != EPOCH or not sequence.isdigit():
+                return [], False
+            last = int(sequence)
+            missed = [
+                event
+                for event in self._history
+                if int(event["id"].rsplit("-", 1)[1]) > last
+            ]
+            oldest = self._history[0]["id"] if self._history else None
+            complete = oldest is None or int(oldest.rsplit("-", 1)[1]) <= last + 1
+            return [event for event in missed if subscription.accepts(event)], complete
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    @property
+    def subscriber_count(self):
+        return len(self._subscribers)
+
+
+broadcaster = Broadcaster(settings.FEED_HISTORY_SIZE)
@@ -0,0 +1,79 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from feeapp.models import FeesHistory
+from libraryapp.models import LibraryHistory
+from schoolsapp.context import current_school_id
+from students.models import Student
+from .broadcast import broadcaster
+
+# Entity name used in events for each model that publishes changes
+ENTITIES = {FeesHistory: "fees", LibraryHistory: "library", Student: "student"}
+
+
+def change_event(instance, action):
+    """
+    Build the event for a saved or deleted instance. Events carry identifiers
+    only; clients fetch the record itself through the regular endpoints.
+    """
+    return {
+        "entity": ENTITIES[type(instance)],
+        "action": action,
+        "object_id": instance.pk,
+        "student": (
+            instance.pk if isinstance(instance, Student) else instance.student_id
+        ),
+        "school": instance.school_id,
+        "version": getattr(instance, "version", None),
+        "at": timezone.now().isoformat(),
+    }
+
+
+def publish_on_commit(instance, action):
+    # Only committed changes are announced; rolled back writes never reach clients
+    transaction.on_commit(
+        partial(broadcaster.publish, change_event(instance, action)),
+        using=instance._state.db,
+    )
+
+
+def publish_bulk_on_commit(model, action, count, student_ids=(), using=None):
+    """
+    Announce a set-based write (a queryset update or bulk_create) that
+    bypassed per-instance signals as one event. It carries the number of
+    records and the affected students instead of a record id, and clients
+    reload what they show for those students, or their lists when no
+    students are named.
+    """
+    event = {
+        "entity": ENTITIES[model],
+        "action": action,
+        "object_id": None,
+        "student": None,
+        "students": sorted(set(student_ids)),
+        "count": count,
+        "school": current_school_id(),
+        "version": None,
+        "at": timezone.now().isoformat(),
+    }
+    transaction.on_commit(partial(broadcaster.publish, event), using=using)
+
+
+@receiver(post_save, sender=FeesHistory)
+@receiver(post_save, sender=LibraryHistory)
+@receiver(post_save, sender=Student)
+def publish_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    publish_on_commit(instance, "created" if created else "updated")
+
+
+@receiver(post_delete, sender=FeesHistory)
+@receiver(post_delete, sender=LibraryHistory)
+@receiver(post_delete, sender=Student)
+def publish_delete(sender, instance, **kwargs):
+    publish_on_commit(instance, "deleted")
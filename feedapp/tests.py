@@ -0,0 +1,57 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.test import TestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from schoolsapp.models import School
+from schoolsapp.resolution import clear_school_cache
+from usersapp.models import User
+from .broadcast import broadcaster
+
+
+def change(school_id, object_id):
+    return {
+        "entity": "fees",
+        "action": "created",
+        "object_id": object_id,
+        "student": 1,
+        "school": school_id,
+        "version": 1,
+        "at": "2024-01-05T00:00:00+00:00",
+    }
+
+
+class ChangeFeedTenancyTests(TestCase):
+    def setUp(self):
+        self.school = School.objects.create(name="North", slug="north")
+        self.other = School.objects.create(name="South", slug="south")
+        self.user = User.objects.create_user(
+            "admin", "admin@example.com", "pw", role="admin", school=self.school
+        )
+        self.token = str(AccessToken.for_user(self.user))
+
+    async def test_stream_only_carries_its_school(self):
+        response = await self.async_client.get("/feed/changes/", {"token": self.token})
+        self.assertEqual(response.status_code, 200)
+        stream = aiter(response.streaming_content)
+        await anext(stream)  # retry interval
+
+        await sync_to_async(broadcaster.publish)(change(self.other.pk, 1))
+        await sync_to_async(broadcaster.publish)(change(self.school.pk, 2))
+        chunk = await asyncio.wait_for(anext(stream), 5)
+        await stream.aclose()
+
+        text = chunk if isinstance(chunk, str) else chunk.decode()
+        self.assertIn(f'"school": {self.school.pk}', text)
+        self.assertIn('"object_id": 2', text)
+
+    async def test_token_for_another_school_is_refused(self):
+        # Requests to the test host now belong to the other school
+        self.other.domain = "testserver"
+        await self.other.asave()
+        clear_school_cache()
+        self.addCleanup(clear_school_cache)
+        response = await self.async_client.get("/feed/changes/", {"token": self.token})
+        # Only users of the host's school can authenticate there
+        self.assertEqual(response.status_code, 401)
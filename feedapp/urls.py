@@ -0,0 +1,7 @@
+from django.urls import path
+
+from .views import change_feed
+
+urlpatterns = [
+    path("changes/", change_feed, name="change_feed"),
+]
@@ -0,0 +1,151 @@
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+from rest_framework.exceptions import AuthenticationFailed
+
+from schoolsapp.context import current_school_id
+from schoolsapp.resolution import get_school
+from usersapp.authentication import RevocationAwareJWTAuthentication
+from .broadcast import OVERFLOW, Subscription, broadcaster
+
+# Entities each role may follow, mirroring the permissions of their list views
+ROLE_ENTITIES = {
+    "admin": frozenset({"fees", "library", "student"}),
+    "staff": frozenset({"fees", "library", "student"}),
+    "librarian": frozenset({"library", "student"}),
+}
+
+
+def authenticate(request):
+    """
+    Return the user for the request's JWT, or None.
+    EventSource cannot send headers, so ?token= is accepted as well.
+    """
+    token = request.GET.get("token")
+    if token and "HTTP_AUTHORIZATION" not in request.META:
+        request.META["HTTP_AUTHORIZATION"] = f"Bearer {token}"
+    try:
+        result = RevocationAwareJWTAuthentication().authenticate(request)
+    except AuthenticationFailed:
+        return None
+    return result[0] if result else None
+
+
+def subscriber_school(user):
+    """
+    Return (school_id, error) for the stream of `user`.
+    TenantMiddleware runs before ?token= is read, so the school comes from the
+    authenticated user; a host that resolved to another school is refused.
+    """
+    if user.school_id is not None and get_school(user.school_id) is None:
+        return None, "This token is not valid for this school."
+    host_school_id = current_school_id()
+    if host_school_id is not None and user.school_id != host_school_id:
+        return None, "This token is not valid for this school."
+    return user.school_id, None
+
+
+def format_event(event):
+    payload = {key: value for key, value in event.items() if key != "id"}
+    return f"id: {event['id']}\nevent: change\ndata: {json.dumps(payload)}\n\n"
+
+
+async def event_stream(subscription, missed, complete):
+    """
+    Yield server-sent events for `subscription` until the client disconnects
+    or falls too far behind, sending a comment line when idle so proxies keep
+    the connection open.
+    """
+    try:
+        yield f"retry: {settings.FEED_RETRY_MS}\n\n"
+        if not complete:
+            # Changes were missed; the client should reload before following
+            yield "event: reset\ndata: {}\n\n"
+        for event in missed:
+            yield format_event(event)
+        while True:
+            try:
+                event = await asyncio.wait_for(
+                    subscription.queue.get(), settings.FEED_HEARTBEAT_SECONDS
+                )
+            except asyncio.TimeoutError:
+                yield ": heartbeat\n\n"
+                continue
+            if event is OVERFLOW:
+                yield "event: reset\ndata: {}\n\n"
+                return
+            yield format_event(event)
+    finally:
+        broadcaster.unsubscribe(subscription)
+
+
+@require_GET
+async def change_feed(request):
+    """
+    Stream create, update and delete events for fee records, library records
+    and students as text/event-stream. Bulk updates and imports arrive as one
+    "bulk_updated" or "bulk_created" event listing the affected students.
+    Filters: ?entities=fees,library,student (limited to what the user's role
+    may read) and ?student=<id>. Resumes from the Last-Event-ID header or
+    ?last_event_id= when the events are still buffered.
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse(
+            {"details": "The change feed is only served by the ASGI application."},
+            status=501,
+        )
+
+    user = await sync_to_async(authenticate)(request)
+    if user is None:
+        return JsonResponse(
+            {"details": "Authentication credentials were not provided or are invalid."},
+            status=401,
+        )
+    school_id, error = await sync_to_async(subscriber_school)(user)
+    if error:
+        return JsonResponse({"details": error}, status=403)
+    allowed = ROLE_ENTITIES.get(user.role, frozenset())
+    if not allowed:
+        return JsonResponse(
+            {"details": "You do not have permission to perform this action."},
+            status=403,
+        )
+
+    entities = allowed
+    if request.GET.get("entities"):
+        requested = set(request.GET["entities"].split(","))
+        if not requested <= allowed:
+            return JsonResponse(
+                {"details": f"entities must be a subset of {sorted(allowed)}."},
+                status=400,
+            )
+        entities = frozenset(requested)
+
+    student_id = request.GET.get("student")
+    if student_id is not None:
+        if not student_id.isdigit():
+            return JsonResponse({"details": "student must be an id."}, status=400)
+        student_id = int(student_id)
+
+    # The stream outlives the request's school scope, so filter on its id
+    subscription = Subscription(
+        asyncio.get_running_loop(), school_id, entities, student_id
+    )
+    last_event_id = request.headers.get("Last-Event-ID") or request.GET.get(
+        "last_event_id"
+    )
+    missed, complete = broadcaster.subscribe(subscription, last_event_id)
+
+    response = StreamingHttpResponse(
+        event_stream(subscription, missed, complete),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+    # Stop nginx from buffering the stream
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -0,0 +1,27 @@
+import csv
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+
+
+def export_csv(queryset, fields, name, progress, chunk_size=2000):
+    """
+    Stream `queryset` into a CSV file under JOB_RESULTS_DIR, reporting progress
+    once per chunk. Returns a job result with the file name and row count.
+    """
+    directory = Path(settings.JOB_RESULTS_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{name}-{uuid.uuid4().hex}.csv"
+
+    total = queryset.count()
+    rows = 0
+    with open(path, "w", newline="", encoding="utf-8") as output:
+        writer = csv.writer(output)
+        writer.writerow(fields)
+        for row in queryset.values_list(*fields).iterator(chunk_size=chunk_size):
+            writer.writerow(row)
+            rows += 1
+            if rows % chunk_size == 0 and total:
+                progress(rows * 100 // total)
+    return {"file": path.name, "rows": rows}
@@ -0,0 +1,62 @@
+import multiprocessing
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from jobsapp.runner import claim_jobs, requeue_stale_jobs, run_job, setup_worker
+
+
+class Command(BaseCommand):
+    help = "Run queued background jobs in a pool of worker processes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--processes", type=int, default=2)
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="Seconds to wait between polls when the queue is empty.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once the queue is empty instead of polling forever.",
+        )
+
+    def handle(self, *args, **options):
+        processes = options["processes"]
+        requeued = requeue_stale_jobs(settings.JOB_STALE_AFTER)
+        if requeued:
+            self.stdout.write(f"Requeued {requeued} stale jobs")
+
+        # Workers are spawned rather than forked so they never share the
+        # parent's database connections.
+        connections.close_all()
+        context = multiprocessing.get_context("spawn")
+        running = {}
+        with ProcessPoolExecutor(
+            max_workers=processes, mp_context=context, initializer=setup_worker
+        ) as pool:
+            while True:
+                free_slots = processes - len(running)
+                job_ids = claim_jobs(free_slots) if free_slots else []
+                for job_id in job_ids:
+                    self.stdout.write(f"Started job {job_id}")
+                    running[pool.submit(run_job, job_id)] = job_id
+
+                if running:
+                    done, _pending = wait(
+                        running,
+                        timeout=options["poll_interval"],
+                        return_when=FIRST_COMPLETED,
+                    )
+                    for future in done:
+                        job_id = running.pop(future)
+                        self.stdout.write(f"Job {job_id} {future.result()}")
+                elif options["once"]:
+                    break
+                else:
+                    time.sleep(options["poll_interval"])
@@ -0,0 +1,44 @@
+from django.conf import settings
+
+_handlers = {}
+
+
+def job_handler(kind):
+    """
+    Register the decorated function as the handler for jobs of `kind`.
+    Handlers are called as handler(payload, progress) where progress(percent)
+    records progress, and must return a JSON-serializable result.
+    """
+
+    def decorator(func):
+        if kind in _handlers:
+            raise ValueError(f"A handler for '{kind}' is already registered.")
+        _handlers[kind] = func
+        return func
+
+    return decorator
+
+
+def get_handler(kind):
+    """
+    Return the handler registered for `kind`, or raise KeyError.
+    """
+    return _handlers[kind]
+
+
+def submit_job(kind, payload=None, user=None, max_attempts=None):
+    """
+    Queue a job of a registered `kind` and return the Job instance.
+    """
+    from schoolsapp.context import current_school
+
+    from .models import Job
+
+    get_handler(kind)
+    return Job.objects.create(
+        kind=kind,
+        school=current_school.get(),
+        payload=payload or {},
+        created_by=user if user is not None and user.is_authenticated else None,
+        max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+    )
@@ -0,0 +1,120 @@
+import traceback
+from datetime import timedelta
+
+# Model imports are deferred so this module can be imported by freshly spawned
+# worker processes before django.setup() has run.
+
+
+def setup_worker():
+    """
+    Initialise Django in a spawned worker process.
+    """
+    import django
+
+    django.setup()
+
+
+def report_progress(job_id, percent):
+    """
+    Record a job's progress, clamped to 0-100.
+    """
+    from .models import Job
+
+    Job.objects.filter(pk=job_id).update(progress=max(0, min(100, int(percent))))
+
+
+def requeue_stale_jobs(stale_after):
+    """
+    Put back jobs left running by a worker that died, and return how many.
+    """
+    from django.utils import timezone
+
+    from .models import Job
+
+    return Job.objects.filter(
+        status=Job.RUNNING, started_at__lt=timezone.now() - timedelta(seconds=stale_after)
+    ).update(status=Job.PENDING)
+
+
+def claim_jobs(limit):
+    """
+    Atomically mark up to `limit` pending jobs as running and return their ids.
+    The conditional UPDATE makes claiming safe across several workers without
+    row locks, which SQLite does not support.
+    """
+    from django.db.models import F
+    from django.utils import timezone
+
+    from .models import Job
+
+    claimed = []
+    candidates = (
+        Job.objects.filter(status=Job.PENDING)
+        .order_by("created_at")
+        .values_list("pk", flat=True)[: limit * 2]
+    )
+    for job_id in candidates:
+        updated = Job.objects.filter(pk=job_id, status=Job.PENDING).update(
+            status=Job.RUNNING,
+            started_at=timezone.now(),
+            attempts=F("attempts") + 1,
+        )
+        if updated:
+            claimed.append(job_id)
+            if len(claimed) == limit:
+                break
+    return claimed
+
+
+def run_job(job_id):
+    """
+    Execute a claimed job and store its result or error.
+    Failed jobs go back to the queue until they run out of attempts.
+    """
+    from functools import partial
+
+    from django.db import close_old_connections
+    from django.utils import timezone
+
+    from auditapp.buffer import audit_buffer
+    from schoolsapp.context import use_school
+    from schoolsapp.resolution import get_school
+
+    from .models import Job
+    from .registry import get_handler
+
+    close_old_connections()
+    job = Job.objects.get(pk=job_id)
+    school = get_school(job.school_id) if job.school_id else None
+    if job.school_id and school is None:
+        # Running unscoped would touch every school's data
+        Job.objects.filter(pk=job_id).update(
+            status=Job.FAILED,
+            error=f"School {job.school_id} is missing or inactive.",
+            finished_at=timezone.now(),
+        )
+        return Job.FAILED
+    try:
+        handler = get_handler(job.kind)
+        with use_school(school):
+            result = handler(job.payload, partial(report_progress, job_id))
+    except Exception:
+        status = Job.FAILED if job.attempts >= job.max_attempts else Job.PENDING
+        Job.objects.filter(pk=job_id).update(
+            status=status,
+            error=traceback.format_exc(),
+            finished_at=timezone.now() if status == Job.FAILED else None,
+        )
+        return status
+    finally:
+        # Pool workers exit without running atexit hooks
+        audit_buffer.flush()
+
+    Job.objects.filter(pk=job_id).update(
+        status=Job.SUCCEEDED,
+        result=result,
+        error="",
+        progress=100,
+        finished_at=timezone.now(),
+    )
+    return Job.SUCCEEDED
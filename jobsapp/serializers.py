@@ -0,0 +1,34 @@
+from rest_framework import serializers
+
+from .models import Job
+
+
+class JobSerializer(serializers.ModelSerializer):
+    """
+    Read-only representation of a background job and its outcome.
+    """
+
+    class Meta:
+        model = Job
+        fields = [
+            "id",
+            "kind",
+            "status",
+            "progress",
+            "result",
+            "error",
+            "attempts",
+            "max_attempts",
+            "created_at",
+            "started_at",
+            "finished_at",
+        ]
+        read_only_fields = fields
+
+
+class ExportRequestSerializer(serializers.Serializer):
+    """
+    Validates the options of a queued history export.
+    """
+
+    student = serializers.IntegerField(required=False, min_value=1)
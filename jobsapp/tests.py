@@ -0,0 +1,47 @@
+from unittest import mock
+
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from schoolsapp.models import School
+from schoolsapp.resolution import clear_school_cache
+from usersapp.models import User
+from usersapp.serializers import AdminTokenObtainPairSerializers
+from .models import Job
+from .runner import run_job
+
+
+class JobTenancyTests(TestCase):
+    def setUp(self):
+        clear_school_cache()
+        self.addCleanup(clear_school_cache)
+        self.school = School.objects.create(name="North", slug="north")
+        self.other = School.objects.create(name="South", slug="south")
+        admin = User.objects.create_user(
+            "admin", "admin@example.com", "pw", role="admin", school=self.school
+        )
+        token = AdminTokenObtainPairSerializers.get_token(admin).access_token
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def test_admin_only_sees_jobs_of_their_school(self):
+        own = Job.objects.create(kind="students.import", school=self.school)
+        foreign = Job.objects.create(kind="students.import", school=self.other)
+
+        self.assertEqual(self.client.get(f"/jobs/{own.pk}/").status_code, 200)
+        self.assertEqual(self.client.get(f"/jobs/{foreign.pk}/").status_code, 404)
+
+    def test_job_of_inactive_school_fails_without_running(self):
+        self.other.is_active = False
+        self.other.save()
+        job = Job.objects.create(
+            kind="students.import", school=self.other, status=Job.RUNNING
+        )
+
+        with mock.patch("jobsapp.registry.get_handler") as get_handler:
+            self.assertEqual(run_job(job.pk), Job.FAILED)
+
+        get_handler.assert_not_called()
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertIn("inactive", job.error)
@@ -0,0 +1,8 @@
+from django.urls import path
+from .views import JobDetailView, JobDownloadView, JobRetryView
+
+urlpatterns = [
+    path("<int:pk>/", JobDetailView.as_view(), name="job-detail"),
+    path("<int:pk>/retry/", JobRetryView.as_view(), name="job-retry"),
+    path("<int:pk>/download/", JobDownloadView.as_view(), name="job-download"),
+]
@@ -0,0 +1,87 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.http import FileResponse, Http404
+from rest_framework import generics, status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from schoolsapp.context import current_school_id
+from .models import Job
+from .serializers import JobSerializer
+
+
+def job_queued_response(job):
+    """
+    Build the 202 response returned by endpoints that queue a job.
+    """
+    return Response(
+        {"message": "Job queued successfully.", "job": JobSerializer(job).data},
+        status=status.HTTP_202_ACCEPTED,
+    )
+
+
+class JobQuerysetMixin:
+    """
+    Limit jobs to the ones the user submitted; admins can see every job of
+    the current school.
+    """
+
+    def get_queryset(self):
+        user = self.request.user
+        if user.role == "admin":
+            return Job.objects.filter(school_id=current_school_id())
+        return Job.objects.filter(created_by=user)
+
+
+class JobDetailView(JobQuerysetMixin, generics.RetrieveAPIView):
+    """
+    View to check the status, progress and result of a job.
+    """
+
+    serializer_class = JobSerializer
+    permission_classes = [IsAuthenticated]
+
+
+class JobRetryView(JobQuerysetMixin, generics.GenericAPIView):
+    """
+    View to put a failed job back in the queue with a fresh set of attempts.
+    """
+
+    serializer_class = JobSerializer
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, pk):
+        job = self.get_object()
+        if job.status != Job.FAILED:
+            return Response(
+                {"details": "Only failed jobs can be retried."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        Job.objects.filter(pk=job.pk, status=Job.FAILED).update(
+            status=Job.PENDING, attempts=0, progress=0, error="", finished_at=None
+        )
+        job.refresh_from_db()
+        return Response(
+            {"message": "Job queued for retry.", "job": JobSerializer(job).data},
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+
+class JobDownloadView(JobQuerysetMixin, generics.GenericAPIView):
+    """
+    View to download the file produced by a finished export job.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        job = self.get_object()
+        file_name = (job.result or {}).get("file")
+        if job.status != Job.SUCCEEDED or not file_name:
+            raise Http404("This job has no file to download.")
+
+        path = Path(settings.JOB_RESULTS_DIR) / Path(file_name).name
+        if not path.is_file():
+            raise Http404("The job's file no longer exists.")
+        return FileResponse(open(path, "rb"), as_attachment=True, filename=path.name)
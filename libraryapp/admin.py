@@ -1,6 +1,64 @@
+from datetime import date
+
 from django.contrib import admin
-from .models import LibraryHistory
+from django.db import router
+from django.db.models import F, Value
+from django.db.models.functions import Coalesce
+
+from auditapp.recorder import record_bulk_action
+from coreapp.admin import LargeTableAdmin
+from feedapp.signals import publish_bulk_on_commit
+from students.admin import StudentRecordAdmin
+from .models import LibraryFine, LibraryHistory, StudentFineTotal
+
+
+@admin.register(LibraryHistory)
+class LibraryHistoryAdmin(StudentRecordAdmin):
+    list_display = (
+        "id",
+        "student",
+        "book_name",
+        "borrow_date",
+        "return_date",
+        "status",
+    )
+    list_filter = ("status", "borrow_date")
+    actions = StudentRecordAdmin.actions + ["mark_returned"]
+
+    @admin.action(permissions=["change"], description="Mark selected books returned")
+    def mark_returned(self, request, queryset):
+        borrowed = queryset.filter(status="borrowed")
+        rows = list(borrowed.values_list("pk", "student_id"))
+        if not rows:
+            self.message_user(request, "No borrowed books were selected.")
+            return
+        # Keep an existing return date, otherwise the book comes back today
+        updated = borrowed.order_by().update(
+            status="returned",
+            return_date=Coalesce(F("return_date"), Value(date.today())),
+            version=F("version") + 1,
+        )
+        record_bulk_action(LibraryHistory, "admin mark returned", updated)
+        publish_bulk_on_commit(
+            LibraryHistory,
+            "bulk_updated",
+            updated,
+            [student_id for _pk, student_id in rows],
+            using=router.db_for_write(LibraryHistory),
+        )
+        self.records_changed(rows)
+        self.message_user(request, f"Marked {updated} books as returned.")
+
+
+@admin.register(LibraryFine)
+class LibraryFineAdmin(LargeTableAdmin):
+    list_display = ("record", "student", "days_late", "amount", "computed_at")
+    list_select_related = ("record", "student")
+    raw_id_fields = ("record", "student")
 
-# Register your models here.
 
-admin.site.register(LibraryHistory)
+@admin.register(StudentFineTotal)
+class StudentFineTotalAdmin(LargeTableAdmin):
+    list_display = ("student", "total", "fines", "computed_at")
+    list_select_related = ("student",)
+    raw_id_fields = ("student",)
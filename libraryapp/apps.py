@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class LibraryappConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "libraryapp"
+
+    def ready(self):
+        # Connect the fine total handlers
+        from . import signals  # noqa: F401
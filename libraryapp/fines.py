@@ -0,0 +1,181 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import router, transaction
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+
+from .models import LibraryFine, LibraryHistory, StudentFineTotal
+
+CHUNK_SIZE = 5000
+
+
+def fine_policy():
+    """
+    Return (loan_days, grace_days, daily_rate, cap) from LIBRARY_FINE_POLICY.
+    """
+    policy = settings.LIBRARY_FINE_POLICY
+    return (
+        int(policy["LOAN_DAYS"]),
+        int(policy["GRACE_DAYS"]),
+        Decimal(policy["DAILY_RATE"]),
+        Decimal(policy["CAP"]),
+    )
+
+
+def compute_fine(borrow_date, return_date, as_of, policy):
+    """
+    Return (chargeable_days, amount) for one record. Books still out are
+    charged up to `as_of`.
+    """
+    loan_days, grace_days, daily_rate, cap = policy
+    end = return_date or as_of
+    days = (end - borrow_date).days - loan_days - grace_days
+    if days <= 0:
+        return 0, Decimal("0.00")
+    return days, min(daily_rate * days, cap)
+
+
+def late_records(as_of, policy):
+    """
+    Records that can carry a fine: still borrowed past the free period, or
+    returned after it. The date arithmetic runs in the database.
+    """
+    loan_days, grace_days, _rate, _cap = policy
+    free_days = timedelta(days=loan_days + grace_days)
+    return LibraryHistory.objects.filter(
+        Q(status="borrowed", borrow_date__lt=as_of - free_days)
+        | Q(status="returned", return_date__gt=F("borrow_date") + free_days)
+    )
+
+
+def compute_fines(as_of=None, chunk_size=CHUNK_SIZE, progress=None):
+    """
+    Recompute every library fine as of `as_of` (default today).
+    Late records are streamed in primary key order, fined in chunks and
+    upserted with one statement per chunk. Fines whose record is no longer late
+    are removed and the per-student totals are rebuilt.
+    Returns a JSON-serializable summary.
+    """
+    as_of = as_of or date.today()
+    policy = fine_policy()
+    started = timezone.now()
+    candidates = late_records(as_of, policy).order_by("pk")
+    total = candidates.count()
+    processed = fined = 0
+    last_pk = 0
+
+    while True:
+        chunk = list(
+            candidates.filter(pk__gt=last_pk).values_list(
+                "pk", "student_id", "borrow_date", "return_date"
+            )[:chunk_size]
+        )
+        if not chunk:
+            break
+        last_pk = chunk[-1][0]
+        processed += len(chunk)
+
+        fines = []
+        for pk, student_id, borrow_date, return_date in chunk:
+            days, amount = compute_fine(borrow_date, return_date, as_of, policy)
+            if days:
+                fines.append(
+                    LibraryFine(
+                        record_id=pk,
+                        student_id=student_id,
+                        days_late=days,
+                        amount=amount,
+                        computed_at=started,
+                    )
+                )
+        LibraryFine.objects.bulk_create(
+            fines,
+            update_conflicts=True,
+            unique_fields=["record"],
+            update_fields=["student", "days_late", "amount", "computed_at"],
+        )
+        fined += len(fines)
+        if progress is not None and total:
+            progress(min(99, processed * 100 // total))
+
+    with transaction.atomic(using=router.db_for_write(LibraryFine)):
+        # Anything not touched in this run belongs to a record that is no longer late
+        LibraryFine.objects.filter(computed_at__lt=started).delete()
+        totals = rebuild_fine_totals(started)
+
+    return {
+        "as_of": as_of.isoformat(),
+        "records_checked": processed,
+        "fines": fined,
+        "students": totals,
+    }
+
+
+def rebuild_fine_totals(computed_at):
+    """
+    Upsert one StudentFineTotal per student with fines, aggregated in the
+    database, and drop totals of students who no longer owe anything.
+    """
+    aggregates = (
+        LibraryFine.objects.values("student_id")
+        .annotate(total=Sum("amount"), fines=Count("id"))
+        .order_by("student_id")
+    )
+    batch = []
+    count = 0
+    for row in aggregates.iterator(chunk_size=CHUNK_SIZE):
+        batch.append(
+            StudentFineTotal(
+                student_id=row["student_id"],
+                total=row["total"],
+                fines=row["fines"],
+                computed_at=computed_at,
+            )
+        )
+        if len(batch) >= CHUNK_SIZE:
+            count += _upsert_totals(batch)
+            batch = []
+    count += _upsert_totals(batch)
+    StudentFineTotal.objects.filter(computed_at__lt=computed_at).delete()
+    return count
+
+
+def _upsert_totals(batch):
+    StudentFineTotal.objects.bulk_create(
+        batch,
+        update_conflicts=True,
+        unique_fields=["student"],
+        update_fields=["total", "fines", "computed_at"],
+    )
+    return len(batch)
+
+
+def refresh_student_fine_total(student_id):
+    """
+    Recompute one student's StudentFineTotal from the fines that remain, e.g.
+    after library records were deleted together with their fines.
+    """
+    totals = LibraryFine.objects.filter(student_id=student_id).aggregate(
+        total=Sum("amount"), fines=Count("id")
+    )
+    if not totals["fines"]:
+        StudentFineTotal.objects.filter(student_id=student_id).delete()
+        return
+    StudentFineTotal.objects.update_or_create(
+        student_id=student_id,
+        defaults={
+            "total": totals["total"],
+            "fines": totals["fines"],
+            "computed_at": timezone.now(),
+        },
+    )
+
+
+def refresh_fine_totals(student_ids):
+    """
+    Refresh the StudentFineTotal of each of `student_ids` once.
+    """
+    for student_id in student_ids:
+        refresh_student_fine_total(student_id)
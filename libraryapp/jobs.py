@@ -0,0 +1,31 @@
+from datetime import date
+
+from jobsapp.exports import export_csv
+from jobsapp.registry import job_handler
+
+from .fines import compute_fines
+from .models import LibraryHistory
+
+EXPORT_FIELDS = ["id", "student_id", "book_name", "borrow_date", "return_date", "status"]
+
+
+@job_handler("libraryapp.export_library_history")
+def export_library_history_job(payload, progress):
+    """
+    Export library history to CSV, optionally for a single student.
+    """
+    queryset = LibraryHistory.objects.order_by("pk")
+    if payload.get("student"):
+        queryset = queryset.filter(student_id=payload["student"])
+    return export_csv(queryset, EXPORT_FIELDS, "library-history", progress)
+
+
+@job_handler("libraryapp.compute_fines")
+def compute_fines_job(payload, progress):
+    """
+    Recompute every library fine, as of payload["as_of"] when given.
+    """
+    as_of = payload.get("as_of")
+    return compute_fines(
+        as_of=date.fromisoformat(as_of) if as_of else None, progress=progress
+    )
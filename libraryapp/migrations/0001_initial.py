@@ -0,0 +1,311 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("schoolsapp", "0001_initial"),
+        ("students", "0002_grade_reference"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LibraryHistory",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("book_name", models.CharField(max_length=255)),
+                ("borrow_date", models.DateField()),
+                ("return_date", models.DateField(blank=True, null=True)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("borrowed", "Borrowed"), ("returned", "Returned")],
+                        default="borrowed",
+                        max_length=50,
+                    ),
+                ),
+                ("version", models.PositiveIntegerField(default=1)),
+                (
+                    "school",
+                    models.ForeignKey(
+                        blank=True,
+                        db_constraint=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="+",
+                        to="schoolsapp.school",
+                    ),
+                ),
+                (
+                    "student",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="library_history",
+                        to="students.student",
+                    ),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="LibraryFine",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("days_late", models.PositiveIntegerField()),
+                ("amount", models.DecimalField(decimal_places=2, max_digits=8)),
+                ("computed_at", models.DateTimeField(db_index=True)),
+                (
+                    "school",
+                    models.ForeignKey(
+                        blank=True,
+                        db_constraint=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="+",
+                        to="schoolsapp.school",
+                    ),
+                ),
+                (
+                    "student",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="library_fines",
+                        to="students.student",
+                    ),
+                ),
+                (
+                    "record",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="fine",
+                        to="libraryapp.libraryhistory",
+                    ),
+                ),
+            ],
+            options={
+                "abstract": False,
+            },
+        ),
+        migrations.CreateModel(
+            name="LibraryHistoryArchive",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("book_name", models.CharField(max_length=255)),
+                ("borrow_date", models.DateField(db_index=True)),
+                ("return_date", models.DateField(blank=True, null=True)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("borrowed", "Borrowed"), ("returned", "Returned")],
+                        max_length=50,
+                    ),
+                ),
+                ("archived_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "school",
+                    models.ForeignKey(
+                        blank=True,
+                        db_constraint=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="+",
+                        to="schoolsapp.school",
+                    ),
+                ),
+                (
+                    "student",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_library_history",
+                        to="students.student",
+                    ),
+                ),
+            ],
+            options={
+                "abstract": False,
+            },
+        ),
+        migrations.CreateModel(
+            name="StudentFineTotal",
+            fields=[
+                (
+                    "student",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="library_fine_total",
+                        serialize=False,
+                        to="students.student",
+                    ),
+                ),
+                ("total", models.DecimalField(decimal_places=2, max_digits=10)),
+                ("fines", models.PositiveIntegerField()),
+                ("computed_at", models.DateTimeField(db_index=True)),
+                (
+                    "school",
+                    models.ForeignKey(
+                        blank=True,
+                        db_constraint=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="+",
+                        to="schoolsapp.school",
+                    ),
+                ),
+            ],
+            options={
+                "abstract": False,
+            },
+        ),
+        migrations.CreateModel(
+            name="StudentMonthlyCount",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("month", models.DateField()),
+                ("borrows", models.PositiveIntegerField(default=0)),
+                (
+                    "grade",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="students.grade",
+                    ),
+                ),
+                (
+                    "school",
+                    models.ForeignKey(
+                        blank=True,
+                        db_constraint=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="+",
+                        to="schoolsapp.school",
+                    ),
+                ),
+                (
+                    "student",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="monthly_reading",
+                        to="students.student",
+                    ),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="BookMonthlyCount",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("month", models.DateField()),
+                ("book_name", models.CharField(max_length=255)),
+                ("borrows", models.PositiveIntegerField(default=0)),
+                (
+                    "grade",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="students.grade",
+                    ),
+                ),
+                (
+                    "school",
+                    models.ForeignKey(
+                        blank=True,
+                        db_constraint=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="+",
+                        to="schoolsapp.school",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["month", "grade", "-borrows"],
+                        name="libraryapp__month_407ee8_idx",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("school", "month", "grade", "book_name"),
+                        name="unique_book_monthly_count",
+                    )
+                ],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="libraryhistory",
+            index=models.Index(fields=["status"], name="libraryapp__status_202472_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="libraryhistory",
+            index=models.Index(
+                fields=["borrow_date"], name="libraryapp__borrow__01db7d_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="libraryhistory",
+            constraint=models.CheckConstraint(
+                condition=models.Q(
+                    ("status", "borrowed"),
+                    ("return_date__isnull", False),
+                    _connector="OR",
+                ),
+                name="return_date_required_for_returned_status",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="studentmonthlycount",
+            index=models.Index(
+                fields=["month", "-borrows"], name="libraryapp__month_bf6885_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="studentmonthlycount",
+            index=models.Index(
+                fields=["month", "grade", "-borrows"],
+                name="libraryapp__month_803a39_idx",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="studentmonthlycount",
+            constraint=models.UniqueConstraint(
+                fields=("month", "student"), name="unique_student_monthly_count"
+            ),
+        ),
+    ]
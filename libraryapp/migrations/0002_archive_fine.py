@@ -0,0 +1,23 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("libraryapp", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="libraryhistoryarchive",
+            name="fine_amount",
+            field=models.DecimalField(
+                blank=True, decimal_places=2, max_digits=8, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="libraryhistoryarchive",
+            name="fine_days_late",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
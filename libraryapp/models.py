@@ -1,10 +1,13 @@
 from datetime import date
 from django.db import models
 from django.core.exceptions import ValidationError
-from students.models import Student
+from schoolsapp.models import SchoolScopedModel
+from students.models import Grade, Student
 
+STATUS_CHOICES = [("borrowed", "Borrowed"), ("returned", "Returned")]
 
-class LibraryHistory(models.Model):
+
+class LibraryHistory(SchoolScopedModel):
     student = models.ForeignKey(
         Student, on_delete=models.CASCADE, related_name="library_history"
     )
@@ -13,9 +16,11 @@ class LibraryHistory(models.Model):
     return_date = models.DateField(null=True, blank=True)
     status = models.CharField(
         max_length=50,
-        choices=[("borrowed", "Borrowed"), ("returned", "Returned")],
+        choices=STATUS_CHOICES,
         default="borrowed",
     )
+    # Bumped on every update; backs ETag / If-Match optimistic concurrency
+    version = models.PositiveIntegerField(default=1)
 
     def __str__(self):
         return f"{self.book_name} - {self.student.name}"
@@ -45,3 +50,127 @@ class LibraryHistory(models.Model):
                 name="return_date_required_for_returned_status",
             )
         ]
+        # Back the admin changelist filters
+        indexes = [
+            models.Index(fields=["status"]),
+            models.Index(fields=["borrow_date"]),
+        ]
+
+
+class LibraryHistoryArchive(SchoolScopedModel):
+    """
+    Library records from closed academic years, moved out of LibraryHistory by
+    the archive_history command. Rows keep their original id, and the fine of
+    a late record moves along with it.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    student = models.ForeignKey(
+        Student, on_delete=models.CASCADE, related_name="archived_library_history"
+    )
+    book_name = models.CharField(max_length=255)
+    borrow_date = models.DateField(db_index=True)
+    return_date = models.DateField(null=True, blank=True)
+    status = models.CharField(max_length=50, choices=STATUS_CHOICES)
+    fine_days_late = models.PositiveIntegerField(null=True, blank=True)
+    fine_amount = models.DecimalField(
+        max_digits=8, decimal_places=2, null=True, blank=True
+    )
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.book_name} - {self.student_id} (archived)"
+
+
+class LibraryFine(SchoolScopedModel):
+    """
+    Overdue fine of one library record, upserted by the nightly fine job.
+    Records that are not late have no row.
+    """
+
+    record = models.OneToOneField(
+        LibraryHistory, on_delete=models.CASCADE, related_name="fine"
+    )
+    student = models.ForeignKey(
+        Student, on_delete=models.CASCADE, related_name="library_fines"
+    )
+    days_late = models.PositiveIntegerField()
+    amount = models.DecimalField(max_digits=8, decimal_places=2)
+    computed_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"{self.record_id} - {self.student_id}: {self.amount}"
+
+
+class StudentFineTotal(SchoolScopedModel):
+    """
+    Sum of a student's library fines, rebuilt by the nightly fine job so the
+    total is a single primary key lookup.
+    """
+
+    student = models.OneToOneField(
+        Student,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="library_fine_total",
+    )
+    total = models.DecimalField(max_digits=10, decimal_places=2)
+    fines = models.PositiveIntegerField()
+    computed_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"{self.student_id}: {self.total}"
+
+
+class BookMonthlyCount(SchoolScopedModel):
+    """
+    Number of times a book was borrowed by students of a grade in a month.
+    Kept in step as borrows are created, edited and deleted; rebuilt by
+    rebuild_reading_stats.
+    """
+
+    month = models.DateField()
+    grade = models.ForeignKey(Grade, on_delete=models.CASCADE, related_name="+")
+    book_name = models.CharField(max_length=255)
+    borrows = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.month:%Y-%m} {self.book_name}: {self.borrows}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["school", "month", "grade", "book_name"],
+                name="unique_book_monthly_count",
+            )
+        ]
+        indexes = [models.Index(fields=["month", "grade", "-borrows"])]
+
+
+class StudentMonthlyCount(SchoolScopedModel):
+    """
+    Number of books a student borrowed in a month, with the student's grade at
+    the time. Kept in step as borrows are created, edited and deleted; rebuilt
+    by rebuild_reading_stats.
+    """
+
+    month = models.DateField()
+    student = models.ForeignKey(
+        Student, on_delete=models.CASCADE, related_name="monthly_reading"
+    )
+    grade = models.ForeignKey(Grade, on_delete=models.CASCADE, related_name="+")
+    borrows = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.month:%Y-%m} {self.student_id}: {self.borrows}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["month", "student"], name="unique_student_monthly_count"
+            )
+        ]
+        indexes = [
+            models.Index(fields=["month", "-borrows"]),
+            models.Index(fields=["month", "grade", "-borrows"]),
+        ]
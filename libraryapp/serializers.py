@@ -1,9 +1,23 @@
 from rest_framework import serializers
-from datetime import date
-from .models import LibraryHistory
+from datetime import date, datetime
+from django.db import router, transaction
+from coreapp.concurrency import VersionedUpdateSerializerMixin
+from coreapp.sparse import SparseFieldsSerializerMixin
+from .stats import counted_key, move_borrow, record_borrow
+from .models import (
+    LibraryFine,
+    StudentMonthlyCount,
+    LibraryHistory,
+    LibraryHistoryArchive,
+    StudentFineTotal,
+)
 
 
-class LibraryHistorySerializer(serializers.ModelSerializer):
+class LibraryHistorySerializer(
+    SparseFieldsSerializerMixin,
+    VersionedUpdateSerializerMixin,
+    serializers.ModelSerializer,
+):
     class Meta:
         model = LibraryHistory
         fields = ["id", "student", "book_name", "borrow_date", "return_date", "status"]
@@ -51,11 +65,112 @@ class LibraryHistorySerializer(serializers.ModelSerializer):
         Automatically set the status to 'returned' if return_date is provided during creation.
         """
         validated_data = self._update_status(validated_data)
-        return super().create(validated_data)
+        # The reading counters move together with the new record
+        with transaction.atomic(using=router.db_for_write(LibraryHistory)):
+            instance = super().create(validated_data)
+            record_borrow(instance)
+        return instance
 
     def update(self, instance, validated_data):
         """
         Automatically update the status to 'returned' if return_date is provided during update.
         """
         validated_data = self._update_status(validated_data)
-        return super().update(instance, validated_data)
+        old_key = counted_key(instance)
+        with transaction.atomic(using=router.db_for_write(LibraryHistory)):
+            instance = super().update(instance, validated_data)
+            move_borrow(old_key, instance)
+        return instance
+
+
+class LibraryHistoryArchiveSerializer(
+    SparseFieldsSerializerMixin, serializers.ModelSerializer
+):
+    """
+    Read-only representation of an archived library record.
+    """
+
+    class Meta:
+        model = LibraryHistoryArchive
+        fields = [
+            "id",
+            "student",
+            "book_name",
+            "borrow_date",
+            "return_date",
+            "status",
+            "fine_days_late",
+            "fine_amount",
+            "archived_at",
+        ]
+        read_only_fields = fields
+
+
+class LibraryFineSerializer(serializers.ModelSerializer):
+    """
+    Read-only representation of one overdue fine.
+    """
+
+    book_name = serializers.SlugRelatedField(
+        source="record", slug_field="book_name", read_only=True
+    )
+
+    class Meta:
+        model = LibraryFine
+        fields = ["record", "book_name", "days_late", "amount", "computed_at"]
+        read_only_fields = fields
+
+
+class StudentFineTotalSerializer(serializers.ModelSerializer):
+    """
+    Read-only representation of a student's fine total.
+    """
+
+    class Meta:
+        model = StudentFineTotal
+        fields = ["student", "total", "fines", "computed_at"]
+        read_only_fields = fields
+
+
+class ComputeFinesSerializer(serializers.Serializer):
+    """
+    Validates a request to recompute library fines.
+    """
+
+    as_of = serializers.DateField(required=False)
+
+
+class ActiveReaderSerializer(serializers.ModelSerializer):
+    """
+    Read-only row of the most active readers of a month.
+    """
+
+    student_name = serializers.SlugRelatedField(
+        source="student", slug_field="name", read_only=True
+    )
+    grade = serializers.SlugRelatedField(slug_field="name", read_only=True)
+
+    class Meta:
+        model = StudentMonthlyCount
+        fields = ["student", "student_name", "grade", "borrows"]
+        read_only_fields = fields
+
+
+class ReadingStatsQuerySerializer(serializers.Serializer):
+    """
+    Validates ?month=YYYY-MM (default: current month), ?grade= and ?limit=.
+    """
+
+    month = serializers.CharField(required=False)
+    grade = serializers.CharField(max_length=20, required=False)
+    limit = serializers.IntegerField(default=10, min_value=1, max_value=100)
+
+    def validate_month(self, value):
+        try:
+            return datetime.strptime(value, "%Y-%m").date()
+        except ValueError:
+            raise serializers.ValidationError("Month must be in YYYY-MM format.")
+
+    def validate(self, data):
+        data.setdefault("month", date.today().replace(day=1))
+        return data
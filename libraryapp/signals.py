@@ -0,0 +1,44 @@
+import threading
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .fines import refresh_fine_totals
+from .models import LibraryHistory
+from .stats import forget_borrow
+
+# Database alias -> ids of students whose fine total is refreshed when the
+# current transaction on that alias commits
+_pending = threading.local()
+
+
+@receiver(post_delete, sender=LibraryHistory)
+def refresh_fine_total_for_record(sender, instance, **kwargs):
+    """
+    A deleted record takes its fine with it; keep the student's total in step
+    instead of waiting for the next fine run. Deleting many records of a
+    student in one transaction refreshes their total once.
+    """
+    using = instance._state.db
+    students = _pending.__dict__.setdefault(using, set())
+    students.add(instance.student_id)
+    # Every delete registers the flush, so dropping the callbacks of a rolled
+    # back savepoint cannot lose the others; only the first one finds work
+    transaction.on_commit(partial(_flush_pending, using), using=using)
+
+
+@receiver(post_delete, sender=LibraryHistory)
+def uncount_deleted_borrow(sender, instance, **kwargs):
+    """
+    Take a deleted record out of the monthly reading counters. Archiving does
+    not go through here: archived records stay counted.
+    """
+    forget_borrow(instance.student_id, instance.book_name, instance.borrow_date)
+
+
+def _flush_pending(using):
+    students = _pending.__dict__.pop(using, None)
+    if students:
+        refresh_fine_totals(sorted(students))
@@ -0,0 +1,194 @@
+from collections import Counter
+from itertools import islice
+
+from django.db import IntegrityError, router, transaction
+from django.db.models import F, Sum
+
+from .models import (
+    BookMonthlyCount,
+    LibraryHistory,
+    LibraryHistoryArchive,
+    StudentMonthlyCount,
+)
+
+CHUNK_SIZE = 5000
+
+
+def month_of(day):
+    return day.replace(day=1)
+
+
+def _increment(model, keys, **defaults):
+    """
+    Add one to the counter row identified by `keys`, creating it if needed.
+    The UPDATE covers the common case; a concurrent first insert is caught by
+    the unique constraint and retried as an UPDATE.
+    """
+    counter = model.objects.filter(**keys)
+    if counter.update(borrows=F("borrows") + 1):
+        return
+    try:
+        with transaction.atomic(using=router.db_for_write(model)):
+            model.objects.create(borrows=1, **keys, **defaults)
+    except IntegrityError:
+        counter.update(borrows=F("borrows") + 1)
+
+
+def _decrement(model, keys):
+    """
+    Take one off the counter row identified by `keys`, dropping it at zero.
+    """
+    counter = model.objects.filter(**keys)
+    counter.filter(borrows__gt=0).update(borrows=F("borrows") - 1)
+    counter.filter(borrows=0).delete()
+
+
+def record_borrow(record):
+    """
+    Count a newly created borrow in the monthly book and student counters.
+    """
+    grade_id = record.student.grade_id
+    if grade_id is None:
+        # Only possible for students not yet backfilled by normalize_grades
+        return
+    month = month_of(record.borrow_date)
+    _increment(
+        BookMonthlyCount,
+        {"month": month, "grade_id": grade_id, "book_name": record.book_name},
+    )
+    _increment(
+        StudentMonthlyCount,
+        {"month": month, "student_id": record.student_id},
+        grade_id=grade_id,
+    )
+
+
+def forget_borrow(student_id, book_name, borrow_date):
+    """
+    Take a deleted borrow, or the old values of an edited one, out of the
+    monthly counters. The book counter is found through the grade the
+    student's counter recorded for that month, since the student may have
+    changed grade since.
+    """
+    month = month_of(borrow_date)
+    reader = StudentMonthlyCount.objects.filter(
+        month=month, student_id=student_id
+    ).first()
+    if reader is None:
+        # Never counted, or the counters were rebuilt without this record
+        return
+    _decrement(
+        BookMonthlyCount,
+        {"month": month, "grade_id": reader.grade_id, "book_name": book_name},
+    )
+    _decrement(StudentMonthlyCount, {"month": month, "student_id": student_id})
+
+
+def counted_key(record):
+    """
+    Return the values of a record that decide which counters it is part of.
+    """
+    return record.student_id, record.book_name, month_of(record.borrow_date)
+
+
+def move_borrow(old_key, record):
+    """
+    Recount an edited record whose student, book or borrow month changed.
+    """
+    if old_key == counted_key(record):
+        return
+    forget_borrow(*old_key)
+    record_borrow(record)
+
+
+def popular_books(month, grade_id=None, limit=10):
+    """
+    Return the most borrowed books of a month, optionally for one grade.
+    """
+    counters = BookMonthlyCount.objects.filter(month=month)
+    if grade_id is not None:
+        counters = counters.filter(grade_id=grade_id)
+    return list(
+        counters.values("book_name")
+        .annotate(borrows=Sum("borrows"))
+        .order_by("-borrows", "book_name")[:limit]
+    )
+
+
+def active_readers(month, grade_id=None, limit=10):
+    """
+    Return the counters of the students who borrowed most in a month.
+    """
+    counters = StudentMonthlyCount.objects.filter(month=month)
+    if grade_id is not None:
+        counters = counters.filter(grade_id=grade_id)
+    return counters.order_by("-borrows", "student_id")[:limit]
+
+
+def _stream(model, chunk_size):
+    """
+    Yield (student_id, grade_id, book_name, borrow_date) for every record of
+    `model`, reading one primary key range at a time.
+    """
+    last_pk = 0
+    queryset = model.objects.order_by("pk").values_list(
+        "pk", "student_id", "student__grade_id", "book_name", "borrow_date"
+    )
+    while True:
+        chunk = list(queryset.filter(pk__gt=last_pk)[:chunk_size])
+        if not chunk:
+            return
+        last_pk = chunk[-1][0]
+        for _pk, student_id, grade_id, book_name, borrow_date in chunk:
+            yield student_id, grade_id, book_name, borrow_date
+
+
+def _chunked(objects, size):
+    iterator = iter(objects)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def rebuild_reading_stats(chunk_size=CHUNK_SIZE):
+    """
+    Recompute both counter tables from live and archived library history.
+    Records are streamed in chunks and counted in memory; the tables are then
+    replaced in one transaction. Returns (records, book rows, student rows).
+    """
+    books = Counter()
+    readers = Counter()
+    reader_grades = {}
+    records = 0
+    for model in (LibraryHistory, LibraryHistoryArchive):
+        for student_id, grade_id, book_name, borrow_date in _stream(model, chunk_size):
+            records += 1
+            if grade_id is None:
+                continue
+            month = month_of(borrow_date)
+            books[month, grade_id, book_name] += 1
+            readers[month, student_id] += 1
+            # History does not keep the grade at borrow time, so rebuilt
+            # counters use the student's current grade
+            reader_grades[month, student_id] = grade_id
+
+    with transaction.atomic(using=router.db_for_write(BookMonthlyCount)):
+        BookMonthlyCount.objects.all().delete()
+        StudentMonthlyCount.objects.all().delete()
+        for batch in _chunked(books.items(), chunk_size):
+            BookMonthlyCount.objects.bulk_create(
+                BookMonthlyCount(
+                    month=month, grade_id=grade_id, book_name=book_name, borrows=count
+                )
+                for (month, grade_id, book_name), count in batch
+            )
+        for batch in _chunked(readers.items(), chunk_size):
+            StudentMonthlyCount.objects.bulk_create(
+                StudentMonthlyCount(
+                    month=month,
+                    student_id=student_id,
+                    grade_id=reader_grades[month, student_id],
+                    borrows=count,
+                )
+                for (month, student_id), count in batch
+            )
+    return records, len(books), len(readers)
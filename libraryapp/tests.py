@@ -1,3 +1,384 @@
-from django.test import TestCase
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib import admin
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.management import call_command
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from students.models import Grade, Student
+from usersapp.models import User
+from auditapp.models import AuditLog
+from auditapp.buffer import audit_buffer
+from .admin import LibraryHistoryAdmin
+from .fines import compute_fines
+from .models import (
+    BookMonthlyCount,
+    LibraryFine,
+    LibraryHistory,
+    LibraryHistoryArchive,
+    StudentFineTotal,
+    StudentMonthlyCount,
+)
+from .serializers import LibraryHistorySerializer
+from .stats import rebuild_reading_stats
+
+
+class SparseFieldsTests(TestCase):
+    """
+    ?fields= on the model serializer list path of LibraryHistoryView.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            User.objects.create_user("admin", "admin@example.com", "pw", role="admin")
+        )
+        student = Student.objects.create(
+            name="Asha Rao", age=10, grade=Grade.objects.resolve("5-A")
+        )
+        self.record = LibraryHistory.objects.create(
+            student=student, book_name="Malgudi Days", borrow_date=date(2024, 1, 5)
+        )
+
+    def test_list_returns_only_requested_fields(self):
+        response = self.client.get(
+            "/library/create_library_history/?fields=id,book_name,status"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            [{"id": self.record.pk, "book_name": "Malgudi Days", "status": "borrowed"}],
+        )
+
+    def test_fast_list_returns_only_requested_fields(self):
+        self.client.force_authenticate(
+            User.objects.create_user(
+                "librarian", "librarian@example.com", "pw", role="librarian"
+            )
+        )
+        response = self.client.get("/library/view_library_history/?fields=id,status")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(), [{"id": self.record.pk, "status": "borrowed"}]
+        )
+
+
+class ConditionalUpdateTests(TestCase):
+    """
+    PUT/PATCH on library records are checked against the version and the model.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            User.objects.create_user("admin", "admin@example.com", "pw", role="admin")
+        )
+        student = Student.objects.create(name="Asha Rao", age=10)
+        self.record = LibraryHistory.objects.create(
+            student=student, book_name="Malgudi Days", borrow_date=date(2024, 1, 5)
+        )
+        self.url = f"/library/library_details/{self.record.pk}/"
+
+    def test_stale_if_match_is_rejected(self):
+        response = self.client.patch(
+            self.url, {"book_name": "Swami"}, format="json", HTTP_IF_MATCH='"1"'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["ETag"], '"2"')
+
+        stale = self.client.patch(
+            self.url, {"book_name": "The Guide"}, format="json", HTTP_IF_MATCH='"1"'
+        )
+        self.assertEqual(stale.status_code, 412)
+        self.record.refresh_from_db()
+        self.assertEqual(self.record.book_name, "Swami")
+        self.assertEqual(self.record.version, 2)
+
+    def test_model_validation_runs_before_the_update(self):
+        with mock.patch.object(
+            LibraryHistory, "clean", side_effect=DjangoValidationError("Not allowed.")
+        ):
+            response = self.client.patch(
+                self.url, {"book_name": "Swami"}, format="json"
+            )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"non_field_errors": ["Not allowed."]})
+        self.record.refresh_from_db()
+        self.assertEqual(self.record.book_name, "Malgudi Days")
+        self.assertEqual(self.record.version, 1)
+
+
+class ComputeFinesTests(TestCase):
+    """
+    Fines follow LIBRARY_FINE_POLICY: 14 loan days, 2 grace days, 5.00 a day
+    up to 200.00 per record.
+    """
+
+    def setUp(self):
+        self.reader = Student.objects.create(name="Asha Rao", age=10)
+        self.late = Student.objects.create(name="Ravi Nair", age=11)
+
+    def borrow(self, student, borrowed, returned=None):
+        return LibraryHistory.objects.create(
+            student=student,
+            book_name="Gitanjali",
+            borrow_date=borrowed,
+            return_date=returned,
+            status="returned" if returned else "borrowed",
+        )
+
+    def test_fines_and_totals(self):
+        still_out = self.borrow(self.reader, date(2024, 2, 1))
+        returned_late = self.borrow(self.reader, date(2024, 1, 1), date(2024, 1, 20))
+        on_time = self.borrow(self.reader, date(2024, 1, 1), date(2024, 1, 10))
+        capped = self.borrow(self.late, date(2023, 1, 1))
+        # Left over from an earlier run, when the record was still out
+        LibraryFine.objects.create(
+            record=on_time,
+            student=self.reader,
+            days_late=1,
+            amount=Decimal("5.00"),
+            computed_at=timezone.now(),
+        )
+
+        summary = compute_fines(as_of=date(2024, 3, 1))
+
+        self.assertEqual(summary["fines"], 3)
+        self.assertEqual(summary["students"], 2)
+        fines = {
+            fine.record_id: (fine.days_late, fine.amount)
+            for fine in LibraryFine.objects.all()
+        }
+        self.assertEqual(
+            fines,
+            {
+                still_out.pk: (13, Decimal("65.00")),
+                returned_late.pk: (3, Decimal("15.00")),
+                capped.pk: (409, Decimal("200.00")),
+            },
+        )
+        totals = {
+            total.student_id: (total.total, total.fines)
+            for total in StudentFineTotal.objects.all()
+        }
+        self.assertEqual(
+            totals,
+            {
+                self.reader.pk: (Decimal("80.00"), 2),
+                self.late.pk: (Decimal("200.00"), 1),
+            },
+        )
+
+
+class DeleteSelectedRecordsTests(TestCase):
+    """
+    The admin bulk delete removes dependent fines and audits every record.
+    """
+
+    def test_fines_are_deleted_with_their_records(self):
+        student = Student.objects.create(name="Asha Rao", age=10)
+        record = LibraryHistory.objects.create(
+            student=student, book_name="Gitanjali", borrow_date=date(2024, 1, 5)
+        )
+        LibraryFine.objects.create(
+            record=record,
+            student=student,
+            days_late=3,
+            amount=Decimal("15.00"),
+            computed_at=timezone.now(),
+        )
+        StudentFineTotal.objects.create(
+            student=student, total=Decimal("15.00"), fines=1, computed_at=timezone.now()
+        )
+        model_admin = LibraryHistoryAdmin(LibraryHistory, admin.site)
+        request = RequestFactory().post("/admin/")
+        with mock.patch.object(
+            model_admin, "message_user"
+        ), self.captureOnCommitCallbacks(execute=True):
+            model_admin.delete_selected_records(
+                request, LibraryHistory.objects.filter(pk=record.pk)
+            )
+        audit_buffer.flush()
+
+        self.assertFalse(LibraryHistory.objects.exists())
+        self.assertFalse(LibraryFine.objects.exists())
+        self.assertFalse(StudentFineTotal.objects.exists())
+        self.assertTrue(
+            AuditLog.objects.filter(
+                entity_type="libraryapp.libraryhistory",
+                entity_id=record.pk,
+                action=AuditLog.DELETE,
+            ).exists()
+        )
+
+    def test_fine_total_is_refreshed_once_per_student(self):
+        student = Student.objects.create(name="Asha Rao", age=10)
+        records = LibraryHistory.objects.bulk_create(
+            LibraryHistory(
+                student=student, book_name=f"Book {n}", borrow_date=date(2024, 1, n)
+            )
+            for n in range(1, 4)
+        )
+        with mock.patch(
+            "libraryapp.signals.refresh_fine_totals"
+        ) as refresh, self.captureOnCommitCallbacks(execute=True):
+            LibraryHistory.objects.filter(
+                pk__in=[record.pk for record in records]
+            ).delete()
+        refresh.assert_called_once_with([student.pk])
+
+
+class ArchiveHistoryTests(TestCase):
+    """
+    archive_history moves only returned loans and never drops unarchived rows.
+    """
+
+    def setUp(self):
+        self.student = student = Student.objects.create(name="Asha Rao", age=10)
+        self.returned = LibraryHistory.objects.create(
+            student=student,
+            book_name="Gitanjali",
+            borrow_date=date(2020, 1, 5),
+            return_date=date(2020, 1, 20),
+            status="returned",
+        )
+        self.borrowed = LibraryHistory.objects.create(
+            student=student, book_name="The Guide", borrow_date=date(2020, 2, 5)
+        )
+
+    def archive(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command(
+                "archive_history",
+                "--before-year",
+                "2023",
+                "--target",
+                "library",
+                stdout=StringIO(),
+            )
+        audit_buffer.flush()
+
+    def test_books_still_out_stay_in_the_hot_table(self):
+        self.archive()
+        self.assertEqual(
+            list(LibraryHistory.objects.values_list("pk", flat=True)),
+            [self.borrowed.pk],
+        )
+        self.assertTrue(
+            LibraryHistoryArchive.objects.filter(pk=self.returned.pk).exists()
+        )
+
+    def test_row_with_conflicting_archive_copy_is_kept(self):
+        LibraryHistoryArchive.objects.create(
+            id=self.returned.pk,
+            student_id=self.returned.student_id,
+            book_name="Another book",
+            borrow_date=self.returned.borrow_date,
+            return_date=self.returned.return_date,
+            status="returned",
+        )
+        self.archive()
+        self.assertTrue(LibraryHistory.objects.filter(pk=self.returned.pk).exists())
+
+    def test_fine_moves_with_its_record(self):
+        LibraryFine.objects.create(
+            record=self.returned,
+            student=self.student,
+            days_late=3,
+            amount=Decimal("15.00"),
+            computed_at=timezone.now(),
+        )
+        StudentFineTotal.objects.create(
+            student=self.student,
+            total=Decimal("15.00"),
+            fines=1,
+            computed_at=timezone.now(),
+        )
+        self.archive()
+
+        archived = LibraryHistoryArchive.objects.get(pk=self.returned.pk)
+        self.assertEqual(
+            (archived.fine_days_late, archived.fine_amount), (3, Decimal("15.00"))
+        )
+        self.assertFalse(LibraryFine.objects.exists())
+        self.assertFalse(StudentFineTotal.objects.exists())
+
+    def test_batch_is_audited_once_without_delete_entries(self):
+        self.archive()
+        entries = AuditLog.objects.filter(entity_type="libraryapp.libraryhistory")
+        self.assertFalse(entries.filter(action=AuditLog.DELETE).exists())
+        bulk = entries.get(action=AuditLog.BULK)
+        self.assertEqual(bulk.changes["description"], "archive")
+        self.assertEqual(bulk.changes["count"], 1)
+
+
+class ReadingStatsTests(TestCase):
+    """
+    The monthly counters stay equal to a rebuild as borrows are created,
+    edited, deleted and archived.
+    """
+
+    def setUp(self):
+        self.student = Student.objects.create(
+            name="Asha Rao", age=10, grade=Grade.objects.resolve("5-A")
+        )
+        self.record = self.borrow("Gitanjali", date(2020, 1, 5))
+        self.borrow("The Guide", date(2020, 1, 9))
+
+    def borrow(self, book_name, borrow_date):
+        serializer = LibraryHistorySerializer(
+            data={
+                "student": self.student.pk,
+                "book_name": book_name,
+                "borrow_date": borrow_date.isoformat(),
+            }
+        )
+        serializer.is_valid(raise_exception=True)
+        return serializer.save()
+
+    def counters(self):
+        return (
+            set(BookMonthlyCount.objects.values_list("month", "book_name", "borrows")),
+            set(StudentMonthlyCount.objects.values_list("month", "student", "borrows")),
+        )
+
+    def assertMatchesRebuild(self):
+        counted = self.counters()
+        rebuild_reading_stats()
+        self.assertEqual(counted, self.counters())
+
+    def test_edit_moves_the_borrow(self):
+        serializer = LibraryHistorySerializer(
+            self.record,
+            data={"book_name": "Malgudi Days", "borrow_date": "2020-02-03"},
+            partial=True,
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        self.assertIn((date(2020, 2, 1), "Malgudi Days", 1), self.counters()[0])
+        self.assertMatchesRebuild()
+
+    def test_delete_uncounts_the_borrow(self):
+        self.record.delete()
+        self.assertEqual(self.counters()[1], {(date(2020, 1, 1), self.student.pk, 1)})
+        self.assertMatchesRebuild()
+
+    def test_archived_borrows_stay_counted(self):
+        self.record.return_date = date(2020, 1, 20)
+        self.record.status = "returned"
+        self.record.save()
+        call_command(
+            "archive_history",
+            "--before-year",
+            "2023",
+            "--target",
+            "library",
+            stdout=StringIO(),
+        )
+        self.assertFalse(LibraryHistory.objects.filter(pk=self.record.pk).exists())
+        self.assertMatchesRebuild()
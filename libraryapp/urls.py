@@ -1,8 +1,14 @@
 from django.urls import path
 from .views import (
+    ActiveReadersView,
+    ArchivedLibraryHistoryView,
+    ComputeFinesView,
+    ExportLibraryHistoryView,
     LibraryHistoryView,
     LibraryHistoryDetailView,
     LibrarianLibraryHistoryListView,
+    PopularBooksView,
+    StudentFinesView,
 )
 
 urlpatterns = [
@@ -21,4 +27,22 @@ urlpatterns = [
         LibrarianLibraryHistoryListView.as_view(),
         name="view-library-history",
     ),
+    path(
+        "archived_library_history/",
+        ArchivedLibraryHistoryView.as_view(),
+        name="archived-library-history",
+    ),
+    path(
+        "export_library_history/",
+        ExportLibraryHistoryView.as_view(),
+        name="export-library-history",
+    ),
+    path(
+        "student_fines/<int:student_id>/",
+        StudentFinesView.as_view(),
+        name="student-fines",
+    ),
+    path("compute_fines/", ComputeFinesView.as_view(), name="compute-fines"),
+    path("popular_books/", PopularBooksView.as_view(), name="popular-books"),
+    path("active_readers/", ActiveReadersView.as_view(), name="active-readers"),
 ]
@@ -1,15 +1,36 @@
-from django.shortcuts import render
 from rest_framework import generics, status
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
-from .serializers import LibraryHistorySerializer
-from .models import LibraryHistory
-from students.models import Student
+from rest_framework.views import APIView
+from coreapp.concurrency import ConditionalUpdateMixin
+from coreapp.fastpath import FastListMixin
+from coreapp.idempotency import IdempotentCreateMixin
+from coreapp.sparse import SparseFieldsViewMixin
+from jobsapp.registry import submit_job
+from jobsapp.serializers import ExportRequestSerializer
+from jobsapp.views import job_queued_response
+from .serializers import (
+    ActiveReaderSerializer,
+    ComputeFinesSerializer,
+    LibraryFineSerializer,
+    LibraryHistoryArchiveSerializer,
+    LibraryHistorySerializer,
+    ReadingStatsQuerySerializer,
+    StudentFineTotalSerializer,
+)
+from .models import LibraryFine, LibraryHistory, LibraryHistoryArchive, StudentFineTotal
+from .stats import active_readers, popular_books
+from students.models import Grade, Student, normalize_grade_key
 from students.serializers import StudentSerializers
-from usersapp.permissions import IsAdmin, IsOfficeStaff, IsLibrarian
+from usersapp.permissions import (
+    ADMIN_ROLES,
+    LIBRARIAN_OR_STAFF_ROLES,
+    role_permission,
+)
 
 
-class LibraryHistoryView(generics.ListCreateAPIView):
+class LibraryHistoryView(
+    IdempotentCreateMixin, SparseFieldsViewMixin, generics.ListCreateAPIView
+):
     """
     View to list and create library history records.
     Accessible only to Admin.
@@ -17,10 +38,14 @@ class LibraryHistoryView(generics.ListCreateAPIView):
 
     queryset = LibraryHistory.objects.all()
     serializer_class = LibraryHistorySerializer
-    permission_classes = [IsAuthenticated, IsAdmin]
+    permission_classes = [role_permission(ADMIN_ROLES)]
 
 
-class LibraryHistoryDetailView(generics.RetrieveUpdateDestroyAPIView):
+class LibraryHistoryDetailView(
+    ConditionalUpdateMixin,
+    SparseFieldsViewMixin,
+    generics.RetrieveUpdateDestroyAPIView,
+):
     """
     View to retrieve, update, or delete a library history record.
     Accessible only to Admin.
@@ -28,7 +53,7 @@ class LibraryHistoryDetailView(generics.RetrieveUpdateDestroyAPIView):
 
     queryset = LibraryHistory.objects.all()
     serializer_class = LibraryHistorySerializer
-    permission_classes = [IsAuthenticated, IsAdmin]
+    permission_classes = [role_permission(ADMIN_ROLES)]
 
     def destroy(self, request, *args, **kwargs):
         """
@@ -54,21 +79,175 @@ class LibraryHistoryDetailView(generics.RetrieveUpdateDestroyAPIView):
         )
 
 
-class LibrarianStudentListView(generics.ListAPIView):
+class LibrarianStudentListView(
+    SparseFieldsViewMixin, FastListMixin, generics.ListAPIView
+):
     """
     View for librarians and office staff to list all students.
     """
 
     queryset = Student.objects.all()
     serializer_class = StudentSerializers
-    permission_classes = [IsAuthenticated, IsLibrarian | IsOfficeStaff]
+    fast_list = True
+    permission_classes = [role_permission(LIBRARIAN_OR_STAFF_ROLES)]
 
 
-class LibrarianLibraryHistoryListView(generics.ListAPIView):
+class LibrarianLibraryHistoryListView(
+    SparseFieldsViewMixin, FastListMixin, generics.ListAPIView
+):
     """
     View for librarians and office staff to list all library history records.
     """
 
     queryset = LibraryHistory.objects.all()
     serializer_class = LibraryHistorySerializer
-    permission_classes = [IsAuthenticated, IsLibrarian | IsOfficeStaff]
+    fast_list = True
+    permission_classes = [role_permission(LIBRARIAN_OR_STAFF_ROLES)]
+
+
+class ArchivedLibraryHistoryView(
+    SparseFieldsViewMixin, FastListMixin, generics.ListAPIView
+):
+    """
+    View for librarians and office staff to list archived library records,
+    optionally for one student (?student=<id>).
+    """
+
+    serializer_class = LibraryHistoryArchiveSerializer
+    permission_classes = [role_permission(LIBRARIAN_OR_STAFF_ROLES)]
+    fast_list = True
+
+    def get_queryset(self):
+        queryset = LibraryHistoryArchive.objects.order_by("-borrow_date", "-id")
+        student_id = self.request.query_params.get("student")
+        if student_id and student_id.isdigit():
+            queryset = queryset.filter(student_id=student_id)
+        return queryset
+
+
+class ExportLibraryHistoryView(APIView):
+    """
+    View for librarians and office staff to queue a CSV export of library
+    history, optionally for one student.
+    """
+
+    permission_classes = [role_permission(LIBRARIAN_OR_STAFF_ROLES)]
+
+    def post(self, request):
+        serializer = ExportRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        job = submit_job(
+            "libraryapp.export_library_history",
+            serializer.validated_data,
+            user=request.user,
+        )
+        return job_queued_response(job)
+
+
+class StudentFinesView(APIView):
+    """
+    View for librarians and office staff to see a student's library fine total
+    and, with ?details=1, the individual fines.
+    """
+
+    permission_classes = [role_permission(LIBRARIAN_OR_STAFF_ROLES)]
+
+    def get(self, request, student_id):
+        fine_total = StudentFineTotal.objects.filter(student_id=student_id).first()
+        if fine_total is None:
+            data = {
+                "student": student_id,
+                "total": "0.00",
+                "fines": 0,
+                "computed_at": None,
+            }
+        else:
+            data = StudentFineTotalSerializer(fine_total).data
+        if request.query_params.get("details") == "1":
+            fines = (
+                LibraryFine.objects.filter(student_id=student_id)
+                .select_related("record")
+                .order_by("-amount", "record_id")
+            )
+            data["details"] = LibraryFineSerializer(fines, many=True).data
+        return Response(data, status=status.HTTP_200_OK)
+
+
+class ComputeFinesView(APIView):
+    """
+    View for librarians and office staff to queue a recomputation of library
+    fines outside the nightly run.
+    """
+
+    permission_classes = [role_permission(LIBRARIAN_OR_STAFF_ROLES)]
+
+    def post(self, request):
+        serializer = ComputeFinesSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        as_of = serializer.validated_data.get("as_of")
+        payload = {"as_of": as_of.isoformat()} if as_of else {}
+        job = submit_job("libraryapp.compute_fines", payload, user=request.user)
+        return job_queued_response(job)
+
+
+class ReadingStatsMixin:
+    """
+    Parses the month, grade and limit of the reading statistics endpoints.
+    """
+
+    permission_classes = [role_permission(LIBRARIAN_OR_STAFF_ROLES)]
+
+    def get_params(self, request):
+        query = ReadingStatsQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = dict(query.validated_data)
+        params["grade_id"] = None
+        if params.get("grade"):
+            params["grade_id"] = (
+                Grade.objects.filter(key=normalize_grade_key(params["grade"]))
+                .values_list("pk", flat=True)
+                .first()
+            )
+        return params
+
+    def stats_response(self, params, results):
+        return Response(
+            {
+                "month": params["month"].strftime("%Y-%m"),
+                "grade": params.get("grade"),
+                "results": results,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+class PopularBooksView(ReadingStatsMixin, APIView):
+    """
+    View for librarians and office staff to list the most borrowed books of a
+    month (?month=YYYY-MM), optionally for one grade (?grade=).
+    """
+
+    def get(self, request):
+        params = self.get_params(request)
+        if params.get("grade") and params["grade_id"] is None:
+            return self.stats_response(params, [])
+        books = popular_books(params["month"], params["grade_id"], params["limit"])
+        return self.stats_response(params, books)
+
+
+class ActiveReadersView(ReadingStatsMixin, APIView):
+    """
+    View for librarians and office staff to list the students who borrowed the
+    most books in a month (?month=YYYY-MM), optionally for one grade (?grade=).
+    """
+
+    def get(self, request):
+        params = self.get_params(request)
+        if params.get("grade") and params["grade_id"] is None:
+            return self.stats_response(params, [])
+        readers = active_readers(
+            params["month"], params["grade_id"], params["limit"]
+        ).select_related("student", "grade")
+        return self.stats_response(
+            params, ActiveReaderSerializer(readers, many=True).data
+        )
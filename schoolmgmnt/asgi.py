@@ -13,4 +13,16 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "schoolmgmnt.settings")
 
+# Serves the regular API and the long-lived change feed (feedapp) in one
+# process; feed events are broadcast in process, so run a single worker or
+# expect each client to see only changes made through its own worker
 application = get_asgi_application()
+
+# Pay the first-request costs (URLconf imports, serializer fields) before the
+# worker starts serving. Database connections are left to the request threads.
+from django.conf import settings  # noqa: E402
+
+if settings.WARMUP_ON_STARTUP:
+    from coreapp.warmup import warm_up  # noqa: E402
+
+    warm_up(connect_databases=False)
@@ -38,18 +38,27 @@ INSTALLED_APPS = [
     "django.contrib.messages",
     "django.contrib.staticfiles",
     "rest_framework",
+    "schoolsapp",
     "usersapp",
     "students",
     "libraryapp",
     "feeapp",
+    "coreapp",
+    "jobsapp",
+    "auditapp",
+    "feedapp",
 ]
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "coreapp.middleware.CompressionMiddleware",
+    "coreapp.middleware.RequestProfilingMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
+    "schoolsapp.middleware.TenantMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "auditapp.middleware.AuditContextMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -81,20 +90,190 @@ WSGI_APPLICATION = "schoolmgmnt.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
+# Seconds a WSGI worker keeps its database connection between requests, so
+# the connection opened by warm-up (and by each request) is reused. Keep 0 for
+# ASGI, where sync code runs on pooled threads and persistent connections
+# are not reused reliably.
+DB_CONN_MAX_AGE = config("DB_CONN_MAX_AGE", default=60, cast=int)
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        "CONN_MAX_AGE": DB_CONN_MAX_AGE,
+        "CONN_HEALTH_CHECKS": True,
     }
 }
 
+# Extra databases that schools can be placed on through School.db_alias,
+# e.g. TENANT_DB_ALIASES=tenant1,tenant2. Each gets its own SQLite file here;
+# point them at other servers in production.
+TENANT_DB_ALIASES = [
+    alias.strip()
+    for alias in config("TENANT_DB_ALIASES", default="").split(",")
+    if alias.strip()
+]
+for alias in TENANT_DB_ALIASES:
+    DATABASES[alias] = {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / f"db_{alias}.sqlite3",
+        "CONN_MAX_AGE": DB_CONN_MAX_AGE,
+        "CONN_HEALTH_CHECKS": True,
+    }
+
+# Apps whose tables live on the database of the current school
+TENANT_ROUTED_APPS = ["students", "feeapp", "libraryapp"]
+DATABASE_ROUTERS = ["schoolsapp.routers.TenantRouter"]
+
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "usersapp.authentication.RevocationAwareJWTAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
+    # orjson-backed JSON with a stdlib fallback
+    "DEFAULT_RENDERER_CLASSES": [
+        "coreapp.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    # Reverse proxies in front of the app; throttles take the client IP from
+    # X-Forwarded-For only past this many proxies, else from REMOTE_ADDR
+    "NUM_PROXIES": config("NUM_PROXIES", default=0, cast=int),
+}
+
+SIMPLE_JWT = {
+    # Every refresh returns a new refresh token and revokes the one used
+    "ROTATE_REFRESH_TOKENS": True,
+}
+
+# Seconds between reads of newly revoked tokens into each process's cache
+TOKEN_REVOCATION_SYNC_INTERVAL = config(
+    "TOKEN_REVOCATION_SYNC_INTERVAL", default=5, cast=int
+)
+TOKEN_REVOCATION_CACHE_MAX = 100000
+# Expired RevokedToken rows are deleted this often (seconds, per process)
+TOKEN_REVOCATION_PURGE_INTERVAL = config(
+    "TOKEN_REVOCATION_PURGE_INTERVAL", default=3600, cast=int
+)
+
+# Login attempts allowed per client IP and per username. STORE is "local"
+# (per process) or "cache" (shared through the Django cache).
+LOGIN_THROTTLE = {
+    "IP_RATE": config("LOGIN_THROTTLE_IP_RATE", default="30/min"),
+    "USERNAME_RATE": config("LOGIN_THROTTLE_USERNAME_RATE", default="5/min"),
+    "STORE": config("LOGIN_THROTTLE_STORE", default="local"),
+}
+
+# Run coreapp.warmup.warm_up() when the WSGI/ASGI application is loaded
+WARMUP_ON_STARTUP = config("WARMUP_ON_STARTUP", default=True, cast=bool)
+# Open database connections during warm-up; disable when workers are forked
+# from a preloaded master process. Only done under WSGI and when
+# DB_CONN_MAX_AGE keeps the connection past the first request.
+WARMUP_DB_CONNECTIONS = config("WARMUP_DB_CONNECTIONS", default=True, cast=bool)
+
+# Responses smaller than this many bytes are sent uncompressed
+RESPONSE_COMPRESSION_MIN_SIZE = config(
+    "RESPONSE_COMPRESSION_MIN_SIZE", default=1024, cast=int
+)
+
+
+# Bulk student import limits
+STUDENT_IMPORT_BATCH_SIZE = 1000
+STUDENT_IMPORT_MAX_ROWS = config("STUDENT_IMPORT_MAX_ROWS", default=20000, cast=int)
+
+
+# Student profiles and the "cache" login throttle store live here. The
+# default local-memory cache is per process, so with several workers a profile
+# invalidated in one worker stays cached in the others until it times out;
+# point CACHE_BACKEND/CACHE_LOCATION at a shared cache (e.g.
+# django.core.cache.backends.redis.RedisCache) when running more than one.
+CACHES = {
+    "default": {
+        "BACKEND": config(
+            "CACHE_BACKEND", default="django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": config("CACHE_LOCATION", default=""),
+    }
+}
+
+# Seconds a consolidated student profile stays cached; kept short since the
+# default cache is not shared between workers
+STUDENT_PROFILE_CACHE_TIMEOUT = config(
+    "STUDENT_PROFILE_CACHE_TIMEOUT", default=60, cast=int
+)
+
+
+# Month (1-12) in which the academic year starts; used to pick archive cutoffs
+ACADEMIC_YEAR_START_MONTH = config("ACADEMIC_YEAR_START_MONTH", default=6, cast=int)
+
+
+# Background jobs run by `manage.py run_jobs`
+JOB_MAX_ATTEMPTS = 3
+# Running jobs older than this many seconds are requeued when a worker starts
+JOB_STALE_AFTER = config("JOB_STALE_AFTER", default=3600, cast=int)
+JOB_RESULTS_DIR = config("JOB_RESULTS_DIR", default=str(BASE_DIR / "job_results"))
+
+
+# Models whose creates, updates and deletes are written to the audit log
+AUDITED_MODELS = [
+    "students.Student",
+    "feeapp.FeesHistory",
+    "libraryapp.LibraryHistory",
+    "usersapp.User",
+]
+# Audit entries are written once this many are buffered, and at the end of
+# every request and background job
+AUDIT_BUFFER_SIZE = config("AUDIT_BUFFER_SIZE", default=100, cast=int)
+
+
+# Rendered fee receipts, stored by record id and content hash
+RECEIPT_CACHE_DIR = config("RECEIPT_CACHE_DIR", default=str(BASE_DIR / "receipt_cache"))
+# Worker processes of the pool that renders batches of receipts
+RECEIPT_BATCH_PROCESSES = config("RECEIPT_BATCH_PROCESSES", default=2, cast=int)
+# Batches with fewer cache misses are rendered in the requesting process
+RECEIPT_POOL_MIN_BATCH = config("RECEIPT_POOL_MIN_BATCH", default=50, cast=int)
+
+
+# Admin-triggered request profiles (X-Profile: 1 or ?_profile=1)
+PROFILE_ARTIFACT_DIR = config(
+    "PROFILE_ARTIFACT_DIR", default=str(BASE_DIR / "profile_artifacts")
+)
+# Only the newest profiles are kept
+PROFILE_ARTIFACT_KEEP = config("PROFILE_ARTIFACT_KEEP", default=50, cast=int)
+
+
+# Idempotency-Key support on fee and library record creation.
+# Answered requests are replayed for retries within IDEMPOTENCY_TTL seconds.
+# Keys are remembered per worker process only: deduplication is guaranteed
+# with a single worker (or when retries reach the same worker), and a retry
+# handled by another worker creates the record again.
+IDEMPOTENCY_TTL = config("IDEMPOTENCY_TTL", default=86400, cast=int)
+# Answered keys remembered per process
+IDEMPOTENCY_CACHE_MAX = config("IDEMPOTENCY_CACHE_MAX", default=10000, cast=int)
+# How long a retry waits for the first request with its key to finish
+IDEMPOTENCY_WAIT_SECONDS = config("IDEMPOTENCY_WAIT_SECONDS", default=30, cast=int)
+
+
+# Server-sent change feed (feed/changes/, ASGI only)
+# Seconds of silence before a heartbeat comment is sent
+FEED_HEARTBEAT_SECONDS = config("FEED_HEARTBEAT_SECONDS", default=15, cast=int)
+# Reconnect delay suggested to EventSource clients
+FEED_RETRY_MS = config("FEED_RETRY_MS", default=5000, cast=int)
+# Recent events kept in memory for Last-Event-ID replay
+FEED_HISTORY_SIZE = config("FEED_HISTORY_SIZE", default=1000, cast=int)
+# Undelivered events per client before its stream is reset
+FEED_QUEUE_SIZE = config("FEED_QUEUE_SIZE", default=500, cast=int)
+
+
+# Overdue fines computed nightly by `manage.py compute_library_fines`.
+# A book is due LOAN_DAYS after borrowing; after GRACE_DAYS more, each further
+# day costs DAILY_RATE, up to CAP per record.
+LIBRARY_FINE_POLICY = {
+    "LOAN_DAYS": config("LIBRARY_LOAN_DAYS", default=14, cast=int),
+    "GRACE_DAYS": config("LIBRARY_FINE_GRACE_DAYS", default=2, cast=int),
+    "DAILY_RATE": config("LIBRARY_FINE_DAILY_RATE", default="5.00"),
+    "CAP": config("LIBRARY_FINE_CAP", default="200.00"),
 }
 
 
@@ -24,4 +24,8 @@ urlpatterns = [
     path("students/", include("students.urls")),
     path("library/", include("libraryapp.urls")),
     path("fees/", include("feeapp.urls")),
+    path("jobs/", include("jobsapp.urls")),
+    path("audit/", include("auditapp.urls")),
+    path("profiles/", include("coreapp.urls")),
+    path("feed/", include("feedapp.urls")),
 ]
@@ -14,3 +14,12 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "schoolmgmnt.settings")
 
 application = get_wsgi_application()
+
+# Pay the first-request costs (URLconf imports, serializer fields, DB
+# connections) before the worker starts serving
+from django.conf import settings  # noqa: E402
+
+if settings.WARMUP_ON_STARTUP:
+    from coreapp.warmup import warm_up  # noqa: E402
+
+    warm_up()
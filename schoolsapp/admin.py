@@ -0,0 +1,9 @@
+from django.contrib import admin
+from .models import School
+
+
+@admin.register(School)
+class SchoolAdmin(admin.ModelAdmin):
+    list_display = ("name", "slug", "domain", "db_alias", "is_active")
+    search_fields = ("name", "slug", "domain")
+    prepopulated_fields = {"slug": ("name",)}
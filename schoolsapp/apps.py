@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class SchoolsappConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "schoolsapp"
+
+    def ready(self):
+        # Connect school assignment and school cache invalidation
+        from . import signals  # noqa: F401
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from .context import each_school
+
+
+class PerSchoolCommand(BaseCommand):
+    """
+    Management command whose handle_school() runs once per school with that
+    school current (see each_school), so batch work reaches every tenant
+    database.
+    """
+
+    def handle(self, *args, **options):
+        for school in each_school():
+            if school is not None:
+                self.stdout.write(f"School: {school.slug}")
+            self.handle_school(*args, **options)
+
+    def handle_school(self, *args, **options):
+        raise NotImplementedError(
+            "subclasses of PerSchoolCommand must provide a handle_school() method"
+        )
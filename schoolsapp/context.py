@@ -0,0 +1,53 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# The School the current request, job or command works on; None means every school
+current_school = ContextVar("current_school", default=None)
+
+
+def current_school_id():
+    school = current_school.get()
+    return school.pk if school is not None else None
+
+
+@contextmanager
+def use_school(school):
+    """
+    Scope every query and write inside the block to `school`.
+    """
+    token = current_school.set(school)
+    try:
+        yield school
+    finally:
+        current_school.reset(token)
+
+
+def tenant_key(key):
+    """
+    Prefix a cache key or file name with the current school, since primary keys
+    of tenant data are only unique within one database.
+    """
+    school_id = current_school_id()
+    return key if school_id is None else f"school{school_id}:{key}"
+
+
+def each_school():
+    """
+    Yield once per active school with that school current, for batch work
+    that must cover every tenant and every tenant database. When a school is
+    already current only that one is yielded; when no schools exist, None is
+    yielded once and the work runs unscoped.
+    """
+    from .models import School
+
+    school = current_school.get()
+    if school is not None:
+        yield school
+        return
+    schools = list(School.objects.filter(is_active=True).order_by("pk"))
+    if not schools:
+        yield None
+        return
+    for school in schools:
+        with use_school(school):
+            yield school
@@ -0,0 +1,42 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from schoolsapp.context import use_school
+from schoolsapp.models import School, SchoolScopedModel
+
+
+class Command(BaseCommand):
+    help = (
+        "Assign every school-scoped row without a school to the given school, "
+        "in batches. Used once when a single-school deployment adopts tenancy."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("school", help="Slug of the school.")
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        school = School.objects.filter(slug=options["school"]).first()
+        if school is None:
+            raise CommandError(f"No school with slug '{options['school']}'.")
+
+        with use_school(school):
+            for model in apps.get_models():
+                if not issubclass(model, SchoolScopedModel):
+                    continue
+                pending = model.objects.unscoped().filter(school__isnull=True)
+                assigned = 0
+                while True:
+                    pks = list(
+                        pending.order_by("pk").values_list("pk", flat=True)[
+                            : options["batch_size"]
+                        ]
+                    )
+                    if not pks:
+                        break
+                    assigned += (
+                        model.objects.unscoped()
+                        .filter(pk__in=pks)
+                        .update(school=school)
+                    )
+                self.stdout.write(f"{model._meta.label}: {assigned} rows assigned")
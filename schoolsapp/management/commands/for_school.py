@@ -0,0 +1,26 @@
+import argparse
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+from schoolsapp.context import use_school
+from schoolsapp.models import School
+
+
+class Command(BaseCommand):
+    help = (
+        "Run another management command scoped to one school, e.g. "
+        "`manage.py for_school demo seed_school --students 1000`."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("school", help="Slug of the school.")
+        parser.add_argument("command_name")
+        parser.add_argument("command_args", nargs=argparse.REMAINDER)
+
+    def handle(self, *args, **options):
+        school = School.objects.filter(slug=options["school"]).first()
+        if school is None:
+            raise CommandError(f"No school with slug '{options['school']}'.")
+        with use_school(school):
+            call_command(options["command_name"], *options["command_args"])
@@ -0,0 +1,39 @@
+from django.http import JsonResponse
+
+from .context import current_school
+from .resolution import (
+    claimed_school_id,
+    get_school,
+    get_school_for_host,
+    request_host,
+)
+
+
+class TenantMiddleware:
+    """
+    Resolve the school of the request from the JWT "school" claim, falling
+    back to the host name, and scope the rest of the request to it.
+    A token issued for another school than the host's is refused.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        host_school = get_school_for_host(request_host(request))
+        school_id = claimed_school_id(request)
+        school = get_school(school_id) if school_id is not None else host_school
+
+        if school_id is not None and (
+            school is None or (host_school is not None and host_school != school)
+        ):
+            return JsonResponse(
+                {"details": "This token is not valid for this school."}, status=403
+            )
+
+        request.school = school
+        token = current_school.set(school)
+        try:
+            return self.get_response(request)
+        finally:
+            current_school.reset(token)
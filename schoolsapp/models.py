@@ -0,0 +1,111 @@
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import models
+from django.db.models import Q
+
+from .context import current_school_id
+
+
+class School(models.Model):
+    """
+    A tenant. Every school-scoped row points at one; `db_alias` names the
+    database that holds the school's students, fees and library data.
+    """
+
+    name = models.CharField(max_length=255)
+    slug = models.SlugField(max_length=50, unique=True)
+    # Requests to this host are served for the school without a JWT claim
+    domain = models.CharField(max_length=255, unique=True, null=True, blank=True)
+    db_alias = models.CharField(max_length=50, default="default")
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def clean(self):
+        if self.db_alias not in settings.DATABASES:
+            raise ValidationError(
+                {"db_alias": f"'{self.db_alias}' is not a configured database."}
+            )
+
+    def __str__(self):
+        return self.name
+
+
+class TenantQuerySet(models.QuerySet):
+    """
+    QuerySet that filters to the current school the first time it is chained
+    while a school is active. Scoping on chain rather than on creation also
+    covers querysets built at import time, such as a view's `queryset`
+    attribute, which DRF re-chains with .all() on every request.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # None: not scoped yet; False: explicitly unscoped; otherwise a school id
+        self._school_scope = None
+
+    def _clone(self):
+        clone = super()._clone()
+        clone._school_scope = self._school_scope
+        return clone
+
+    def _chain(self):
+        return super()._chain()._scoped()
+
+    def _scoped(self):
+        if self._school_scope is None:
+            school_id = current_school_id()
+            if school_id is not None:
+                self.query.add_q(Q(school_id=school_id))
+                self._school_scope = school_id
+        return self
+
+    def unscoped(self):
+        """
+        Return a queryset over every school, even while a school is active.
+        Call it through the manager (Model.objects.unscoped()); a queryset that
+        is already scoped keeps its filter.
+        """
+        clone = super()._chain()
+        clone._school_scope = False
+        return clone
+
+    def bulk_create(self, objs, *args, **kwargs):
+        # bulk_create sends no pre_save, so assign the school here
+        objs = list(objs)
+        school_id = current_school_id()
+        if school_id is not None:
+            for obj in objs:
+                if obj.school_id is None:
+                    obj.school_id = school_id
+        return super().bulk_create(objs, *args, **kwargs)
+
+
+class TenantManager(models.Manager.from_queryset(TenantQuerySet)):
+    def get_queryset(self):
+        return super().get_queryset()._scoped()
+
+    def unscoped(self):
+        return super().get_queryset().unscoped()
+
+
+class SchoolScopedModel(models.Model):
+    """
+    Abstract base for rows that belong to one school. Queries through
+    `objects` only see the current school's rows and new rows are assigned to
+    it. The foreign key has no database constraint because the school's rows
+    may live on a different database than the School table.
+    """
+
+    school = models.ForeignKey(
+        School,
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        db_constraint=False,
+        related_name="+",
+    )
+
+    objects = TenantManager()
+
+    class Meta:
+        abstract = True
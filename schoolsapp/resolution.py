@@ -0,0 +1,62 @@
+import time
+
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .models import School
+
+# JWT claim carrying the user's school id, added at login
+SCHOOL_CLAIM = "school"
+
+# Schools by id and by domain; the table is small and read on every request.
+# Entries are dropped on School saves in this process and every CACHE_SECONDS
+# so changes made by other processes are picked up too.
+CACHE_SECONDS = 60
+_by_id = {}
+_by_domain = {}
+_loaded_at = time.monotonic()
+
+
+def _expire():
+    if time.monotonic() - _loaded_at > CACHE_SECONDS:
+        clear_school_cache()
+
+
+def get_school(school_id):
+    _expire()
+    if school_id not in _by_id:
+        _by_id[school_id] = School.objects.filter(pk=school_id, is_active=True).first()
+    return _by_id[school_id]
+
+
+def get_school_for_host(host):
+    _expire()
+    if host not in _by_domain:
+        _by_domain[host] = School.objects.filter(domain=host, is_active=True).first()
+    return _by_domain[host]
+
+
+def clear_school_cache():
+    global _loaded_at
+    _by_id.clear()
+    _by_domain.clear()
+    _loaded_at = time.monotonic()
+
+
+def claimed_school_id(request):
+    """
+    Return the school claim of a valid Bearer access token, or None.
+    An invalid token is ignored here; DRF authentication rejects it later.
+    """
+    header = request.META.get("HTTP_AUTHORIZATION", "").split()
+    if len(header) != 2 or header[0] != "Bearer":
+        return None
+    try:
+        return AccessToken(header[1]).get(SCHOOL_CLAIM)
+    except TokenError:
+        return None
+
+
+def request_host(request):
+    # get_host() validates against ALLOWED_HOSTS, which bounds the domain cache
+    return request.get_host().rsplit(":", 1)[0].lower()
@@ -0,0 +1,36 @@
+from django.conf import settings
+
+from .context import current_school
+
+
+class TenantRouter:
+    """
+    Send queries for the apps in TENANT_ROUTED_APPS to the database of the
+    current school. Everything else, including the School table, stays on
+    "default". Tenant databases only receive the tenant apps' tables.
+    """
+
+    def _tenant_alias(self, model):
+        if model._meta.app_label not in settings.TENANT_ROUTED_APPS:
+            return None
+        school = current_school.get()
+        return school.db_alias if school is not None else None
+
+    def db_for_read(self, model, **hints):
+        return self._tenant_alias(model)
+
+    def db_for_write(self, model, **hints):
+        return self._tenant_alias(model)
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The school foreign key has no database constraint, so it may cross databases
+        if obj1._meta.app_label == "schoolsapp" or obj2._meta.app_label == "schoolsapp":
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == "default":
+            return None
+        return db in settings.TENANT_DB_ALIASES and (
+            app_label in settings.TENANT_ROUTED_APPS
+        )
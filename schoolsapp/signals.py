@@ -0,0 +1,25 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .context import current_school_id
+from .models import School, SchoolScopedModel
+from .resolution import clear_school_cache
+
+
+@receiver(pre_save)
+def assign_current_school(sender, instance, raw=False, **kwargs):
+    """
+    Give new school-scoped rows the current school when none was set.
+    """
+    if raw or not isinstance(instance, SchoolScopedModel):
+        return
+    if instance.school_id is None:
+        instance.school_id = current_school_id()
+
+
+@receiver([post_save, post_delete], sender=School)
+def invalidate_school_cache(sender, **kwargs):
+    """
+    Forget cached schools when one changes.
+    """
+    clear_school_cache()
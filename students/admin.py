@@ -1,6 +1,60 @@
 from django.contrib import admin
-from .models import Student
 
-# Register your models here.
+from coreapp.admin import LargeTableAdmin
+from .models import Grade, Student
+from .profile import invalidate_student_profile
 
-admin.site.register(Student)
+
+@admin.register(Grade)
+class GradeAdmin(admin.ModelAdmin):
+    list_display = ("name", "key", "sort_key")
+    search_fields = ("name", "key")
+    readonly_fields = ("key",)
+
+
+@admin.register(Student)
+class StudentAdmin(LargeTableAdmin):
+    list_display = ("name", "age", "grade", "created_at")
+    list_filter = ("grade",)
+    list_select_related = ("grade",)
+    # Backs the autocomplete student widget on the fee and library admins
+    search_fields = ("name",)
+    readonly_fields = ("version",)
+
+
+class StudentRecordAdmin(LargeTableAdmin):
+    """
+    Base admin for per-student records (fees, library history). The student is
+    joined into the changelist query and edited through an autocomplete widget,
+    and deletion skips the stock confirmation page that renders every row.
+    """
+
+    list_select_related = ("student",)
+    autocomplete_fields = ("student",)
+    readonly_fields = ("version",)
+    actions = ["delete_selected_records"]
+
+    def get_actions(self, request):
+        actions = super().get_actions(request)
+        # The stock action loads every selected row to build its confirmation page
+        actions.pop("delete_selected", None)
+        return actions
+
+    def records_changed(self, rows):
+        """
+        Hook run after a bulk action with (pk, student_id) pairs of the affected rows.
+        """
+        for student_id in {student_id for _pk, student_id in rows}:
+            invalidate_student_profile(student_id)
+
+    @admin.action(
+        permissions=["delete"],
+        description="Delete selected %(verbose_name_plural)s",
+    )
+    def delete_selected_records(self, request, queryset):
+        # The collector removes dependants such as library fines and sends
+        # post_delete per record, which writes the audit entries, drops cached
+        # profiles and receipts and publishes change feed events
+        _total, per_model = queryset.order_by().delete()
+        deleted = per_model.get(queryset.model._meta.label, 0)
+        self.message_user(request, f"Deleted {deleted} records.")
@@ -0,0 +1,86 @@
+from functools import partial
+
+from django.conf import settings
+from django.db import router, transaction
+from django.db.models import F
+
+from auditapp.recorder import record_bulk_action
+from feedapp.signals import publish_bulk_on_commit
+from .models import Grade, Student, normalize_grade_key
+from .profile import invalidate_student_profile
+from .serializers import StudentSerializers, save_new_grades
+
+
+def import_students(rows, batch_size=None):
+    """
+    Validate `rows` in batches and insert them with bulk_create.
+    All rows are validated before anything is written, and the insert runs in
+    one transaction, so either every row is imported or none is.
+    Returns (created_count, errors) where errors lists {"row", "errors"} dicts
+    with 1-based row numbers.
+    """
+    batch_size = batch_size or settings.STUDENT_IMPORT_BATCH_SIZE
+    errors = []
+    students = []
+
+    for offset in range(0, len(rows), batch_size):
+        batch = rows[offset : offset + batch_size]
+        serializer = StudentSerializers(data=batch, many=True)
+        if serializer.is_valid():
+            students.extend(Student(**attrs) for attrs in serializer.validated_data)
+            continue
+        for index, row_errors in enumerate(serializer.errors, start=offset + 1):
+            if row_errors:
+                errors.append({"row": index, "errors": row_errors})
+
+    if errors:
+        return 0, errors
+
+    using = router.db_for_write(Student)
+    with transaction.atomic(using=using):
+        save_new_grades(students)
+        Student.objects.bulk_create(students, batch_size=batch_size)
+        # bulk_create sends no post_save, so announce the import as a whole
+        publish_bulk_on_commit(Student, "bulk_created", len(students), using=using)
+    return len(students), []
+
+
+def promote_grade(from_grade, to_grade, dry_run=False):
+    """
+    Move every student in `from_grade` to `to_grade` with a single UPDATE.
+    The update bypasses per-instance signals, so it is audited as one bulk
+    action and the moved students' cached profiles are dropped on commit.
+    With dry_run, only the number of matching students is returned.
+    """
+    source = Grade.objects.filter(key=normalize_grade_key(from_grade)).first()
+    if source is None:
+        return 0
+    queryset = Student.objects.filter(grade=source)
+    if dry_run:
+        return queryset.count()
+    using = router.db_for_write(Student)
+    with transaction.atomic(using=using):
+        student_ids = list(queryset.select_for_update().values_list("pk", flat=True))
+        if not student_ids:
+            return 0
+        target = Grade.objects.resolve(to_grade)
+        updated = Student.objects.filter(pk__in=student_ids).update(
+            grade=target, version=F("version") + 1
+        )
+        record_bulk_action(
+            Student,
+            "promote grade",
+            updated,
+            from_grade=source.name,
+            to_grade=target.name,
+        )
+        transaction.on_commit(partial(_students_changed, student_ids), using=using)
+        publish_bulk_on_commit(
+            Student, "bulk_updated", updated, student_ids, using=using
+        )
+    return updated
+
+
+def _students_changed(student_ids):
+    for student_id in student_ids:
+        invalidate_student_profile(student_id)
@@ -0,0 +1,12 @@
+from jobsapp.registry import job_handler
+
+from .bulk import import_students
+
+
+@job_handler("students.import")
+def import_students_job(payload, progress):
+    """
+    Import the students queued by BulkImportStudentsView.
+    """
+    created, errors = import_students(payload["students"])
+    return {"created": created, "errors": errors}
@@ -0,0 +1,59 @@
+from collections import defaultdict
+
+from django.db import router, transaction
+
+from schoolsapp.commands import PerSchoolCommand
+from students.models import Grade, Student, normalize_grade_key
+
+
+class Command(PerSchoolCommand):
+    help = (
+        "Backfill Student.grade from the legacy free-text grade column in batches, "
+        "merging spellings such as '5A' and '5-A' into one Grade."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle_school(self, *args, **options):
+        pending = Student.objects.filter(grade__isnull=True).exclude(legacy_grade="")
+        last_pk = 0
+        total = 0
+        labels = set()
+
+        while True:
+            batch = list(
+                pending.filter(pk__gt=last_pk)
+                .order_by("pk")
+                .values_list("pk", "legacy_grade")[: options["batch_size"]]
+            )
+            if not batch:
+                break
+            last_pk = batch[-1][0]
+            total += len(batch)
+            labels.update(label for _pk, label in batch)
+            if not options["dry_run"]:
+                self.backfill(batch)
+
+        if options["dry_run"]:
+            self.stdout.write(
+                f"{total} students would be mapped onto "
+                f"{len({normalize_grade_key(label) for label in labels})} grades"
+            )
+        else:
+            self.stdout.write(
+                f"{total} students mapped; {Grade.objects.count()} grades in total"
+            )
+
+    def backfill(self, batch):
+        """
+        Point one batch of students at their grades with one UPDATE per grade.
+        """
+        grades = Grade.objects.resolve_many({label for _pk, label in batch})
+        pks_by_grade = defaultdict(list)
+        for pk, label in batch:
+            pks_by_grade[grades[label].pk].append(pk)
+        with transaction.atomic(using=router.db_for_write(Student)):
+            for grade_id, pks in pks_by_grade.items():
+                Student.objects.filter(pk__in=pks).update(grade_id=grade_id)
@@ -0,0 +1,145 @@
+import re
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Students read and updated per round trip of the backfill
+BATCH_SIZE = 5000
+
+# Frozen copies of the grade helpers in students.models as they were when this
+# migration was written; later changes to those must not alter the backfill
+GRADE_PATTERN = re.compile(r"^(\d+)([A-Z]*)$")
+
+
+def normalize_grade_key(value):
+    key = re.sub(r"[^0-9A-Z]", "", str(value).upper())
+    match = GRADE_PATTERN.match(key)
+    if match is None:
+        return key
+    level, section = match.groups()
+    return f"{int(level)}{section}"
+
+
+def grade_defaults(value):
+    key = normalize_grade_key(value)
+    match = GRADE_PATTERN.match(key)
+    if match is None:
+        return {"name": str(value).strip().upper(), "sort_key": 0}
+    level, section = match.groups()
+    name = f"{int(level)}-{section}" if section else str(int(level))
+    section_rank = ord(section[0]) - 64 if section else 0
+    return {"name": name, "sort_key": int(level) * 100 + section_rank}
+
+
+def backfill_grades(apps, schema_editor):
+    """
+    Point every student at a Grade derived from the free-text grade column,
+    in primary key batches with one UPDATE per grade per batch.
+    """
+    db = schema_editor.connection.alias
+    Grade = apps.get_model("students", "Grade")
+    Student = apps.get_model("students", "Student")
+    grades = {}
+    pending = (
+        Student.objects.using(db).filter(grade__isnull=True).exclude(legacy_grade="")
+    )
+    last_pk = 0
+    while True:
+        batch = list(
+            pending.filter(pk__gt=last_pk)
+            .order_by("pk")
+            .values_list("pk", "legacy_grade")[:BATCH_SIZE]
+        )
+        if not batch:
+            break
+        last_pk = batch[-1][0]
+
+        pks_by_key = {}
+        for pk, label in batch:
+            key = normalize_grade_key(label)
+            if not key:
+                continue
+            if key not in grades:
+                defaults = grade_defaults(label)
+                grades[key], _created = Grade.objects.using(db).get_or_create(
+                    key=key, defaults=defaults
+                )
+            pks_by_key.setdefault(key, []).append(pk)
+        for key, pks in pks_by_key.items():
+            Student.objects.using(db).filter(pk__in=pks).update(grade=grades[key])
+
+
+def restore_legacy_grades(apps, schema_editor):
+    """
+    Copy grade names back into the free-text column for students created
+    after the backfill, which only carry the reference.
+    """
+    db = schema_editor.connection.alias
+    Grade = apps.get_model("students", "Grade")
+    Student = apps.get_model("students", "Student")
+    for grade in Grade.objects.using(db).iterator():
+        Student.objects.using(db).filter(grade=grade, legacy_grade="").update(
+            legacy_grade=grade.name
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("students", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Grade",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=20, unique=True)),
+                ("key", models.CharField(max_length=20, unique=True)),
+                ("sort_key", models.PositiveIntegerField(db_index=True)),
+            ],
+            options={
+                "ordering": ["sort_key", "name"],
+            },
+        ),
+        # The free-text column keeps its name; only the model field is renamed,
+        # so the backfill can read it and older code keeps working meanwhile
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.RenameField(
+                    model_name="student", old_name="grade", new_name="legacy_grade"
+                ),
+                migrations.AlterField(
+                    model_name="student",
+                    name="legacy_grade",
+                    field=models.CharField(
+                        blank=True,
+                        db_column="grade",
+                        default="",
+                        editable=False,
+                        max_length=20,
+                    ),
+                ),
+            ],
+            database_operations=[],
+        ),
+        migrations.AddField(
+            model_name="student",
+            name="grade",
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="students",
+                to="students.grade",
+            ),
+        ),
+        migrations.RunPython(backfill_grades, restore_legacy_grades),
+    ]
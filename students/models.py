@@ -1,24 +1,126 @@
+import re
+
 from django.db import models
+from schoolsapp.models import SchoolScopedModel
 
 """
 The Student model represents a student entity in the database.
 It includes fields like name, age, grade, and created_at to store relevant information.
 """
 
+# "5-A", "5a", "5 A" and "5A" all describe the same grade
+GRADE_PATTERN = re.compile(r"^(\d+)([A-Z]*)$")
+
+
+def normalize_grade_key(value):
+    """
+    Return the comparison key of a grade label: upper case, letters and digits
+    only, without leading zeros in the level ("05-A" and "5a" are both "5A").
+    """
+    key = re.sub(r"[^0-9A-Z]", "", str(value).upper())
+    match = GRADE_PATTERN.match(key)
+    if match is None:
+        return key
+    level, section = match.groups()
+    return f"{int(level)}{section}"
+
+
+def grade_defaults(value):
+    """
+    Return the canonical name and sort key for a grade label.
+    Numbered grades are named "<level>-<section>" and sort by level, then section.
+    """
+    key = normalize_grade_key(value)
+    match = GRADE_PATTERN.match(key)
+    if match is None:
+        # Unnumbered grades (e.g. "KG") sort before grade 1
+        return {"name": str(value).strip().upper(), "sort_key": 0}
+    level, section = match.groups()
+    name = f"{int(level)}-{section}" if section else str(int(level))
+    section_rank = ord(section[0]) - 64 if section else 0
+    return {"name": name, "sort_key": int(level) * 100 + section_rank}
+
+
+class GradeManager(models.Manager):
+    def resolve_many(self, labels):
+        """
+        Return {label: Grade} for every label, creating missing grades in one
+        bulk insert. Labels that normalize to the same key share a Grade.
+        """
+        keys = {label: normalize_grade_key(label) for label in labels}
+        grades = {grade.key: grade for grade in self.filter(key__in=keys.values())}
+        missing = {}
+        for label, key in keys.items():
+            if key not in grades and key not in missing:
+                missing[key] = self.model(key=key, **grade_defaults(label))
+        if missing:
+            self.bulk_create(missing.values(), ignore_conflicts=True)
+            # Re-read so the new rows carry primary keys on every backend.
+            # A row skipped as a conflict is matched by key or by name.
+            names = {grade.name: key for key, grade in missing.items()}
+            for grade in self.filter(
+                models.Q(key__in=missing.keys()) | models.Q(name__in=names)
+            ):
+                grades.setdefault(grade.key, grade)
+                if grade.name in names:
+                    grades.setdefault(names[grade.name], grade)
+        return {label: grades[key] for label, key in keys.items()}
+
+    def resolve(self, label):
+        return self.resolve_many([label])[label]
+
 
-class Student(models.Model):
+class Grade(models.Model):
+    """
+    Reference table of grades. Students point at a Grade instead of storing the
+    label, so rows stay small and cohorts cannot be split by spelling.
+    """
+
+    # Canonical label shown in the API, e.g. "5-A"
+    name = models.CharField(max_length=20, unique=True)
+    # Normalized form used for lookups, e.g. "5A"
+    key = models.CharField(max_length=20, unique=True)
+    # Orders grades by level, then section
+    sort_key = models.PositiveIntegerField(db_index=True)
+
+    objects = GradeManager()
+
+    class Meta:
+        ordering = ["sort_key", "name"]
+
+    def save(self, *args, **kwargs):
+        # Keep the lookup key in step with the label
+        self.key = normalize_grade_key(self.name)
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return self.name
+
+
+class Student(SchoolScopedModel):
     # The 'name' field stores the student's full name with a maximum length of 100 characters.
     name = models.CharField(max_length=100)
 
     # The 'age' field stores the student's age as an integer.
     age = models.IntegerField()
 
-    # The 'grade' field stores the student's grade as a string with a maximum length of 20 characters.
-    grade = models.CharField(max_length=20)
+    # The 'grade' field references the student's Grade; the foreign key is indexed.
+    grade = models.ForeignKey(
+        Grade, on_delete=models.PROTECT, related_name="students", null=True
+    )
+
+    # The 'legacy_grade' field maps the old free-text grade column until normalize_grades
+    # has backfilled 'grade' for every existing student.
+    legacy_grade = models.CharField(
+        max_length=20, db_column="grade", blank=True, default="", editable=False
+    )
 
     # The 'created_at' field automatically stores the date and time when the student record is created.
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # The 'version' field is bumped on every update and backs optimistic concurrency (ETag / If-Match).
+    version = models.PositiveIntegerField(default=1)
+
     def __str__(self):
         """
         The __str__ method is used to return a human-readable representation of the object.
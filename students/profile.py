@@ -0,0 +1,93 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Prefetch, Sum
+from django.shortcuts import get_object_or_404
+from rest_framework import serializers
+
+from feeapp.models import FeesHistory
+from schoolsapp.context import tenant_key
+from feeapp.serializers import FeeHistorySerializers
+from libraryapp.models import LibraryHistory
+from libraryapp.serializers import LibraryHistorySerializer
+from .models import Student
+from .serializers import StudentSerializers
+
+
+class FeeTotalSerializer(serializers.Serializer):
+    """
+    Serializes one row of the per-fee-type totals aggregate.
+    """
+
+    fee_type = serializers.CharField()
+    total = serializers.DecimalField(max_digits=14, decimal_places=2)
+    payments = serializers.IntegerField()
+
+
+def _version_key(student_id):
+    return tenant_key(f"student-profile-version:{student_id}")
+
+
+def _profile_key(student_id, recent_limit):
+    # Reuse the stored version, creating a fresh one if it was never set or evicted
+    version = cache.get_or_set(_version_key(student_id), time.time_ns, None)
+    return tenant_key(f"student-profile:{student_id}:{version}:{recent_limit}")
+
+
+def invalidate_student_profile(student_id):
+    """
+    Make every cached profile of the student unreachable by bumping its version.
+    """
+    cache.set(_version_key(student_id), time.time_ns(), None)
+
+
+def build_student_profile(student_id, recent_limit):
+    """
+    Build the consolidated profile of one student in a constant number of queries:
+    the student with its latest payments and borrowed books prefetched, and one
+    aggregate for the fee totals by type.
+    """
+    recent_payments = FeesHistory.objects.order_by("-payment_date", "-id")[
+        :recent_limit
+    ]
+    borrowed_books = LibraryHistory.objects.filter(status="borrowed").order_by(
+        "borrow_date", "id"
+    )
+    student = get_object_or_404(
+        Student.objects.select_related("grade").prefetch_related(
+            Prefetch("fees_history", queryset=recent_payments, to_attr="recent_payments"),
+            Prefetch(
+                "library_history", queryset=borrowed_books, to_attr="borrowed_books"
+            ),
+        ),
+        pk=student_id,
+    )
+    fee_totals = (
+        FeesHistory.objects.filter(student_id=student_id)
+        .values("fee_type")
+        .annotate(total=Sum("amount"), payments=Count("id"))
+        .order_by("fee_type")
+    )
+    return {
+        "student": StudentSerializers(student).data,
+        "fee_totals": FeeTotalSerializer(fee_totals, many=True).data,
+        "recent_payments": FeeHistorySerializers(
+            student.recent_payments, many=True
+        ).data,
+        "borrowed_books": LibraryHistorySerializer(
+            student.borrowed_books, many=True
+        ).data,
+    }
+
+
+def get_student_profile(student_id, recent_limit):
+    """
+    Return the student's profile from the cache, building it on a miss.
+    """
+    key = _profile_key(student_id, recent_limit)
+    profile = cache.get(key)
+    if profile is None:
+        profile = build_student_profile(student_id, recent_limit)
+        cache.set(key, profile, settings.STUDENT_PROFILE_CACHE_TIMEOUT)
+    return profile
@@ -1,5 +1,9 @@
+from django.conf import settings
+from django.db import router, transaction
 from rest_framework import serializers
-from .models import Student
+from coreapp.concurrency import VersionedUpdateSerializerMixin
+from coreapp.sparse import SparseFieldsSerializerMixin
+from .models import Grade, Student, grade_defaults, normalize_grade_key
 
 """
 The StudentSerializers class is a ModelSerializer that converts
@@ -7,7 +11,90 @@ Student model instances into JSON format and vice versa.
 """
 
 
-class StudentSerializers(serializers.ModelSerializer):
+class GradeField(serializers.SlugRelatedField):
+    """
+    Reads and writes a Grade by its label, so clients keep sending and receiving
+    strings such as "5-A". An unknown label validates to an unsaved Grade,
+    which SaveNewGradesMixin stores only once the instance itself is saved.
+    """
+
+    default_error_messages = {
+        "blank": "This field may not be blank.",
+        "max_length": "Ensure this field has no more than {max_length} characters.",
+    }
+    max_length = 20
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault("queryset", Grade.objects.all())
+        super().__init__(slug_field="name", **kwargs)
+        # Shared by every row of a many=True serializer, so a bulk import
+        # looks up each distinct grade once
+        self._resolved = {}
+
+    def to_internal_value(self, data):
+        label = str(data).strip()
+        key = normalize_grade_key(label)
+        if not key:
+            self.fail("blank")
+        if len(label) > self.max_length:
+            self.fail("max_length", max_length=self.max_length)
+        if key not in self._resolved:
+            grade = Grade.objects.filter(key=key).first()
+            self._resolved[key] = grade or Grade(key=key, **grade_defaults(label))
+        return self._resolved[key]
+
+
+def save_new_grades(objects):
+    """
+    Replace the unsaved grades GradeField put on `objects` (Student instances
+    or validated_data dicts) with stored rows, inserting the missing grades.
+    Call inside the transaction that saves the objects.
+    """
+    pending = []
+    for obj in objects:
+        items = obj.items() if isinstance(obj, dict) else [("grade", obj.grade)]
+        pending.extend(
+            (obj, name, value)
+            for name, value in items
+            if isinstance(value, Grade) and value.pk is None
+        )
+    if not pending:
+        return
+    grades = Grade.objects.resolve_many({value.name for _obj, _name, value in pending})
+    for obj, name, value in pending:
+        if isinstance(obj, dict):
+            obj[name] = grades[value.name]
+        else:
+            setattr(obj, name, grades[value.name])
+
+
+class SaveNewGradesMixin:
+    """
+    ModelSerializer mixin that stores grades first seen during validation in
+    the same transaction as the instance, so requests that fail validation or
+    a precondition leave no grades behind.
+    """
+
+    def create(self, validated_data):
+        with transaction.atomic(using=router.db_for_write(Grade)):
+            save_new_grades([validated_data])
+            return super().create(validated_data)
+
+    def update(self, instance, validated_data):
+        with transaction.atomic(using=router.db_for_write(Grade)):
+            save_new_grades([validated_data])
+            return super().update(instance, validated_data)
+
+
+class StudentSerializers(
+    SparseFieldsSerializerMixin,
+    SaveNewGradesMixin,
+    VersionedUpdateSerializerMixin,
+    serializers.ModelSerializer,
+):
+    # Emitted and accepted as the grade label rather than the Grade id
+    grade = GradeField()
+
     # Meta class defines the model and fields to be serialized.
     class Meta:
         model = Student  # Specify the model to serialize
@@ -17,3 +104,52 @@ class StudentSerializers(serializers.ModelSerializer):
             "age",
             "grade",
         ]  # Fields to include in the serialized output
+
+
+class StudentImportSerializer(serializers.Serializer):
+    """
+    Validates the body of a bulk student import sent as JSON.
+    Accepts either a list of students or {"students": [...]}.
+    """
+
+    students = serializers.ListField(child=serializers.DictField(), allow_empty=False)
+
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            data = {"students": data}
+        return super().to_internal_value(data)
+
+    def validate_students(self, value):
+        limit = settings.STUDENT_IMPORT_MAX_ROWS
+        if len(value) > limit:
+            raise serializers.ValidationError(
+                f"A single import may contain at most {limit} students."
+            )
+        return value
+
+
+class PromoteGradeSerializer(serializers.Serializer):
+    """
+    Validates a request to move a whole grade to another grade.
+    """
+
+    from_grade = serializers.CharField(max_length=20)
+    to_grade = serializers.CharField(max_length=20)
+    dry_run = serializers.BooleanField(default=False)
+
+    def validate(self, attrs):
+        if normalize_grade_key(attrs["from_grade"]) == normalize_grade_key(
+            attrs["to_grade"]
+        ):
+            raise serializers.ValidationError(
+                "from_grade and to_grade must be different."
+            )
+        return attrs
+
+
+class StudentProfileQuerySerializer(serializers.Serializer):
+    """
+    Validates the query parameters of the student profile endpoint.
+    """
+
+    recent = serializers.IntegerField(default=5, min_value=1, max_value=50)
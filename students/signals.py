@@ -0,0 +1,24 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from feeapp.models import FeesHistory
+from libraryapp.models import LibraryHistory
+from .models import Student
+from .profile import invalidate_student_profile
+
+
+@receiver([post_save, post_delete], sender=Student)
+def invalidate_profile_for_student(sender, instance, **kwargs):
+    """
+    Drop cached profiles when the student itself changes.
+    """
+    invalidate_student_profile(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=FeesHistory)
+@receiver([post_save, post_delete], sender=LibraryHistory)
+def invalidate_profile_for_history(sender, instance, **kwargs):
+    """
+    Drop cached profiles when one of the student's fee or library records changes.
+    """
+    invalidate_student_profile(instance.student_id)
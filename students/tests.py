@@ -1,3 +1,173 @@
+from unittest import mock
+
+from django.core.cache import cache
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from .bulk import promote_grade
+from .models import Grade, Student, normalize_grade_key
+from .profile import _profile_key
+from auditapp.buffer import audit_buffer
+from auditapp.models import AuditLog
+from usersapp.models import User
+
+
+class SparseFieldsTests(TestCase):
+    """
+    ?fields= trims responses and defers columns on audited models.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            User.objects.create_user("admin", "admin@example.com", "pw", role="admin")
+        )
+        self.student = Student.objects.create(
+            name="Asha Rao", age=10, grade=Grade.objects.resolve("5-A")
+        )
+
+    def test_detail_returns_only_requested_fields(self):
+        response = self.client.get(
+            f"/students/student_detail/{self.student.pk}/?fields=id,name"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"id": self.student.pk, "name": "Asha Rao"})
+        self.assertEqual(response["ETag"], '"1"')
+
+    def test_deferred_fields_are_not_loaded_one_by_one(self):
+        url = f"/students/student_detail/{self.student.pk}/?fields=id,name"
+        # The first request also fills the school lookup cache
+        self.client.get(url)
+        # One query for the student; deferred columns must not be fetched lazily
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+    def test_related_slug_field_can_be_requested(self):
+        response = self.client.get(
+            f"/students/student_detail/{self.student.pk}/?fields=grade"
+        )
+        self.assertEqual(response.json(), {"grade": "5-A"})
+
+    def test_unknown_field_is_rejected(self):
+        response = self.client.get(
+            f"/students/student_detail/{self.student.pk}/?fields=id,nickname"
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_update_after_sparse_read_is_audited(self):
+        response = self.client.patch(
+            f"/students/student_detail/{self.student.pk}/", {"age": 11}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.student.refresh_from_db()
+        self.assertEqual(self.student.age, 11)
+
+
+class GradeResolutionTests(TestCase):
+    """
+    Spellings of one grade resolve to a single Grade row.
+    """
+
+    def test_leading_zeros_share_the_grade(self):
+        existing = Grade.objects.resolve("5-A")
+        self.assertEqual(Grade.objects.resolve("05-A"), existing)
+        self.assertEqual(Grade.objects.count(), 1)
+
+    def test_batch_with_several_spellings(self):
+        grades = Grade.objects.resolve_many(["05-a", "5 A", "12b"])
+        self.assertEqual(grades["05-a"], grades["5 A"])
+        self.assertEqual(grades["12b"].name, "12-B")
+        self.assertEqual(Grade.objects.count(), 2)
+
+    def test_saved_key_matches_lookup_key(self):
+        grade = Grade.objects.create(name="07-C", sort_key=703)
+        self.assertEqual(grade.key, normalize_grade_key("7c"))
+
+
+class GradeValidationTests(TestCase):
+    """
+    Validating a grade label never inserts a Grade; saving does.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            User.objects.create_user("admin", "admin@example.com", "pw", role="admin")
+        )
+
+    def test_rejected_request_leaves_no_grade(self):
+        response = self.client.post(
+            "/students/create_student/",
+            {"name": "Asha", "grade": "5-AA"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Grade.objects.exists())
+
+    def test_new_grade_is_created_with_the_student(self):
+        response = self.client.post(
+            "/students/create_student/",
+            {"name": "Asha", "age": 10, "grade": "05a"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["grade"], "5-A")
+        self.assertEqual(Grade.objects.get().students.count(), 1)
+
+    def test_failed_bulk_import_leaves_no_grade(self):
+        response = self.client.post(
+            "/students/bulk_import/",
+            [
+                {"name": "Asha", "age": 10, "grade": "9-C"},
+                {"name": "Ravi", "grade": "9-C"},
+            ],
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Grade.objects.exists())
+
+    def test_bulk_import_shares_new_grades(self):
+        response = self.client.post(
+            "/students/bulk_import/",
+            [
+                {"name": "Asha", "age": 10, "grade": "9-C"},
+                {"name": "Ravi", "age": 11, "grade": "9c"},
+            ],
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Grade.objects.get().students.count(), 2)
+
+
+class PromoteGradeTests(TestCase):
+    def setUp(self):
+        self.student = Student.objects.create(
+            name="Asha Rao", age=10, grade=Grade.objects.resolve("5-A")
+        )
+
+    def test_promotion_is_audited_and_drops_profiles(self):
+        key = _profile_key(self.student.pk, 5)
+        cache.set(key, {"name": "Asha Rao"})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(promote_grade("5-A", "6-A"), 1)
+        audit_buffer.flush()
+
+        self.student.refresh_from_db()
+        self.assertEqual(self.student.grade.key, normalize_grade_key("6-A"))
+        self.assertIsNone(cache.get(_profile_key(self.student.pk, 5)))
+        entry = AuditLog.objects.get(action=AuditLog.BULK)
+        self.assertEqual(entry.changes["description"], "promote grade")
+        self.assertEqual(entry.changes["count"], 1)
+
+    def test_promotion_publishes_one_bulk_event(self):
+        with mock.patch("feedapp.broadcast.broadcaster.publish") as publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                promote_grade("5-A", "6-A")
 
-# Create your tests here.
+        (event,), _kwargs = publish.call_args
+        self.assertEqual(publish.call_count, 1)
+        self.assertEqual(event["action"], "bulk_updated")
+        self.assertEqual(event["students"], [self.student.pk])
+        self.assertEqual(event["count"], 1)
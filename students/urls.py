@@ -1,9 +1,22 @@
 from django.urls import path
-from .views import CreateStudentListView, StudentDetailView
+from .views import (
+    BulkImportStudentsView,
+    CreateStudentListView,
+    PromoteGradeView,
+    StudentDetailView,
+    StudentProfileView,
+)
 
 urlpatterns = [
     path("create_student/", CreateStudentListView.as_view(), name="create-student"),
     path(
         "student_detail/<int:pk>/", StudentDetailView.as_view(), name="student-detail"
     ),
+    path("bulk_import/", BulkImportStudentsView.as_view(), name="bulk-import-students"),
+    path("promote_grade/", PromoteGradeView.as_view(), name="promote-grade"),
+    path(
+        "student_profile/<int:pk>/",
+        StudentProfileView.as_view(),
+        name="student-profile",
+    ),
 ]
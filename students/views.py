@@ -1,9 +1,25 @@
-from django.shortcuts import render
 from rest_framework import generics, status
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.parsers import JSONParser, MultiPartParser
+from rest_framework.views import APIView
+from coreapp.concurrency import ConditionalUpdateMixin
+from coreapp.sparse import SparseFieldsViewMixin
+from jobsapp.registry import submit_job
+from jobsapp.views import job_queued_response
+from .bulk import import_students, promote_grade
 from .models import Student
-from .serializers import StudentSerializers
-from usersapp.permissions import IsAdmin, IsOfficeStaff
+from .parsers import CSVParser
+from .profile import get_student_profile
+from .serializers import (
+    PromoteGradeSerializer,
+    StudentImportSerializer,
+    StudentProfileQuerySerializer,
+    StudentSerializers,
+)
+from usersapp.permissions import (
+    ADMIN_ROLES,
+    ADMIN_OR_STAFF_ROLES,
+    role_permission,
+)
 from rest_framework.response import Response
 
 
@@ -19,25 +35,27 @@ class CreateStudentListView(generics.CreateAPIView):
     serializer_class = StudentSerializers
 
     # Define the permission classes, ensuring only authenticated Admin users can access this view.
-    permission_classes = [IsAuthenticated, IsAdmin]
+    permission_classes = [role_permission(ADMIN_ROLES)]
 
 
 # View to retrieve, update, or delete a student record.
 # This view is accessible to both Admins and Office Staff.
-class StudentDetailView(generics.RetrieveUpdateDestroyAPIView):
+class StudentDetailView(
+    ConditionalUpdateMixin, SparseFieldsViewMixin, generics.RetrieveUpdateDestroyAPIView
+):
     """
     View to retrieve, update, or delete a student record.
     Accessible only by authenticated Admin and Office Staff users.
     """
 
     # Define the queryset to be used in the view (all student records).
-    queryset = Student.objects.all()
+    queryset = Student.objects.select_related("grade")
 
     # Define the serializer class for serializing student data.
     serializer_class = StudentSerializers
 
     # Define the permission classes, allowing Admin and Office Staff access.
-    permission_classes = [IsAuthenticated, IsAdmin | IsOfficeStaff]
+    permission_classes = [role_permission(ADMIN_OR_STAFF_ROLES)]
 
     def destroy(self, request, *args, **kwargs):
         """
@@ -58,3 +76,98 @@ class StudentDetailView(generics.RetrieveUpdateDestroyAPIView):
             {"message": f"Student '{student_name}' has been deleted successfully."},
             status=status.HTTP_200_OK,
         )
+
+
+class BulkImportStudentsView(APIView):
+    """
+    View to import many students at once from JSON, a text/csv body or an
+    uploaded CSV file. Accessible only by authenticated Admin users.
+    """
+
+    permission_classes = [role_permission(ADMIN_ROLES)]
+    parser_classes = [JSONParser, CSVParser, MultiPartParser]
+
+    def get_rows(self, request):
+        """
+        Return the student rows from whichever format the request used.
+        """
+        upload = request.FILES.get("file")
+        data = CSVParser().parse(upload) if upload is not None else request.data
+
+        serializer = StudentImportSerializer(data=data)
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data["students"]
+
+    def post(self, request):
+        """
+        Handles POST requests to import students.
+        Nothing is saved if any row is invalid; the errors are reported per row.
+        With ?async=1 the import is queued as a background job instead.
+        """
+        rows = self.get_rows(request)
+        if request.query_params.get("async") in ("1", "true"):
+            job = submit_job("students.import", {"students": rows}, user=request.user)
+            return job_queued_response(job)
+
+        created, errors = import_students(rows)
+        if errors:
+            return Response(
+                {"message": "No students were imported.", "errors": errors},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(
+            {
+                "message": f"{created} students imported successfully.",
+                "created": created,
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+
+class PromoteGradeView(APIView):
+    """
+    View to move every student in one grade to another grade.
+    Accessible only by authenticated Admin and Office Staff users.
+    """
+
+    permission_classes = [role_permission(ADMIN_OR_STAFF_ROLES)]
+
+    def post(self, request):
+        """
+        Handles POST requests to promote a grade.
+        With dry_run, only the number of affected students is returned.
+        """
+        serializer = PromoteGradeSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        count = promote_grade(**data)
+
+        verb = "would be moved" if data["dry_run"] else "moved"
+        message = (
+            f"{count} students {verb} from '{data['from_grade']}' "
+            f"to '{data['to_grade']}'."
+        )
+        return Response(
+            {"message": message, "count": count, "dry_run": data["dry_run"]},
+            status=status.HTTP_200_OK,
+        )
+
+
+class StudentProfileView(APIView):
+    """
+    View to return a student's details, fee totals by type, latest payments and
+    currently borrowed books in one response.
+    Accessible only by authenticated Admin and Office Staff users.
+    """
+
+    permission_classes = [role_permission(ADMIN_OR_STAFF_ROLES)]
+
+    def get(self, request, pk):
+        """
+        Handles GET requests for the profile. `recent` sets how many of the
+        latest payments are included.
+        """
+        query = StudentProfileQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        profile = get_student_profile(pk, query.validated_data["recent"])
+        return Response(profile, status=status.HTTP_200_OK)
@@ -0,0 +1,18 @@
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+
+from .revocation import revocation_cache
+
+
+class RevocationAwareJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that also rejects revoked tokens.
+    The check is served from the in-process revocation cache, so it adds no
+    database query to authenticated requests.
+    """
+
+    def get_validated_token(self, raw_token):
+        token = super().get_validated_token(raw_token)
+        if revocation_cache.is_revoked(token):
+            raise InvalidToken("Token has been revoked.")
+        return token
@@ -0,0 +1,56 @@
+import time
+
+from django.core.management.base import BaseCommand
+from rest_framework.test import APIRequestFactory
+
+from usersapp import throttling
+from usersapp.views import AdminTokenObtainPairView
+
+
+class Command(BaseCommand):
+    help = (
+        "Simulate a credential-stuffing burst against admin_login/ and compare "
+        "CPU time with and without the login throttle."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument(
+            "--ips", type=int, default=4, help="Number of attacking client IPs."
+        )
+
+    def handle(self, *args, **options):
+        factory = APIRequestFactory()
+        attempts = [
+            factory.post(
+                "/users/admin_login/",
+                {"username": f"victim{index % 50}", "password": f"guess{index}"},
+                format="json",
+                REMOTE_ADDR=f"10.0.0.{index % options['ips'] + 1}",
+            )
+            for index in range(options["requests"])
+        ]
+
+        unthrottled = AdminTokenObtainPairView.as_view(throttle_classes=[])
+        self.report("Without throttle", unthrottled, attempts)
+
+        # Start from empty in-process counters so earlier runs do not interfere
+        throttling._store = throttling.LocalCounterStore()
+        throttling.throttle_metrics.clear()
+        self.report("With throttle", AdminTokenObtainPairView.as_view(), attempts)
+        self.stdout.write(f"Throttle metrics: {dict(throttling.throttle_metrics)}")
+
+    def report(self, label, view, attempts):
+        rejected = 0
+        cpu_started = time.process_time()
+        wall_started = time.perf_counter()
+        for request in attempts:
+            if view(request).status_code == 429:
+                rejected += 1
+        cpu = time.process_time() - cpu_started
+        wall = time.perf_counter() - wall_started
+        self.stdout.write(
+            f"{label}: {len(attempts)} attempts, {rejected} rejected, "
+            f"{cpu:.2f}s CPU ({cpu / len(attempts) * 1000:.1f} ms/attempt), "
+            f"{wall:.2f}s wall"
+        )
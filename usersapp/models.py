@@ -1,11 +1,14 @@
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth.models import AbstractUser, BaseUserManager
+from schoolsapp.models import SchoolScopedModel, TenantManager
 
 
-class UserManager(BaseUserManager):
+class UserManager(TenantManager, BaseUserManager):
     """
     Custom manager for the User model with additional methods
     to create office staff and superusers.
+    Queries only see users of the current school.
     """
 
     def create_user(self, username, email, password=None, role="staff", **extra_fields):
@@ -48,9 +51,9 @@ class UserManager(BaseUserManager):
         return self.create_user(username, email, password, role="admin", **extra_fields)
 
 
-class User(AbstractUser):
+class User(SchoolScopedModel, AbstractUser):
     """
-    Custom User model that includes a role field.
+    Custom User model that includes a role field and the user's school.
     """
 
     ROLES = (
@@ -64,3 +67,21 @@ class User(AbstractUser):
 
     def __str__(self):
         return f"{self.username} ({self.get_role_display()})"
+
+
+class RevokedToken(models.Model):
+    """
+    A revoked JWT. With a jti, that single token is revoked; without one,
+    every token of the user issued up to revoked_at is revoked.
+    Rows are only needed until expires_at, when the tokens expire anyway.
+    """
+
+    jti = models.CharField(max_length=255, null=True, blank=True, db_index=True)
+    # Not a foreign key: the row must outlive the deleted user it revokes
+    user_id = models.BigIntegerField(db_index=True)
+    revoked_at = models.DateTimeField(default=timezone.now, db_index=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        target = self.jti or "all tokens"
+        return f"{target} of user {self.user_id} revoked at {self.revoked_at}"
@@ -1,4 +1,6 @@
-from rest_framework.permissions import BasePermission
+from functools import lru_cache
+
+from rest_framework.permissions import SAFE_METHODS, BasePermission
 
 
 # Permission class to check if the user is an admin
@@ -20,3 +22,48 @@ class IsLibrarian(BasePermission):
     def has_permission(self, request, view):
         # Check if the user is authenticated and has a 'librarian' role
         return request.user.is_authenticated and request.user.role == "librarian"
+
+
+# Role sets shared by views that allow more than one role
+ADMIN_ROLES = frozenset({"admin"})
+ADMIN_OR_STAFF_ROLES = frozenset({"admin", "staff"})
+LIBRARIAN_OR_STAFF_ROLES = frozenset({"librarian", "staff"})
+
+
+class RolePermission(BasePermission):
+    """
+    Grants access when the user's role is in the set allowed for the request method.
+    Use role_permission() to build a subclass per view instead of composing
+    IsAdmin | IsOfficeStaff, which re-checks authentication once per operand.
+    """
+
+    # Maps an HTTP method to the frozenset of roles allowed to call it.
+    method_roles = {}
+
+    def has_permission(self, request, view):
+        # Resolve the role once; anonymous users have no role attribute
+        user = request.user
+        role = getattr(user, "role", None) if user.is_authenticated else None
+        return role in self.method_roles.get(request.method, ())
+
+
+def role_permission(read_roles, write_roles=None):
+    """
+    Build a RolePermission subclass with its method-to-roles table precomputed.
+    Safe methods use `read_roles`; all other methods use `write_roles`,
+    which defaults to `read_roles`.
+    """
+    read_roles = frozenset(read_roles)
+    write_roles = read_roles if write_roles is None else frozenset(write_roles)
+    return _build_role_permission(read_roles, write_roles)
+
+
+@lru_cache(maxsize=None)
+def _build_role_permission(read_roles, write_roles):
+    # Views declaring the same role sets share one permission class
+    method_roles = {method: read_roles for method in SAFE_METHODS}
+    method_roles.update(
+        {method: write_roles for method in ("POST", "PUT", "PATCH", "DELETE")}
+    )
+    name = "RolePermission_" + "_".join(sorted(read_roles | write_roles))
+    return type(name, (RolePermission,), {"method_roles": method_roles})
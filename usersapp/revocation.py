@@ -0,0 +1,201 @@
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+logger = logging.getLogger(__name__)
+
+
+class RevocationCache:
+    """
+    Process-local view of RevokedToken rows used to reject revoked JWTs.
+    Lookups are dictionary hits; the database is only read once every
+    TOKEN_REVOCATION_SYNC_INTERVAL seconds, and then only for rows revoked
+    since the previous sync. Entries are dropped once their tokens expire,
+    and the cache never holds more than TOKEN_REVOCATION_CACHE_MAX entries;
+    tokens that may have lost their entry to that bound are checked against
+    the database instead, for jtis and user entries alike. Expired rows are
+    purged every TOKEN_REVOCATION_PURGE_INTERVAL seconds.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # jti -> expiry timestamp
+        self._jtis = {}
+        # user id (as str) -> (revoked-at timestamp, expiry timestamp)
+        self._users = {}
+        self._watermark = None
+        self._next_sync = 0.0
+        self._next_purge = 0.0
+        # Latest expiry of a jti, and of a user entry, dropped by the size
+        # bound; tokens expiring before it may be revoked without being cached
+        self._evicted_until = 0.0
+        self._users_evicted_until = 0.0
+
+    def is_revoked(self, token):
+        """
+        Return True if `token` was revoked individually or through its user.
+        """
+        self._maybe_sync()
+        jti = token.get(jwt_settings.JTI_CLAIM)
+        if jti in self._jtis:
+            return True
+        if jti and token.get("exp", 0) <= self._evicted_until:
+            from .models import RevokedToken
+
+            if RevokedToken.objects.filter(jti=jti).exists():
+                return True
+
+        user_id = token.get(jwt_settings.USER_ID_CLAIM)
+        issued_at = token.get("iat")
+        revoked = self._users.get(str(user_id))
+        if revoked is None:
+            if user_id is not None and token.get("exp", 0) <= self._users_evicted_until:
+                return user_revoked_since(user_id, issued_at)
+            return False
+        if issued_at is None:
+            return True
+        return issued_at <= revoked[0]
+
+    def add_jti(self, jti, expires_at):
+        with self._lock:
+            self._jtis[jti] = expires_at.timestamp()
+            self._enforce_bound()
+
+    def add_user(self, user_id, revoked_at, expires_at):
+        with self._lock:
+            key = str(user_id)
+            current = self._users.get(key)
+            if current is None or current[0] < revoked_at.timestamp():
+                self._users[key] = (revoked_at.timestamp(), expires_at.timestamp())
+            self._enforce_bound()
+
+    def _maybe_sync(self):
+        if time.monotonic() < self._next_sync:
+            return
+        with self._lock:
+            if time.monotonic() < self._next_sync:
+                return
+            if time.monotonic() >= self._next_purge:
+                purge_expired_revocations()
+                self._next_purge = (
+                    time.monotonic() + settings.TOKEN_REVOCATION_PURGE_INTERVAL
+                )
+            self._sync()
+            self._next_sync = time.monotonic() + settings.TOKEN_REVOCATION_SYNC_INTERVAL
+
+    def _sync(self):
+        from .models import RevokedToken
+
+        now = timezone.now()
+        rows = RevokedToken.objects.filter(expires_at__gt=now)
+        if self._watermark is not None:
+            # Overlap a little so rows committed out of order are not missed
+            rows = rows.filter(revoked_at__gte=self._watermark - timedelta(seconds=5))
+        for jti, user_id, revoked_at, expires_at in rows.values_list(
+            "jti", "user_id", "revoked_at", "expires_at"
+        ).iterator():
+            if jti:
+                self._jtis[jti] = expires_at.timestamp()
+            else:
+                current = self._users.get(str(user_id))
+                if current is None or current[0] < revoked_at.timestamp():
+                    self._users[str(user_id)] = (
+                        revoked_at.timestamp(),
+                        expires_at.timestamp(),
+                    )
+        self._watermark = now
+        self._prune(now.timestamp())
+        self._enforce_bound()
+
+    def _prune(self, now):
+        self._jtis = {jti: exp for jti, exp in self._jtis.items() if exp > now}
+        self._users = {
+            uid: value for uid, value in self._users.items() if value[1] > now
+        }
+
+    def _enforce_bound(self):
+        limit = settings.TOKEN_REVOCATION_CACHE_MAX
+        overflow = len(self._jtis) + len(self._users) - limit
+        if overflow <= 0:
+            return
+        logger.warning("Token revocation cache is full; dropping %d entries", overflow)
+        # Drop the entries closest to expiring naturally, from either map;
+        # is_revoked() asks the database about tokens that expire no later
+        # than those. A user entry expires after every token it revokes.
+        entries = [(exp, True, jti) for jti, exp in self._jtis.items()]
+        entries += [(value[1], False, uid) for uid, value in self._users.items()]
+        entries.sort(key=lambda entry: entry[0])
+        for exp, is_jti, key in entries[:overflow]:
+            if is_jti:
+                del self._jtis[key]
+                self._evicted_until = max(self._evicted_until, exp)
+            else:
+                del self._users[key]
+                self._users_evicted_until = max(self._users_evicted_until, exp)
+
+
+revocation_cache = RevocationCache()
+
+
+def purge_expired_revocations():
+    """
+    Delete RevokedToken rows whose tokens have expired and return how many.
+    """
+    from .models import RevokedToken
+
+    deleted, _ = RevokedToken.objects.filter(expires_at__lte=timezone.now()).delete()
+    return deleted
+
+
+def user_revoked_since(user_id, issued_at):
+    """
+    Return True if the database holds a revocation of all of a user's tokens
+    that covers a token issued at `issued_at` (a timestamp, or None).
+    """
+    from .models import RevokedToken
+
+    rows = RevokedToken.objects.filter(
+        Q(jti__isnull=True) | Q(jti=""),
+        user_id=user_id,
+        expires_at__gt=timezone.now(),
+    )
+    if issued_at is not None:
+        rows = rows.filter(
+            revoked_at__gte=datetime.fromtimestamp(issued_at, tz=dt_timezone.utc)
+        )
+    return rows.exists()
+
+
+def revoke_token(token):
+    """
+    Revoke a single validated token until it expires.
+    """
+    from .models import RevokedToken
+
+    expires_at = datetime.fromtimestamp(token["exp"], tz=dt_timezone.utc)
+    RevokedToken.objects.create(
+        jti=token[jwt_settings.JTI_CLAIM],
+        user_id=token[jwt_settings.USER_ID_CLAIM],
+        expires_at=expires_at,
+    )
+    revocation_cache.add_jti(token[jwt_settings.JTI_CLAIM], expires_at)
+
+
+def revoke_user_tokens(user_id):
+    """
+    Revoke every token issued to a user so far, for as long as any can live.
+    """
+    from .models import RevokedToken
+
+    now = timezone.now()
+    expires_at = now + max(
+        jwt_settings.ACCESS_TOKEN_LIFETIME, jwt_settings.REFRESH_TOKEN_LIFETIME
+    )
+    RevokedToken.objects.create(user_id=user_id, revoked_at=now, expires_at=expires_at)
+    revocation_cache.add_user(user_id, now, expires_at)
@@ -1,13 +1,32 @@
 from rest_framework import serializers
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
 from rest_framework.exceptions import AuthenticationFailed
 from django.core.validators import validate_email
 from django.contrib.auth.password_validation import validate_password
 
+from schoolsapp.resolution import SCHOOL_CLAIM
 from .models import User
+from .revocation import revocation_cache, revoke_token
 
 
-class AdminTokenObtainPairSerializers(TokenObtainPairSerializer):
+class SchoolClaimMixin:
+    """
+    Adds the user's school to issued tokens so requests are scoped to it.
+    Refreshed access tokens copy the claim from the refresh token.
+    """
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token[SCHOOL_CLAIM] = user.school_id
+        return token
+
+
+class AdminTokenObtainPairSerializers(SchoolClaimMixin, TokenObtainPairSerializer):
     """
     Custom TokenObtainPairSerializer to include the user's role in the JWT token.
     Also restricts access to admins only.
@@ -139,17 +158,26 @@ class EditAccountsSerializers(serializers.ModelSerializer):
         if "email" in validated_data:
             validated_data.pop("email")
 
-        # Update username if provided
-        instance.username = validated_data.get("username", instance.username)
+        # Track the columns that change so only those are written
+        update_fields = []
+
+        # Update username if provided and different
+        username = validated_data.get("username", instance.username)
+        if username != instance.username:
+            instance.username = username
+            update_fields.append("username")
 
         # If a new password is provided, hash it and update the password
         if "password" in validated_data:
             instance.set_password(validated_data["password"])
+            update_fields.append("password")
 
-        instance.save()
+        # Skip the write entirely when nothing changed
+        if update_fields:
+            instance.save(update_fields=update_fields)
         return instance
 
-class StaffTokenObtainPairSerializers(TokenObtainPairSerializer):
+class StaffTokenObtainPairSerializers(SchoolClaimMixin, TokenObtainPairSerializer):
     """
     Custom TokenObtainPairSerializer for staff users.
     Ensures only 'staff' users can log in and adds role to token.
@@ -251,7 +279,9 @@ class AddLibrarianSerializers(serializers.ModelSerializer):
         return user
 
 
-class LibrarianTokenObtainPairSerializers(TokenObtainPairSerializer):
+class LibrarianTokenObtainPairSerializers(
+    SchoolClaimMixin, TokenObtainPairSerializer
+):
     """
     Custom TokenObtainPairSerializer for librarian users.
     Ensures only 'librarian' users can log in and adds role to token.
@@ -277,3 +307,22 @@ class LibrarianTokenObtainPairSerializers(TokenObtainPairSerializer):
         # Add the role of the user to the response data
         data["role"] = self.user.role
         return data
+
+
+class RotatingTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    TokenRefreshSerializer that refuses revoked refresh tokens and revokes
+    each refresh token once it has been exchanged (refresh rotation).
+    """
+
+    def validate(self, attrs):
+        """
+        Reject revoked refresh tokens, then issue new tokens and revoke the old one.
+        """
+        refresh = self.token_class(attrs["refresh"])
+        if revocation_cache.is_revoked(refresh):
+            raise InvalidToken("Token has been revoked.")
+
+        data = super().validate(attrs)
+        revoke_token(refresh)
+        return data
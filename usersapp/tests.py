@@ -1,3 +1,90 @@
-from django.test import TestCase
+import time
 
-# Create your tests here.
+from django.test import TestCase, override_settings
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .models import RevokedToken, User
+from .revocation import (
+    RevocationCache,
+    revocation_cache,
+    revoke_token,
+    revoke_user_tokens,
+)
+from .throttling import LocalCounterStore, LoginRateThrottle
+
+
+class TokenRevocationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            "admin", "admin@example.com", "pw", role="admin"
+        )
+
+    def test_used_refresh_token_is_rejected(self):
+        refresh = str(RefreshToken.for_user(self.user))
+        first = self.client.post("/users/token_refresh/", {"refresh": refresh})
+        self.assertEqual(first.status_code, 200)
+
+        second = self.client.post("/users/token_refresh/", {"refresh": refresh})
+        self.assertEqual(second.status_code, 401)
+        self.assertTrue(revocation_cache.is_revoked(RefreshToken(refresh)))
+
+    @override_settings(TOKEN_REVOCATION_CACHE_MAX=1)
+    def test_revocation_outlives_cache_eviction(self):
+        cache = RevocationCache()
+        soon = RefreshToken.for_user(self.user)
+        soon.set_exp(lifetime=soon.lifetime / 2)
+        later = RefreshToken.for_user(self.user)
+        revoke_token(soon)
+        revoke_token(later)
+        cache.is_revoked(RefreshToken.for_user(self.user))
+
+        self.assertEqual(len(cache._jtis), 1)
+        self.assertTrue(cache.is_revoked(soon))
+        self.assertTrue(cache.is_revoked(later))
+        self.assertFalse(cache.is_revoked(RefreshToken.for_user(self.user)))
+
+    @override_settings(TOKEN_REVOCATION_CACHE_MAX=1)
+    def test_user_revocations_outlive_cache_eviction(self):
+        other = User.objects.create_user(
+            "staff", "staff@example.com", "pw", role="staff"
+        )
+        tokens = [RefreshToken.for_user(user) for user in (self.user, other)]
+        revoke_user_tokens(self.user.pk)
+        revoke_user_tokens(other.pk)
+        cache = RevocationCache()
+        fresh = RefreshToken.for_user(self.user)
+        # Issued after the revocations
+        fresh["iat"] = int(time.time()) + 60
+
+        self.assertFalse(cache.is_revoked(fresh))
+        self.assertEqual(len(cache._users), 1)
+        self.assertTrue(all(cache.is_revoked(token) for token in tokens))
+
+    def test_expired_rows_are_purged_on_sync(self):
+        token = RefreshToken.for_user(self.user)
+        token.set_exp(lifetime=-token.lifetime)
+        revoke_token(token)
+        self.assertTrue(RevokedToken.objects.exists())
+
+        RevocationCache().is_revoked(RefreshToken.for_user(self.user))
+
+        self.assertFalse(RevokedToken.objects.exists())
+
+
+class LoginThrottleTests(TestCase):
+    def test_client_ip_ignores_forwarded_header_without_proxies(self):
+        request = APIRequestFactory().post(
+            "/users/admin_login/", HTTP_X_FORWARDED_FOR="203.0.113.9"
+        )
+        ident = LoginRateThrottle().get_ident(Request(request))
+        self.assertEqual(ident, "127.0.0.1")
+
+    def test_local_store_drops_expired_counters(self):
+        store = LocalCounterStore()
+        store.incr("ip:a", 1, ttl=-1)
+        store.incr("ip:b", 2, ttl=60)
+        self.assertEqual(store.get("ip:a", 1), 0)
+        self.assertEqual(store.get("ip:b", 2), 1)
@@ -0,0 +1,158 @@
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.throttling import BaseThrottle
+
+PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+# Counts of allowed and rejected login attempts since the process started
+throttle_metrics = Counter()
+_metrics_lock = threading.Lock()
+
+
+def parse_rate(rate):
+    """
+    Parse a DRF-style rate such as "5/min" into (requests, seconds).
+    """
+    num, period = rate.split("/")
+    return int(num), PERIODS[period[0]]
+
+
+class LocalCounterStore:
+    """
+    Window counters kept in this process. Fast, but each worker counts separately.
+    Expired counters are dropped at most once every PRUNE_INTERVAL seconds.
+    """
+
+    PRUNE_INTERVAL = 60
+
+    def __init__(self):
+        # (key, window) -> [count, expiry timestamp]
+        self._counts = {}
+        self._lock = threading.Lock()
+        self._next_prune = 0.0
+
+    def get(self, key, window):
+        entry = self._counts.get((key, window))
+        return entry[0] if entry is not None else 0
+
+    def incr(self, key, window, ttl):
+        now = time.time()
+        with self._lock:
+            entry = self._counts.get((key, window))
+            if entry is None:
+                self._counts[(key, window)] = [1, now + ttl]
+            else:
+                entry[0] += 1
+            if now >= self._next_prune:
+                self._counts = {
+                    k: entry for k, entry in self._counts.items() if entry[1] > now
+                }
+                self._next_prune = now + self.PRUNE_INTERVAL
+
+
+class CacheCounterStore:
+    """
+    Window counters kept in the Django cache, shared by every worker using it.
+    """
+
+    def get(self, key, window):
+        return cache.get(f"login-throttle:{key}:{window}", 0)
+
+    def incr(self, key, window, ttl):
+        cache_key = f"login-throttle:{key}:{window}"
+        cache.add(cache_key, 0, ttl)
+        try:
+            cache.incr(cache_key)
+        except ValueError:
+            # The key expired between add() and incr()
+            cache.set(cache_key, 1, ttl)
+
+
+COUNTER_STORES = {"local": LocalCounterStore, "cache": CacheCounterStore}
+_store = None
+
+
+def get_counter_store():
+    """
+    Return the process-wide counter store selected by LOGIN_THROTTLE["STORE"].
+    """
+    global _store
+    if _store is None:
+        _store = COUNTER_STORES[settings.LOGIN_THROTTLE["STORE"]]()
+    return _store
+
+
+class SlidingWindowCounter:
+    """
+    Approximates a sliding window by weighting the previous fixed window's
+    count by how much of it still overlaps the sliding window.
+    Needs two counters per key instead of a timestamp per request.
+    """
+
+    def __init__(self, store, rate):
+        self.store = store
+        self.limit, self.period = parse_rate(rate)
+
+    def hit(self, key):
+        """
+        Count a request for `key` and return False if it is over the limit.
+        Rejected requests are not counted.
+        """
+        now = time.time()
+        window = int(now // self.period)
+        overlap = 1 - (now % self.period) / self.period
+        estimated = self.store.get(key, window - 1) * overlap + self.store.get(
+            key, window
+        )
+        if estimated >= self.limit:
+            return False
+        self.store.incr(key, window, self.period * 2)
+        return True
+
+
+class LoginRateThrottle(BaseThrottle):
+    """
+    Limits login attempts per client IP and per username.
+    DRF runs throttles before the view handler, so rejected attempts never
+    reach TokenObtainPairSerializer.validate and its password hashing.
+    """
+
+    def __init__(self):
+        store = get_counter_store()
+        self.ip_counter = SlidingWindowCounter(
+            store, settings.LOGIN_THROTTLE["IP_RATE"]
+        )
+        self.username_counter = SlidingWindowCounter(
+            store, settings.LOGIN_THROTTLE["USERNAME_RATE"]
+        )
+
+    def allow_request(self, request, view):
+        if not self.ip_counter.hit(f"ip:{self.get_ident(request)}"):
+            self._count("rejected_ip")
+            self.rejected_by = self.ip_counter
+            return False
+
+        username = (
+            request.data.get("username") if hasattr(request.data, "get") else None
+        )
+        if username and not self.username_counter.hit(
+            f"user:{str(username).strip().lower()}"
+        ):
+            self._count("rejected_username")
+            self.rejected_by = self.username_counter
+            return False
+
+        self._count("allowed")
+        return True
+
+    def wait(self):
+        # At most one full window until the rejecting counter has room again
+        return self.rejected_by.period
+
+    def _count(self, outcome):
+        with _metrics_lock:
+            throttle_metrics[outcome] += 1
@@ -9,6 +9,8 @@ from .views import (
     DeleteOfficeStaffView,
     EditLibrarianView,
     DeleteLibrarianView,
+    RotatingTokenRefreshView,
+    LoginThrottleMetricsView,
 )
 
 urlpatterns = [
@@ -45,4 +47,10 @@ urlpatterns = [
         DeleteLibrarianView.as_view(),
         name="delete-librarian",
     ),
+    path("token_refresh/", RotatingTokenRefreshView.as_view(), name="token-refresh"),
+    path(
+        "login_throttle_metrics/",
+        LoginThrottleMetricsView.as_view(),
+        name="login-throttle-metrics",
+    ),
 ]
@@ -1,9 +1,8 @@
-from django.shortcuts import render
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
-from rest_framework_simplejwt.views import TokenObtainPairView
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from .models import User
 from .serializers import (
     AddOfficeStaffSerializers,
@@ -12,8 +11,11 @@ from .serializers import (
     StaffTokenObtainPairSerializers,
     LibrarianTokenObtainPairSerializers,
     EditAccountsSerializers,
+    RotatingTokenRefreshSerializer,
 )
 from .permissions import IsAdmin
+from .revocation import revoke_user_tokens
+from .throttling import LoginRateThrottle, throttle_metrics
 
 
 # Admin Token Obtain View
@@ -24,6 +26,7 @@ class AdminTokenObtainPairView(TokenObtainPairView):
     """
 
     serializer_class = AdminTokenObtainPairSerializers
+    throttle_classes = [LoginRateThrottle]
 
 
 # Create Office Staff View
@@ -123,6 +126,8 @@ class DeleteOfficeStaffView(APIView):
                 {"details": "Office staff not found."}, status=status.HTTP_404_NOT_FOUND
             )
         office_staff.delete()
+        # Outstanding tokens of the deleted account stop working immediately
+        revoke_user_tokens(pk)
         return Response(
             {"message": "Office staff deleted successfully"}, status=status.HTTP_200_OK
         )
@@ -136,6 +141,7 @@ class StaffTokenObtainPairView(TokenObtainPairView):
     """
 
     serializer_class = StaffTokenObtainPairSerializers
+    throttle_classes = [LoginRateThrottle]
 
 
 # Create Librarian View
@@ -232,6 +238,8 @@ class DeleteLibrarianView(APIView):
                 {"details": "Librarian not found."}, status=status.HTTP_404_NOT_FOUND
             )
         librarian_staff.delete()
+        # Outstanding tokens of the deleted account stop working immediately
+        revoke_user_tokens(pk)
         return Response(
             {"message": "Librarian deleted successfully"}, status=status.HTTP_200_OK
         )
@@ -245,3 +253,27 @@ class LibrarianTokenObtainPairView(TokenObtainPairView):
     """
 
     serializer_class = LibrarianTokenObtainPairSerializers
+    throttle_classes = [LoginRateThrottle]
+
+
+# Token Refresh View
+class RotatingTokenRefreshView(TokenRefreshView):
+    """
+    Exchanges a refresh token for a new access and refresh token pair.
+    The used refresh token is revoked, so each one can only be used once.
+    """
+
+    serializer_class = RotatingTokenRefreshSerializer
+
+
+# Login Throttle Metrics View
+class LoginThrottleMetricsView(APIView):
+    """
+    View to report how many login attempts this worker allowed and rejected.
+    Accessible only by authenticated admins.
+    """
+
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    def get(self, request):
+        return Response(dict(throttle_metrics), status=status.HTTP_200_OK)